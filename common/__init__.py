@@ -0,0 +1,8 @@
+"""
+여러 게임 폴더가 함께 쓰는 공용 모듈.
+
+각 게임 스크립트는 폴더 안에서 단독으로 실행되므로, 쓰기 전에
+저장소 루트를 sys.path에 추가한다:
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+"""
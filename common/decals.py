@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""
+공용 바닥 자국(데칼) 레이어
+- 핏자국·풀·흙 같은 바닥 장식을 Surface에 한 번만 찍고, 객체는 버린다
+- 매 프레임 비용은 화면 크기 Surface 한 장 blit (자국이 몇 개든 같음)
+- 영구 장식(paint)은 밑판에, 전투 자국(stamp)은 따로 쌓아서
+  DECAL_CAP개를 찍을 때마다 기존 자국을 DECAL_FADE 비율로 옅게 만든다 (끝없이 쌓이지 않게)
+
+    decals = DecalLayer((SCREEN_WIDTH, SCREEN_HEIGHT), BG_COLOR)
+    decals.paint(detail.draw)          # 시작할 때 배경 장식
+    decals.stamp(blood.image, blood.rect)
+    decals.draw(screen)                # screen.fill(BG_COLOR) 대신
+"""
+import pygame
+
+DECAL_CAP = 150      # 이만큼 찍을 때마다 한 번 옅게 (None이면 옅어지지 않음)
+DECAL_FADE = 0.6     # 옅게 할 때 남기는 알파 비율
+
+
+class DecalLayer:
+    def __init__(self, size, bg_color, cap=DECAL_CAP, fade=DECAL_FADE):
+        self.size = size
+        self.cap = cap
+        self.fade = fade
+        self.base = pygame.Surface(size)
+        self.base.fill(bg_color)
+        self.stains = pygame.Surface(size, pygame.SRCALPHA)
+        self.surface = self.base.copy()
+        self.since_fade = 0
+
+    def paint(self, draw):
+        """draw(surface)로 그리는 영구 장식 (EnvironmentDetail.draw 등)"""
+        draw(self.base)
+        self.compose()
+
+    def stamp(self, image, pos):
+        """자국 이미지를 찍음. 찍은 뒤 이미지/스프라이트는 버려도 된다"""
+        self.stains.blit(image, pos)
+        self.surface.blit(image, pos)
+        self.since_fade += 1
+        if self.cap is not None and self.since_fade >= self.cap:
+            self.fade_stains()
+
+    def fade_stains(self):
+        alpha = int(255 * self.fade)
+        self.stains.fill((255, 255, 255, alpha), special_flags=pygame.BLEND_RGBA_MULT)
+        self.since_fade = 0
+        self.compose()
+
+    def compose(self):
+        self.surface.blit(self.base, (0, 0))
+        self.surface.blit(self.stains, (0, 0))
+
+    def draw(self, surface, pos=(0, 0)):
+        surface.blit(self.surface, pos)
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+공용 플로우 필드 길찾기 (타일 격자)
+- 목표 타일에서 Dijkstra로 모든 타일까지의 거리를 한 번 계산하고,
+  타일마다 "다음에 갈 이웃 타일"을 적어 둔다
+- 목표가 다른 타일로 옮겨 갔을 때만 다시 계산 (update가 True를 돌려줌)
+- 에이전트는 direction()으로 O(1)에 방향을 읽는다 → 에이전트 수와 상관없이 타일 변경당 계산 한 번
+
+대각선 이동은 양옆 두 타일이 모두 지나갈 수 있을 때만 허용 (벽 모서리를 깎지 않게).
+"""
+import heapq
+import math
+
+DIAGONAL_COST = math.sqrt(2)
+NEIGHBORS = [(1, 0, 1.0), (-1, 0, 1.0), (0, 1, 1.0), (0, -1, 1.0),
+             (1, 1, DIAGONAL_COST), (1, -1, DIAGONAL_COST), (-1, 1, DIAGONAL_COST), (-1, -1, DIAGONAL_COST)]
+
+
+class FlowField:
+    def __init__(self, passable, map_tw, map_th, tile_size):
+        self.passable = passable          # passable[ty][tx] -> bool
+        self.map_tw = map_tw
+        self.map_th = map_th
+        self.tile_size = tile_size
+        self.target = None
+        self.dist = None
+        self.next_tile = None
+        self.rebuilds = 0
+
+    @classmethod
+    def from_tilemap(cls, tilemap, tile_size):
+        """passable_rows()가 있는 타일 맵 (game3/p008 TileMap, 방 번호 0이면 벽/빈칸)"""
+        return cls(tilemap.passable_rows(), tilemap.map_tw, tilemap.map_th, tile_size)
+
+    def walkable(self, tx, ty):
+        return 0 <= tx < self.map_tw and 0 <= ty < self.map_th and self.passable[ty][tx]
+
+    def steps(self, tx, ty):
+        for dx, dy, cost in NEIGHBORS:
+            nx, ny = tx + dx, ty + dy
+            if not self.walkable(nx, ny):
+                continue
+            if dx and dy and not (self.walkable(tx + dx, ty) and self.walkable(tx, ty + dy)):
+                continue
+            yield nx, ny, cost
+
+    def update(self, target_wx, target_wy):
+        """목표(월드 좌표)의 타일이 바뀌었으면 필드를 다시 계산. 다시 계산했으면 True"""
+        target = (int(target_wx // self.tile_size), int(target_wy // self.tile_size))
+        if target == self.target or not self.walkable(*target):
+            return False
+        self.target = target
+        self.rebuild()
+        return True
+
+    def rebuild(self):
+        inf = float("inf")
+        dist = [[inf] * self.map_tw for _ in range(self.map_th)]
+        tx, ty = self.target
+        dist[ty][tx] = 0.0
+        heap = [(0.0, tx, ty)]
+        while heap:
+            d, x, y = heapq.heappop(heap)
+            if d > dist[y][x]:
+                continue
+            for nx, ny, cost in self.steps(x, y):
+                nd = d + cost
+                if nd < dist[ny][nx]:
+                    dist[ny][nx] = nd
+                    heapq.heappush(heap, (nd, nx, ny))
+
+        # 타일마다 거리가 가장 작은 이웃을 다음 칸으로
+        next_tile = [[None] * self.map_tw for _ in range(self.map_th)]
+        for y in range(self.map_th):
+            for x in range(self.map_tw):
+                if dist[y][x] in (0.0, inf):
+                    continue
+                best, best_d = None, dist[y][x]
+                for nx, ny, _ in self.steps(x, y):
+                    if dist[ny][nx] < best_d:
+                        best, best_d = (nx, ny), dist[ny][nx]
+                next_tile[y][x] = best
+        self.dist = dist
+        self.next_tile = next_tile
+        self.rebuilds += 1
+
+    def distance(self, wx, wy):
+        tx, ty = int(wx // self.tile_size), int(wy // self.tile_size)
+        if self.dist is None or not self.walkable(tx, ty):
+            return float("inf")
+        return self.dist[ty][tx]
+
+    def direction(self, wx, wy):
+        """다음 타일 중심을 향하는 단위 벡터 (dx, dy). 목표 타일이거나 갈 수 없으면 None"""
+        tx, ty = int(wx // self.tile_size), int(wy // self.tile_size)
+        if self.next_tile is None or not self.walkable(tx, ty):
+            return None
+        nxt = self.next_tile[ty][tx]
+        if nxt is None:
+            return None
+        half = self.tile_size / 2
+        dx = nxt[0] * self.tile_size + half - wx
+        dy = nxt[1] * self.tile_size + half - wy
+        length = math.hypot(dx, dy)
+        if length == 0:
+            return None
+        return dx / length, dy / length
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+공용 폰트 레지스트리
+- 한글 폰트 폴백 체인(malgungothic → nanumgothic → 기본 폰트)을 시작 시 한 번만 탐색
+- 크기/굵기/기울임별 Font 핸들은 처음 요청할 때 만들고 재사용
+- 어떤 폰트가 선택됐는지 시작 시 출력
+
+pygame.font.SysFont는 폰트가 없어도 예외 없이 기본 폰트를 돌려주기 때문에
+try/except 폴백은 동작하지 않는다. 여기서는 match_font로 실제 경로를 확인한다.
+"""
+import pygame
+
+FALLBACK_CHAIN = ("malgungothic", "nanumgothic")
+
+
+class FontRegistry:
+    def __init__(self, chain=FALLBACK_CHAIN):
+        self.chain = chain
+        self.face = None
+        self.path = None
+        self.resolved = False
+        self.reported = False
+        self.fonts = {}
+
+    def resolve(self):
+        """폴백 체인에서 처음 찾은 폰트 파일을 고른다 (한 번만 실행)"""
+        if self.resolved:
+            return
+        if not pygame.font.get_init():
+            pygame.font.init()
+        self.face = "default"
+        for name in self.chain:
+            path = pygame.font.match_font(name)
+            if path:
+                self.face, self.path = name, path
+                break
+        self.resolved = True
+
+    def get(self, size, bold=False, italic=False):
+        key = (size, bold, italic)
+        font = self.fonts.get(key)
+        if font is None:
+            self.resolve()
+            font = pygame.font.Font(self.path, size)
+            font.set_bold(bold)
+            font.set_italic(italic)
+            self.fonts[key] = font
+        return font
+
+    def report(self):
+        self.resolve()
+        return f"[폰트] {self.face} ({self.path or '내장 기본 폰트'})"
+
+
+registry = FontRegistry()
+
+
+def init_fonts():
+    """시작 시 한 번 호출: 폰트 탐색 후 선택 결과 출력"""
+    if not registry.reported:
+        print(registry.report())
+        registry.reported = True
+    return registry
+
+
+def get_font(size, bold=False, italic=False):
+    return registry.get(size, bold, italic)
@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+"""
+공용 좀비 무리(horde) 시뮬레이션 - NumPy 배치 백엔드 (선택)
+- 위치/경직/공격 애니메이션/쿨다운/체력을 배열로 들고, 추적·경직 감소·공격 시작·바닥 경계 처리를
+  틱마다 배열 연산 한 번씩으로 처리
+- 좀비 객체(members)는 그리기용으로만 남기고, sync_visible()이 화면에 보이는 것만 값을 돌려 씀
+- numpy가 없으면 HAS_NUMPY가 False. 게임은 기존 Zombie.update 루프를 그대로 쓰면 된다
+
+동작은 gameA001 Zombie.update와 같다:
+경직 중이면 경직만 줄이고 끝 → 쿨다운/애니메이션 감소 → 40 안이고 쿨다운·애니메이션이 0이면 공격 시작
+→ 10보다 멀면 speed만큼 다가가되 x, y를 따로 옮겨 보고 바닥 밖이면 그 축만 되돌림
+
+SpriteHorde는 game1 슈터의 스프라이트 좀비용 (추적 이동과 걷기 카운트만):
+rect.center를 배열로 들고 목표 쪽으로 speed만큼 옮긴 뒤 Rect처럼 정수로 반올림(0.5는 0에서 먼 쪽).
+죽은 좀비(remove)의 칸은 다음 add가 재사용하므로 계속 생겨도 배열이 늘지 않는다.
+"""
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    np = None
+    HAS_NUMPY = False
+
+HORDE_CAPACITY = 64
+ATTACK_RANGE = 40
+ATTACK_ANIMATION = 25
+ATTACK_COOLDOWN = 60
+STOP_DISTANCE = 10
+WALK_STEP = 0.15
+
+
+class Horde:
+    def __init__(self, capacity=HORDE_CAPACITY):
+        self.n = 0
+        self.members = []
+        self.alloc(capacity)
+
+    def alloc(self, capacity):
+        old = self.n
+
+        def grow(arr, dtype, shape=()):
+            new = np.zeros((capacity,) + shape, dtype=dtype)
+            if old:
+                new[:old] = arr[:old]
+            return new
+
+        self.pos = grow(getattr(self, "pos", None), np.float64, (2,))
+        self.speed = grow(getattr(self, "speed", None), np.float64)
+        self.walk = grow(getattr(self, "walk", None), np.float64)
+        self.health = grow(getattr(self, "health", None), np.float64)
+        self.stun = grow(getattr(self, "stun", None), np.int32)
+        self.anim = grow(getattr(self, "anim", None), np.int32)
+        self.cooldown = grow(getattr(self, "cooldown", None), np.int32)
+        self.alive = grow(getattr(self, "alive", None), np.bool_)
+
+    def add(self, zombie):
+        """좀비 객체의 현재 값으로 한 칸 등록. zombie.horde_index에 위치를 적어 둔다"""
+        if self.n == len(self.alive):
+            self.alloc(len(self.alive) * 2)
+        i = self.n
+        self.pos[i] = (zombie.world_pos.x, zombie.world_pos.y)
+        self.speed[i] = zombie.speed
+        self.walk[i] = zombie.walk_count
+        self.health[i] = zombie.health
+        self.stun[i] = zombie.stun_time
+        self.anim[i] = zombie.attack_animation
+        self.cooldown[i] = zombie.attack_cooldown
+        self.alive[i] = zombie.alive
+        zombie.horde_index = i
+        self.members.append(zombie)
+        self.n += 1
+        return i
+
+    def step(self, target, floor_rect):
+        """한 틱 진행. target은 (x, y), floor_rect는 이동 가능한 pygame.Rect (None이면 제한 없음)"""
+        n = self.n
+        alive = self.alive[:n]
+        stun, anim, cd = self.stun[:n], self.anim[:n], self.cooldown[:n]
+        pos, walk = self.pos[:n], self.walk[:n]
+
+        stunned = alive & (stun > 0)
+        stun[stunned] -= 1
+        active = alive & ~stunned
+
+        cd[active & (cd > 0)] -= 1
+        anim[active & (anim > 0)] -= 1
+
+        diff = np.asarray(target, dtype=np.float64) - pos
+        dist = np.hypot(diff[:, 0], diff[:, 1])
+
+        attack = active & (dist < ATTACK_RANGE) & (cd == 0) & (anim == 0)
+        anim[attack] = ATTACK_ANIMATION
+        cd[attack] = ATTACK_COOLDOWN
+
+        free = active & ~attack
+        moving = free & (dist > STOP_DISTANCE)
+        walk[moving] += WALK_STEP
+        walk[free & ~moving] = 0
+
+        idx = np.nonzero(moving)[0]
+        if not len(idx):
+            return
+        move = diff[idx] / dist[idx, None] * self.speed[idx, None]
+        p = pos[idx]
+        if floor_rect is None:
+            pos[idx] = p + move
+            return
+        left, top, right, bottom = floor_rect.left, floor_rect.top, floor_rect.right, floor_rect.bottom
+
+        # x 먼저 옮기고 바닥 밖이면 되돌림, 그다음 y (Rect.collidepoint와 같은 반열린 구간)
+        nx = p[:, 0] + move[:, 0]
+        ok = (left <= nx) & (nx < right) & (top <= p[:, 1]) & (p[:, 1] < bottom)
+        p[:, 0] = np.where(ok, nx, p[:, 0])
+        ny = p[:, 1] + move[:, 1]
+        ok = (left <= p[:, 0]) & (p[:, 0] < right) & (top <= ny) & (ny < bottom)
+        p[:, 1] = np.where(ok, ny, p[:, 1])
+        pos[idx] = p
+
+    def distances(self, pos):
+        d = self.pos[:self.n] - (pos[0], pos[1])
+        return np.hypot(d[:, 0], d[:, 1])
+
+    def count_attacking(self, pos, radius):
+        """pos에서 radius 안에 있는, 공격 모션 중인 좀비 수"""
+        n = self.n
+        near = self.alive[:n] & (self.anim[:n] > 0) & (self.distances(pos) < radius)
+        return int(np.count_nonzero(near))
+
+    def first_within(self, pos, radius):
+        """등록 순서상 처음으로 radius 안에 있는 살아 있는 좀비 번호 (없으면 None)"""
+        hits = np.nonzero(self.alive[:self.n] & (self.distances(pos) < radius))[0]
+        return int(hits[0]) if len(hits) else None
+
+    def hit(self, i, damage, stun):
+        self.health[i] -= damage
+        self.stun[i] = stun
+        if self.health[i] <= 0:
+            self.alive[i] = False
+
+    def alive_count(self):
+        return int(np.count_nonzero(self.alive[:self.n]))
+
+    def sync_visible(self, to_screen, bounds):
+        """화면에 보이는 살아 있는 좀비만 객체에 값을 돌려 쓰고 그 목록을 돌려줌.
+        to_screen(xs, ys) -> (sx, sy) 배열, bounds = (left, top, right, bottom)"""
+        n = self.n
+        sx, sy = to_screen(self.pos[:n, 0], self.pos[:n, 1])
+        left, top, right, bottom = bounds
+        visible = self.alive[:n] & (sx >= left) & (sx < right) & (sy >= top) & (sy < bottom)
+        result = []
+        for i in np.nonzero(visible)[0]:
+            z = self.members[i]
+            z.world_pos.x, z.world_pos.y = self.pos[i]
+            z.walk_count = float(self.walk[i])
+            z.health = float(self.health[i])
+            z.stun_time = int(self.stun[i])
+            z.attack_animation = int(self.anim[i])
+            z.attack_cooldown = int(self.cooldown[i])
+            z.alive = True
+            result.append(z)
+        return result
+
+
+class SpriteHorde:
+    def __init__(self, capacity=HORDE_CAPACITY):
+        self.n = 0
+        self.members = []
+        self.free = []
+        self.alloc(capacity)
+
+    def alloc(self, capacity):
+        old = self.n
+
+        def grow(arr, dtype, shape=()):
+            new = np.zeros((capacity,) + shape, dtype=dtype)
+            if old:
+                new[:old] = arr[:old]
+            return new
+
+        self.center = grow(getattr(self, "center", None), np.float64, (2,))
+        self.speed = grow(getattr(self, "speed", None), np.float64)
+        self.walk = grow(getattr(self, "walk", None), np.float64)
+        self.alive = grow(getattr(self, "alive", None), np.bool_)
+
+    def add(self, sprite, speed):
+        """스프라이트의 현재 rect.center / walk_cnt로 한 칸 등록. sprite.horde_index에 위치를 적어 둔다"""
+        if self.free:
+            i = self.free.pop()
+            self.members[i] = sprite
+        else:
+            if self.n == len(self.alive):
+                self.alloc(len(self.alive) * 2)
+            i = self.n
+            self.members.append(sprite)
+            self.n += 1
+        self.center[i] = sprite.rect.center
+        self.speed[i] = speed
+        self.walk[i] = sprite.walk_cnt
+        self.alive[i] = True
+        sprite.horde_index = i
+        return i
+
+    def remove(self, sprite):
+        """kill된 스프라이트를 빼고 칸을 비워 둠 (다른 무리의 스프라이트나 두 번째 호출은 무시)"""
+        i = getattr(sprite, "horde_index", None)
+        if i is None or i >= self.n or self.members[i] is not sprite:
+            return
+        self.alive[i] = False
+        self.members[i] = None
+        self.free.append(i)
+        sprite.horde_index = None
+
+    def step(self, target):
+        """한 틱 진행: 살아 있는 좀비 모두 target (x, y) 쪽으로 speed만큼, 걷기 카운트 +1"""
+        idx = np.nonzero(self.alive[:self.n])[0]
+        if not len(idx):
+            return
+        c = self.center[idx]
+        diff = np.asarray(target, dtype=np.float64) - c
+        # Vector2.length / normalize와 같은 순서로 계산 (반올림 경계에서 결과가 갈리지 않게)
+        dist = np.sqrt(diff[:, 0] * diff[:, 0] + diff[:, 1] * diff[:, 1])
+        moving = dist > 0
+        moved = c[moving] + diff[moving] / dist[moving, None] * self.speed[idx[moving], None]
+        c[moving] = np.copysign(np.floor(np.abs(moved) + 0.5), moved)
+        self.center[idx] = c
+        self.walk[idx] += 1
+
+    def sync(self):
+        """살아 있는 좀비 스프라이트에 rect.center / walk_cnt를 돌려 쓰고 그 목록을 돌려줌 (그리기/충돌용)"""
+        idx = np.nonzero(self.alive[:self.n])[0]
+        members = self.members
+        result = []
+        # numpy 원소를 하나씩 꺼내면 느리므로 tolist()로 한 번에 파이썬 값으로
+        for i, center, walk in zip(idx.tolist(), self.center[idx].astype(np.int64).tolist(), self.walk[idx].tolist()):
+            sprite = members[i]
+            sprite.rect.center = center
+            sprite.walk_cnt = walk
+            result.append(sprite)
+        return result
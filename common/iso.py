@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""
+공용 아이소메트릭 좌표 변환
+- to_iso / from_iso: 점 하나 변환과 역변환 (마우스 → 월드 좌표, 타일 고르기)
+- project_many: x, y 배열을 한 번에 변환 (numpy가 있으면 배열 연산, 없으면 리스트)
+- IsoMesh: 바닥 타일 격자나 벽 목록의 폴리곤을 iso 공간에서 한 번만 계산해 두고,
+  프레임마다 카메라 오프셋만 더해 미리 만든 버퍼에 제자리로 씀 → 타일마다 꼭짓점 튜플을 새로 만들지 않는다
+- DiamondBuffer: 컬링된 바닥처럼 그릴 타일이 매 프레임 달라지는 루프에서 마름모 하나를 재사용
+
+    floor = tile_mesh(room.origin_x, room.origin_y, room.tw, room.th, TILE_SIZE)   # 방마다 한 번
+    for pts in floor.at(cam_off):                                                  # 매 프레임
+        pygame.draw.polygon(screen, COLOR_FLOOR, pts)
+
+화면 좌표 = iso 좌표 + cam_off. 타일 (tx, ty)의 마름모는 월드 (tx*T, ty*T)를 변환한 윗꼭짓점에서
+TILE_DIAMONDS[T] 만큼 떨어진 네 점 (위 → 오른쪽 → 아래 → 왼쪽).
+"""
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    np = None
+    HAS_NUMPY = False
+
+
+def to_iso(x, y):
+    return (x - y), (x + y) / 2
+
+
+iso_projection = to_iso     # 예전 스크립트들이 쓰던 이름
+
+
+def from_iso(ix, iy):
+    """to_iso의 역변환: iso 좌표 → 월드 좌표"""
+    return iy + ix / 2, iy - ix / 2
+
+
+def screen_to_world(sx, sy, cam_off):
+    """화면 좌표(마우스 위치 등) → 월드 좌표"""
+    return from_iso(sx - cam_off[0], sy - cam_off[1])
+
+
+def screen_to_tile(sx, sy, cam_off, tile_size):
+    """화면 좌표 아래에 있는 타일 (tx, ty)"""
+    wx, wy = screen_to_world(sx, sy, cam_off)
+    return int(wx // tile_size), int(wy // tile_size)
+
+
+def project_many(xs, ys, cam_off=(0, 0)):
+    """월드 좌표 배열 → 화면 좌표 배열 (sx, sy). numpy 배열이면 배열로, 아니면 리스트로"""
+    ox, oy = cam_off
+    if HAS_NUMPY and isinstance(xs, np.ndarray):
+        return xs - ys + ox, (xs + ys) / 2 + oy
+    return [x - y + ox for x, y in zip(xs, ys)], [(x + y) / 2 + oy for x, y in zip(xs, ys)]
+
+
+TILE_DIAMONDS = {}      # tile_size -> 윗꼭짓점 기준 네 꼭짓점 오프셋
+
+
+def tile_diamond(tile_size):
+    offsets = TILE_DIAMONDS.get(tile_size)
+    if offsets is None:
+        t = tile_size
+        offsets = ((0, 0), (t, t / 2), (0, t), (-t, t / 2))
+        TILE_DIAMONDS[tile_size] = offsets
+    return offsets
+
+
+class IsoMesh:
+    """꼭짓점 수가 같은 폴리곤 묶음 (iso 공간, 카메라 오프셋 미적용).
+    화면 좌표는 미리 만들어 둔 [x, y] 리스트 버퍼에 제자리로 써서, 프레임마다 새 리스트/튜플을 만들지 않는다"""
+
+    def __init__(self, polygons):
+        if HAS_NUMPY and isinstance(polygons, np.ndarray):
+            polygons = polygons.tolist()
+        self.count = len(polygons)
+        self.base = [tuple((x, y) for x, y in poly) for poly in polygons]
+        self.buffer = [[[x, y] for x, y in poly] for poly in self.base]
+        self.offset = (0, 0)
+
+    def at(self, cam_off):
+        """화면 좌표 폴리곤 목록 (만든 순서 그대로). 매번 같은 버퍼를 돌려주므로 다음 호출 전까지만 유효"""
+        ox, oy = cam_off
+        if self.offset != (ox, oy):
+            for poly, base in zip(self.buffer, self.base):
+                for p, (bx, by) in zip(poly, base):
+                    p[0] = bx + ox
+                    p[1] = by + oy
+            self.offset = (ox, oy)
+        return self.buffer
+
+
+class DiamondBuffer:
+    """타일 마름모 한 개짜리 재사용 꼭짓점 버퍼. 타일이 드문드문하거나 컬링으로 매번 바뀌는 바닥 루프용
+
+        diamond = DiamondBuffer(TILE_SIZE)
+        ox, oy = cam_off
+        for ...:
+            pts = diamond.at(ix + ox, iy + oy)      # 같은 리스트를 제자리 갱신
+            pygame.draw.polygon(screen, color, pts)
+    """
+
+    def __init__(self, tile_size):
+        self.points = [[0, 0], [0, 0], [0, 0], [0, 0]]
+        self.offsets = tile_diamond(tile_size)
+
+    def at(self, sx, sy):
+        """윗꼭짓점이 화면 (sx, sy)인 마름모"""
+        (a, b, c, d), (_, (bx, by), (cx, cy), (dx, dy)) = self.points, self.offsets
+        a[0] = sx
+        a[1] = sy
+        b[0] = sx + bx
+        b[1] = sy + by
+        c[0] = sx + cx
+        c[1] = sy + cy
+        d[0] = sx + dx
+        d[1] = sy + dy
+        return self.points
+
+
+def tile_mesh(x0, y0, tw, th, tile_size):
+    """(x0, y0)부터 tw x th 타일 바닥의 마름모들. 순서는 tx 바깥, ty 안쪽 (기존 바닥 루프와 같음)"""
+    diamond = tile_diamond(tile_size)
+    if HAS_NUMPY:
+        tx, ty = np.meshgrid(np.arange(x0, x0 + tw), np.arange(y0, y0 + th), indexing="ij")
+        ix, iy = project_many((tx * tile_size).ravel().astype(np.float64), (ty * tile_size).ravel().astype(np.float64))
+        tops = np.stack([ix, iy], axis=1)
+        return IsoMesh(tops[:, None, :] + np.array(diamond, dtype=np.float64)[None, :, :])
+    polygons = []
+    for tx in range(x0, x0 + tw):
+        for ty in range(y0, y0 + th):
+            ix, iy = to_iso(tx * tile_size, ty * tile_size)
+            polygons.append([(ix + dx, iy + dy) for dx, dy in diamond])
+    return IsoMesh(polygons)
+
+
+def wall_mesh(segments, lift):
+    """월드 좌표 선분 [(x0, y0, x1, y1), ...]을 세운 사각형들.
+    lift는 화면 y로 더할 높이 (위로 세우면 -벽 높이): 시작 → 끝 → 끝+lift → 시작+lift"""
+    polygons = []
+    for x0, y0, x1, y1 in segments:
+        sx, sy = to_iso(x0, y0)
+        ex, ey = to_iso(x1, y1)
+        polygons.append([(sx, sy), (ex, ey), (ex, ey + lift), (sx, sy + lift)])
+    return IsoMesh(polygons)
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+"""
+공용 스프라이트 풀
+- kill()된 스프라이트를 버리지 않고 보관했다가 acquire()에서 reset(*args)로 다시 씀
+- 총알처럼 짧게 살고 자주 생기는 객체의 생성/GC 비용을 없앤다
+
+풀에 넣을 클래스는 reset(*args)를 갖고, kill()을 오버라이드해서 pool.release(self)를 부른다.
+"""
+
+POOL_MAX_FREE = 256
+
+
+class SpritePool:
+    def __init__(self, cls, max_free=POOL_MAX_FREE):
+        self.cls = cls
+        self.max_free = max_free
+        self.free = []
+        self.created = 0
+        self.in_use = 0
+
+    def acquire(self, *args):
+        if self.free:
+            sprite = self.free.pop()
+            sprite.reset(*args)
+        else:
+            sprite = self.cls(*args)
+            self.created += 1
+        self.in_use += 1
+        return sprite
+
+    def release(self, sprite):
+        self.in_use -= 1
+        if len(self.free) < self.max_free:
+            self.free.append(sprite)
+
+    def stats(self):
+        return f"{self.in_use} 사용 / {len(self.free)} 대기 / {self.created} 생성"
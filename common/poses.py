@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+공용 포즈 캐시 - 캐릭터를 (역할, 방향 8, 걷기 위상) 포즈별로 한 번만 그려 두고 blit만 함
+- 처음 보는 포즈는 그 자리에서 굽는다: look_dir / walk_count(와 neutral에 준 속성)를
+  대표값으로 잠깐 바꿔 render로 셀에 그린 뒤 되돌림
+- 셀 안의 anchor가 발 위치. draw(surface, char, x, y)는 발이 화면 (x, y)에 오게 찍는다
+- phases=1이면 걷기 0 한 포즈만 (임포스터, common/quality.py ImpostorCache)
+
+    poses = PoseCache(lambda char, cell, ax, ay: char.draw_pose(cell, ax, ay), (64, 104), (32, 92), phases=8)
+    poses.draw(screen, member, cx, cy)
+
+render의 반환값은 포즈별로 poses.info[key]에 남는다 (예: 머리 높이 → 조종 표시 위치).
+"""
+import math
+
+import pygame
+
+POSE_FACINGS = [(math.cos(k * math.pi / 4), math.sin(k * math.pi / 4)) for k in range(8)]
+
+
+def facing_index(look_dir):
+    return int(round(math.atan2(look_dir.y, look_dir.x) / (math.pi / 4))) % 8
+
+
+def phase_index(walk_count, phases):
+    return int(round(walk_count / (2 * math.pi) * phases)) % phases
+
+
+class PoseCache:
+    def __init__(self, render, cell_size, anchor, phases=1, neutral=None):
+        self.render = render            # render(char, cell, ax, ay): cell의 (ax, ay)에 발이 오게 그림
+        self.cell_size = cell_size
+        self.anchor = anchor
+        self.phases = phases
+        self.neutral = neutral or {}    # 구울 때만 바꿔 둘 속성 (예: {"is_controlled": False})
+        self.cells = {}
+        self.info = {}
+
+    def pose_key(self, char, *extra):
+        phase = phase_index(char.walk_count, self.phases) if self.phases > 1 else 0
+        return (char.role, facing_index(char.look_dir), phase) + extra
+
+    def bake(self, char, key):
+        _, facing, phase = key[:3]
+        cell = pygame.Surface(self.cell_size, pygame.SRCALPHA)
+        names = ("look_dir", "walk_count") + tuple(self.neutral)
+        saved = [getattr(char, name) for name in names]
+        char.look_dir = pygame.Vector2(POSE_FACINGS[facing])
+        char.walk_count = phase * 2 * math.pi / self.phases
+        for name, value in self.neutral.items():
+            setattr(char, name, value)
+        self.info[key] = self.render(char, cell, self.anchor[0], self.anchor[1])
+        for name, value in zip(names, saved):
+            setattr(char, name, value)
+        self.cells[key] = cell
+        return cell
+
+    def bake_all(self, chars):
+        """미리 모든 방향 × 위상을 굽는다 (첫 프레임 끊김 방지)"""
+        for char in chars:
+            for facing in range(len(POSE_FACINGS)):
+                for phase in range(self.phases):
+                    key = (char.role, facing, phase)
+                    if key not in self.cells:
+                        self.bake(char, key)
+
+    def draw(self, surface, char, x, y, *extra):
+        """발이 화면 (x, y)에 오게 찍고 포즈 키를 돌려줌. extra는 모습을 바꾸는 다른 상태 (키에 들어감)"""
+        key = self.pose_key(char, *extra)
+        cell = self.cells.get(key)
+        if cell is None:
+            cell = self.bake(char, key)
+        surface.blit(cell, (int(x) - self.anchor[0], int(y) - self.anchor[1]))
+        return key
@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+"""
+공용 프레임 프로파일러
+- 프레임을 단계(이벤트/업데이트/방 그리기/캐릭터/UI/flip)별로 재서 최근 N프레임의 p50/p95/p99를 계산
+- 화면 왼쪽 위에 단계별 누적 막대 그래프 + 16.6ms 기준선 오버레이
+- F3 키 또는 환경변수 OSH_PROFILE=1로 켜고, OSH_PROFILE_TRACE=경로(.json/.csv)면 종료 시 트레이스 저장
+
+꺼져 있을 때 phase()는 아무것도 재지 않는 공용 컨텍스트를 돌려주므로 비용이 거의 없다.
+
+    profiler = FrameProfiler()
+    while running:
+        profiler.begin_frame()
+        with profiler.phase("events"):
+            ...
+        profiler.draw(screen)
+        with profiler.phase("flip"):
+            pygame.display.flip()
+        profiler.end_frame()
+    profiler.close()
+"""
+import os
+import csv
+import json
+import time
+from collections import deque
+from contextlib import nullcontext
+
+import pygame
+
+from common.fonts import get_font
+
+PROFILE_ENV = "OSH_PROFILE"
+TRACE_ENV = "OSH_PROFILE_TRACE"
+PROFILE_KEY = pygame.K_F3
+PROFILE_HISTORY = 300          # 통계/그래프에 쓰는 최근 프레임 수
+FRAME_BUDGET_MS = 1000 / 60
+OVERLAY_W, OVERLAY_H = 300, 80
+OVERLAY_TEXT_EVERY = 15        # 통계 글자는 이 프레임마다 한 번만 다시 만든다
+
+PHASE_COLORS = [
+    (90, 160, 255), (120, 220, 120), (255, 190, 80), (230, 110, 200),
+    (120, 220, 230), (240, 90, 90), (200, 200, 120), (170, 140, 255),
+]
+
+_NULL_PHASE = nullcontext()
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    i = min(len(sorted_values) - 1, int(round(p / 100 * (len(sorted_values) - 1))))
+    return sorted_values[i]
+
+
+class _Phase:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        ms = (time.perf_counter() - self.start) * 1000
+        current = self.profiler.current
+        current[self.name] = current.get(self.name, 0.0) + ms
+        return False
+
+
+class FrameProfiler:
+    def __init__(self, enabled=None, history=PROFILE_HISTORY, trace_path=None):
+        if enabled is None:
+            enabled = os.environ.get(PROFILE_ENV, "") not in ("", "0")
+        self.enabled = enabled
+        self.trace_path = trace_path or os.environ.get(TRACE_ENV)
+        self.history = history
+
+        self.phases = []                  # 처음 나온 순서 (그래프 색 순서)
+        self.frames = deque(maxlen=history)
+        self.trace = []                   # 트레이스 저장용 전체 기록 (trace_path가 있을 때만)
+        self.current = {}
+        self.counters = {}
+        self.frame_start = None
+        self.frame_index = 0
+
+        self.overlay = None
+        self.text_rows = []
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.frames.clear()
+        self.frame_start = None
+
+    def handle_event(self, event):
+        """F3이면 켜고 끔. 처리했으면 True"""
+        if event.type == pygame.KEYDOWN and event.key == PROFILE_KEY:
+            self.toggle()
+            return True
+        return False
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self.current = {}
+        self.frame_start = time.perf_counter()
+
+    def phase(self, name):
+        if not self.enabled or self.frame_start is None:
+            return _NULL_PHASE
+        return _Phase(self, name)
+
+    def count(self, name, value):
+        """프레임마다 바뀌는 값(풀 크기, 품질 단계 등)을 오버레이와 트레이스에 함께 기록"""
+        if self.enabled:
+            self.counters[name] = value
+
+    def end_frame(self):
+        if not self.enabled or self.frame_start is None:
+            return
+        total = (time.perf_counter() - self.frame_start) * 1000
+        for name in self.current:
+            if name not in self.phases:
+                self.phases.append(name)
+        frame = dict(self.current)
+        frame["total"] = total
+        self.frames.append(frame)
+        if self.trace_path:
+            row = {"frame": self.frame_index}
+            row.update(frame)
+            row.update(self.counters)
+            self.trace.append(row)
+        self.frame_index += 1
+        self.frame_start = None
+
+    def stats(self):
+        """{단계: (p50, p95, p99)} (ms). 'total'은 begin_frame~end_frame 전체"""
+        result = {}
+        for name in self.phases + ["total"]:
+            values = sorted(f.get(name, 0.0) for f in self.frames)
+            result[name] = (percentile(values, 50), percentile(values, 95), percentile(values, 99))
+        return result
+
+    def draw(self, surface, pos=(10, 10)):
+        if not self.enabled or not self.frames:
+            return
+        if self.overlay is None:
+            self.overlay = pygame.Surface((OVERLAY_W, OVERLAY_H), pygame.SRCALPHA)
+        overlay = self.overlay
+        overlay.fill((0, 0, 0, 170))
+
+        # 최근 프레임을 오른쪽 끝부터 1px 막대로, 단계별 색을 쌓아서 그림
+        scale = OVERLAY_H / (FRAME_BUDGET_MS * 2)
+        x = OVERLAY_W - 1
+        for frame in reversed(self.frames):
+            if x < 0:
+                break
+            y = OVERLAY_H
+            for i, name in enumerate(self.phases):
+                h = frame.get(name, 0.0) * scale
+                if h >= 0.5:
+                    pygame.draw.line(overlay, PHASE_COLORS[i % len(PHASE_COLORS)], (x, y), (x, max(0, y - h)))
+                y -= h
+            x -= 1
+        budget_y = OVERLAY_H - FRAME_BUDGET_MS * scale
+        pygame.draw.line(overlay, (255, 255, 255, 200), (0, budget_y), (OVERLAY_W, budget_y))
+        surface.blit(overlay, pos)
+
+        if self.frame_index % OVERLAY_TEXT_EVERY == 0 or not self.text_rows:
+            font = get_font(14)
+            self.text_rows = []
+            stats = self.stats()
+            for i, name in enumerate(self.phases + ["total"]):
+                color = PHASE_COLORS[i % len(PHASE_COLORS)] if name != "total" else (255, 255, 255)
+                p50, p95, p99 = stats[name]
+                line = f"{name:<8} {p50:5.1f} {p95:5.1f} {p99:5.1f} ms"
+                self.text_rows.append(font.render(line, True, color))
+            for name, value in self.counters.items():
+                self.text_rows.append(font.render(f"{name}: {value}", True, (220, 220, 220)))
+        y = pos[1] + OVERLAY_H + 4
+        for row in self.text_rows:
+            surface.blit(row, (pos[0], y))
+            y += row.get_height()
+
+    def dump(self, path):
+        """기록한 프레임을 .csv 또는 .json으로 저장"""
+        if path.endswith(".csv"):
+            fields = ["frame"]
+            for row in self.trace:
+                for key in row:
+                    if key not in fields:
+                        fields.append(key)
+            with open(path, "w", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=fields)
+                writer.writeheader()
+                writer.writerows(self.trace)
+        else:
+            with open(path, "w") as f:
+                json.dump({"phases": self.phases, "stats": self.stats(), "frames": self.trace}, f)
+
+    def close(self):
+        if self.trace_path and self.trace:
+            self.dump(self.trace_path)
+            print(f"[프로파일러] {len(self.trace)}프레임 트레이스 저장: {self.trace_path}")
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+공용 품질 조절기 - 프레임 시간을 보고 그리기 디테일을 단계별로 낮췄다 올림
+- 프레임 작업 시간(clock.tick 대기 제외)의 지수 평균이 예산(1000/목표 FPS ms)을 넘는 상태가
+  QUALITY_DOWN_FRAMES 동안 이어지면 한 단계 낮춤
+- 예산의 QUALITY_HEADROOM 배 아래로 QUALITY_UP_FRAMES 동안 머물면 한 단계 올림 (내릴 때보다 오래 기다림 → 깜빡임 없음)
+- 단계를 바꾼 직후에는 평균을 새로 잰다
+- OSH_QUALITY=0이면 항상 최고 단계 (비교 측정용)
+
+단계는 아래로 갈수록 앞 단계 설정을 유지한 채 하나씩 더 끈다:
+  0 최고 → 1 바닥 격자선 끔 → 2 캐릭터 임포스터 → 3 벽 윗면 끔 → 4 화면 밖 여유(컬링) 축소
+
+    quality = QualityGovernor()
+    while True:
+        quality.begin_frame()
+        ...
+        draw_map(screen, ..., outlines=quality.get("outlines"))
+        profiler.count("quality", quality.level)
+        pygame.display.flip()
+        quality.end_frame()
+        clock.tick(FPS)
+"""
+import os
+import time
+
+from common.poses import PoseCache
+
+QUALITY_LEVELS = [
+    {"name": "최고", "outlines": True, "impostors": False, "wall_tops": True, "cull_scale": 1.0},
+    {"name": "격자선 끔", "outlines": False, "impostors": False, "wall_tops": True, "cull_scale": 1.0},
+    {"name": "임포스터", "outlines": False, "impostors": True, "wall_tops": True, "cull_scale": 1.0},
+    {"name": "벽 윗면 끔", "outlines": False, "impostors": True, "wall_tops": False, "cull_scale": 1.0},
+    {"name": "컬링 축소", "outlines": False, "impostors": True, "wall_tops": False, "cull_scale": 0.25},
+]
+QUALITY_DOWN_FRAMES = 30
+QUALITY_UP_FRAMES = 180
+QUALITY_HEADROOM = 0.7
+QUALITY_SMOOTHING = 0.1
+
+
+class QualityGovernor:
+    def __init__(self, target_fps=60, levels=QUALITY_LEVELS, enabled=None):
+        if enabled is None:
+            enabled = os.environ.get("OSH_QUALITY", "1") != "0"
+        self.enabled = enabled
+        self.levels = levels
+        self.budget_ms = 1000.0 / target_fps
+        self.level = 0
+        self.avg_ms = None
+        self.over = 0
+        self.under = 0
+        self.changes = 0
+        self.start = None
+
+    def get(self, name):
+        return self.levels[self.level][name]
+
+    @property
+    def name(self):
+        return self.levels[self.level]["name"]
+
+    def begin_frame(self):
+        self.start = time.perf_counter()
+
+    def end_frame(self):
+        if self.start is None:
+            return
+        self.observe((time.perf_counter() - self.start) * 1000)
+        self.start = None
+
+    def observe(self, frame_ms):
+        """프레임 작업 시간 하나를 반영. 단계가 바뀌었으면 True"""
+        if not self.enabled:
+            return False
+        if self.avg_ms is None:
+            self.avg_ms = frame_ms
+        else:
+            self.avg_ms += (frame_ms - self.avg_ms) * QUALITY_SMOOTHING
+
+        if self.avg_ms > self.budget_ms:
+            self.over += 1
+            self.under = 0
+        elif self.avg_ms < self.budget_ms * QUALITY_HEADROOM:
+            self.under += 1
+            self.over = 0
+        else:
+            self.over = self.under = 0
+
+        if self.over >= QUALITY_DOWN_FRAMES and self.level < len(self.levels) - 1:
+            return self.set_level(self.level + 1)
+        if self.under >= QUALITY_UP_FRAMES and self.level > 0:
+            return self.set_level(self.level - 1)
+        return False
+
+    def set_level(self, level):
+        self.level = level
+        self.avg_ms = None
+        self.over = self.under = 0
+        self.changes += 1
+        return True
+
+
+# 임포스터: 캐릭터를 8방향 × 대표 포즈(걷기 0)로 한 번 그려 두고 찍기만 함 (걷기 위상 1개짜리 포즈 캐시)
+IMPOSTOR_SIZE = (96, 128)
+IMPOSTOR_ANCHOR = (48, 112)     # 발 위치
+
+
+def draw_at_anchor(char, cell, ax, ay):
+    """char.draw(surface, cam_off)로 그리는 캐릭터를 발이 셀의 (ax, ay)에 오게"""
+    ix, iy = char.world_pos.x - char.world_pos.y, (char.world_pos.x + char.world_pos.y) / 2
+    char.draw(cell, (ax - ix, ay - iy))
+
+
+class ImpostorCache(PoseCache):
+    def __init__(self, size=IMPOSTOR_SIZE, anchor=IMPOSTOR_ANCHOR):
+        super().__init__(draw_at_anchor, size, anchor, phases=1)
+
+    def draw(self, surface, char, cam_off, *extra):
+        """char.draw(surface, cam_off) 대신. extra는 모습을 바꾸는 다른 상태 (예: 조종 중 표시)"""
+        ix, iy = char.world_pos.x - char.world_pos.y, (char.world_pos.x + char.world_pos.y) / 2
+        return super().draw(surface, char, ix + cam_off[0], iy + cam_off[1], *extra)
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""
+공용 리전(region) 월드 포맷 - 큰 맵을 조각으로 저장하고 카메라 근처만 메모리에 올림
+- 맵을 REGION_SIZE x REGION_SIZE 타일 리전으로 나눠 리전마다 바이너리 파일 하나
+  (타일당 1바이트 방 번호, 0이면 벽/빈칸. 행 우선)
+- world.json: 맵 크기, 타일 크기, 리전 크기, 방 팔레트, 시작 위치, 파일이 있는 리전 목록
+  (전부 0인 리전은 파일을 만들지 않는다)
+- RegionWorld는 리전을 처음 건드릴 때 파일을 읽고, update()에서 카메라 주변을 미리 읽고
+  REGION_MAX_LOADED개를 넘으면 오래 안 쓴 리전부터 내보냄
+
+    write_world("worlds/p008", map_tw, map_th, rooms, tilemap.index_at, TILE_SIZE)
+    world = RegionWorld("worlds/p008")
+    world.update(cam_wx, cam_wy)        # 매 프레임
+    world.index_at(tx, ty)              # 방 번호 (안 읽힌 리전이면 그 자리에서 읽음)
+
+TileMap(game3/p008)과 같은 조회 메서드를 가지므로 그 자리에 그대로 넘길 수 있다.
+"""
+import os
+import json
+from collections import OrderedDict
+
+REGION_SIZE = 32
+REGION_PRELOAD = 1         # 카메라가 있는 리전에서 이 거리(리전 단위)까지 미리 읽음
+REGION_MAX_LOADED = 64
+WORLD_HEADER = "world.json"
+FORMAT_VERSION = 1
+
+
+def region_file(rx, ry):
+    return f"r_{rx}_{ry}.bin"
+
+
+def write_world(path, map_tw, map_th, rooms, index_at, tile_size, spawn=None, region_size=REGION_SIZE):
+    """index_at(tx, ty) -> 방 번호(0~255)를 리전 파일로 저장.
+    rooms는 1번 방부터 [{"room_id", "room_name", "color"}, ...]. spawn은 시작 월드 좌표 (x, y)"""
+    if len(rooms) > 255:
+        raise ValueError("방은 255개까지")
+    os.makedirs(path, exist_ok=True)
+    written = []
+    for ry in range((map_th + region_size - 1) // region_size):
+        for rx in range((map_tw + region_size - 1) // region_size):
+            data = bytearray(region_size * region_size)
+            tx0, ty0 = rx * region_size, ry * region_size
+            for ly in range(min(region_size, map_th - ty0)):
+                row = ly * region_size
+                for lx in range(min(region_size, map_tw - tx0)):
+                    data[row + lx] = index_at(tx0 + lx, ty0 + ly)
+            name = os.path.join(path, region_file(rx, ry))
+            if any(data):
+                with open(name, "wb") as f:
+                    f.write(data)
+                written.append([rx, ry])
+            elif os.path.exists(name):
+                os.remove(name)
+
+    header = {
+        "version": FORMAT_VERSION,
+        "map_tw": map_tw,
+        "map_th": map_th,
+        "tile_size": tile_size,
+        "region_size": region_size,
+        "rooms": [{"room_id": r["room_id"], "room_name": r["room_name"], "color": list(r["color"])} for r in rooms],
+        "spawn": list(spawn) if spawn else [map_tw * tile_size / 2, map_th * tile_size / 2],
+        "regions": written,
+    }
+    with open(os.path.join(path, WORLD_HEADER), "w", encoding="utf-8") as f:
+        json.dump(header, f, ensure_ascii=False, indent=1)
+    return header
+
+
+class RegionWorld:
+    def __init__(self, path, max_loaded=REGION_MAX_LOADED, preload=REGION_PRELOAD):
+        with open(os.path.join(path, WORLD_HEADER), encoding="utf-8") as f:
+            header = json.load(f)
+        if header.get("version") != FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 월드 버전: {header.get('version')}")
+        self.path = path
+        self.map_tw = header["map_tw"]
+        self.map_th = header["map_th"]
+        self.tile_size = header["tile_size"]
+        self.region_size = header["region_size"]
+        self.rooms = [None] + [{"room_id": r["room_id"], "room_name": r["room_name"], "color": tuple(r["color"])}
+                               for r in header["rooms"]]
+        self.spawn = tuple(header["spawn"])
+        self.present = {tuple(r) for r in header["regions"]}
+        self.empty = bytes(self.region_size * self.region_size)
+        self.max_loaded = max_loaded
+        self.preload = preload
+        self.loaded = OrderedDict()     # (rx, ry) -> bytes, 최근에 쓴 것이 뒤
+        self.on_evict = None            # on_evict((rx, ry)): 리전을 내보낼 때 (리전별 캐시 정리용)
+        self.loads = 0
+
+    def region(self, rx, ry):
+        key = (rx, ry)
+        data = self.loaded.get(key)
+        if data is None:
+            if key in self.present:
+                with open(os.path.join(self.path, region_file(rx, ry)), "rb") as f:
+                    data = f.read()
+                self.loads += 1
+            else:
+                data = self.empty
+            self.loaded[key] = data
+        else:
+            self.loaded.move_to_end(key)    # 팔로워/메시 만들기가 건드린 리전도 최근 사용으로
+        return data
+
+    def update(self, cam_wx, cam_wy):
+        """카메라 주변 리전을 미리 읽고, 너무 많으면 먼 리전부터 내보냄"""
+        span = self.tile_size * self.region_size
+        crx, cry = int(cam_wx // span), int(cam_wy // span)
+        near = set()
+        for ry in range(cry - self.preload, cry + self.preload + 1):
+            for rx in range(crx - self.preload, crx + self.preload + 1):
+                if 0 <= rx * self.region_size < self.map_tw and 0 <= ry * self.region_size < self.map_th:
+                    self.region(rx, ry)
+                    self.loaded.move_to_end((rx, ry))
+                    near.add((rx, ry))
+        for key in list(self.loaded):
+            if len(self.loaded) <= self.max_loaded:
+                break
+            if key not in near:
+                del self.loaded[key]
+                if self.on_evict is not None:
+                    self.on_evict(key)
+
+    def index_at(self, tx, ty):
+        """타일의 방 번호 (맵 밖이면 0)"""
+        if 0 <= tx < self.map_tw and 0 <= ty < self.map_th:
+            size = self.region_size
+            return self.region(tx // size, ty // size)[(ty % size) * size + tx % size]
+        return 0
+
+    def cell(self, tx, ty):
+        return self.rooms[self.index_at(tx, ty)]
+
+    def walkable(self, wx, wy):
+        return self.index_at(int(wx // self.tile_size), int(wy // self.tile_size)) != 0
+
+    def walkable_many(self, points):
+        return [self.walkable(wx, wy) for wx, wy in points]
+
+    def row_slice(self, ty, tx0, tx1):
+        """ty행의 tx0~tx1-1 방 번호 (리전 경계를 넘으면 이어 붙임). 맵 안쪽 범위만"""
+        size = self.region_size
+        ry, ly = ty // size, ty % size
+        parts = []
+        tx = tx0
+        while tx < tx1:
+            rx = tx // size
+            end = min(tx1, (rx + 1) * size)
+            start = ly * size + tx % size
+            parts.append(self.region(rx, ry)[start:start + end - tx])
+            tx = end
+        return b"".join(parts)
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+공용 공간 해시 (균일 격자)
+- SpatialGroup은 pygame.sprite.Group이라 add/kill/draw는 그대로 쓰고,
+  들어온 스프라이트를 rect가 걸치는 격자 칸에 등록해 둔다
+- group.update()가 스프라이트 update 뒤에 칸을 갱신 (칸이 안 바뀌면 아무것도 안 함).
+  다른 곳에서 rect를 옮겼으면 group.move(sprite)를 직접 부른다
+- 충돌 검사는 주변 칸만 본다: 총알 대 좀비, 플레이어 대 좀비, 근접 공격 범위, 아이템 줍기
+
+pygame.sprite.groupcollide/spritecollide는 모든 쌍을 비교(총알 × 좀비)하지만
+여기서는 칸 안에 있는 후보만 rect로 다시 확인하므로 결과는 같고 비용은 주변 밀도에 비례한다.
+"""
+import pygame
+
+SPATIAL_CELL = 128
+
+
+class SpatialGroup(pygame.sprite.Group):
+    def __init__(self, *sprites, cell_size=SPATIAL_CELL):
+        self.cell_size = cell_size
+        self.cells = {}     # (cx, cy) -> {sprite: None} (등록 순서 유지)
+        self.spans = {}     # sprite -> (cx0, cy0, cx1, cy1)
+        super().__init__(*sprites)
+
+    # ---- Group 확장점: add/remove/kill 때 격자에도 반영 ----
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite)
+        self.move(sprite)
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        self.unbin(sprite)
+
+    def update(self, *args, **kwargs):
+        """스프라이트마다 update 한 뒤 칸을 갱신. 스프라이트가 어느 그룹을 알 필요가 없다"""
+        super().update(*args, **kwargs)
+        for sprite in self.sprites():
+            if sprite in self.spritedict:     # update 중에 kill된 것은 건너뜀
+                self.move(sprite)
+
+    def span(self, rect):
+        c = self.cell_size
+        return rect.left // c, rect.top // c, rect.right // c, rect.bottom // c
+
+    def unbin(self, sprite):
+        span = self.spans.pop(sprite, None)
+        if span is None:
+            return
+        cx0, cy0, cx1, cy1 = span
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                cell = self.cells.get((cx, cy))
+                if cell is not None:
+                    cell.pop(sprite, None)
+                    if not cell:
+                        del self.cells[(cx, cy)]
+
+    def move(self, sprite):
+        """스프라이트 rect가 바뀐 뒤 호출. 걸치는 칸이 같으면 그대로 둔다"""
+        span = self.span(sprite.rect)
+        if self.spans.get(sprite) == span:
+            return
+        self.unbin(sprite)
+        self.spans[sprite] = span
+        cx0, cy0, cx1, cy1 = span
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                self.cells.setdefault((cx, cy), {})[sprite] = None
+
+    # ---- 넓은 단계(broad-phase) 질의 ----
+    def query_rect(self, rect):
+        """rect가 걸치는 칸에 등록된 후보 (중복 없음, 아직 rect 비교 전)"""
+        cx0, cy0, cx1, cy1 = self.span(rect)
+        found = {}
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                cell = self.cells.get((cx, cy))
+                if cell:
+                    found.update(cell)
+        return list(found)
+
+    def collide_rect(self, rect):
+        return [s for s in self.query_rect(rect) if rect.colliderect(s.rect)]
+
+    def within(self, pos, radius):
+        """중심이 pos에서 radius 미만인 스프라이트 (근접 공격 범위 등)"""
+        x, y = pos
+        box = pygame.Rect(x - radius, y - radius, radius * 2, radius * 2)
+        r2 = radius * radius
+        result = []
+        for s in self.query_rect(box):
+            dx, dy = s.rect.centerx - x, s.rect.centery - y
+            if dx * dx + dy * dy < r2:
+                result.append(s)
+        return result
+
+    # ---- pygame.sprite 함수와 같은 결과를 내는 대체 함수 ----
+    def spritecollide(self, sprite, dokill=False):
+        """pygame.sprite.spritecollide(sprite, self, dokill)와 같음"""
+        hits = self.collide_rect(sprite.rect)
+        if dokill:
+            for s in hits:
+                s.kill()
+        return hits
+
+    def groupcollide(self, group, dokill_group, dokill_self):
+        """pygame.sprite.groupcollide(group, self, dokill_group, dokill_self)와 같음"""
+        result = {}
+        for a in group.sprites():
+            hits = self.collide_rect(a.rect)
+            if not hits:
+                continue
+            result[a] = hits
+            if dokill_self:
+                for s in hits:
+                    s.kill()
+            if dokill_group:
+                a.kill()
+        return result
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""
+공용 애니메이션 프레임 캐시
+- 팔다리 흔들림을 정해진 걷기 위상(WALK_PHASES개)으로 나누고,
+  (색, 무기, 좀비 여부, 위상) 같은 키마다 SRCALPHA 프레임을 한 번만 그려 둔다
+- 스프라이트는 매 프레임 image를 지우고 다시 그리는 대신 구워 둔 프레임으로 바꿔 끼우기만 한다
+- 메모리 예산을 넘으면 가장 오래 안 쓴 프레임부터 버림 (LRU)
+
+    FRAMES = FrameCache((100, 100), lambda surf, color, weapon, zombie, phase: ...)
+    self.image = FRAMES.get(color, weapon, False, walk_phase(self.walk_cnt, 0.22, moving))
+"""
+import math
+from collections import OrderedDict
+
+import pygame
+
+WALK_PHASES = 12
+FRAME_CACHE_BUDGET = 8 * 1024 * 1024
+
+
+def walk_phase(walk_count, speed, moving=True, phases=WALK_PHASES):
+    """sin(walk_count * speed)의 위상을 phases단계로 양자화. 멈춰 있으면 None"""
+    if not moving:
+        return None
+    return int(round(walk_count * speed / (2 * math.pi) * phases)) % phases
+
+
+def phase_walk_count(phase, speed, phases=WALK_PHASES):
+    """위상을 다시 walk_count로 (기존 그리기 함수에 그대로 넘기기 위해)"""
+    if phase is None:
+        return 0
+    return phase * 2 * math.pi / phases / speed
+
+
+class FrameCache:
+    def __init__(self, size, draw, budget=FRAME_CACHE_BUDGET):
+        self.size = size
+        self.draw = draw              # draw(surface, *key)
+        self.frame_bytes = size[0] * size[1] * 4
+        self.max_frames = max(1, budget // self.frame_bytes)
+        self.frames = OrderedDict()
+
+    def get(self, *key):
+        frame = self.frames.get(key)
+        if frame is not None:
+            self.frames.move_to_end(key)
+            return frame
+        frame = pygame.Surface(self.size, pygame.SRCALPHA)
+        self.draw(frame, *key)
+        self.frames[key] = frame
+        while len(self.frames) > self.max_frames:
+            self.frames.popitem(last=False)
+        return frame
+
+    def warm(self, keys):
+        """게임 시작 때 쓸 프레임을 미리 구움 (첫 등장 때 끊기지 않게)"""
+        for key in keys:
+            self.get(*key)
+
+    def clear(self):
+        self.frames.clear()
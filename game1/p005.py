@@ -1,8 +1,12 @@
 import pygame
+import os
 import sys
 import math
 import random
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.decals import DecalLayer
+
 # --- 1. 환경 설정 ---
 pygame.init()
 SCREEN_WIDTH, SCREEN_HEIGHT = 1000, 800
@@ -99,8 +103,10 @@ player = Survivor()
 all_sprites = pygame.sprite.Group(player)
 zombies, bullets = pygame.sprite.Group(), pygame.sprite.Group()
 
-# 배경 요소 50개 미리 생성
-details = [EnvironmentDetail() for _ in range(50)]
+# 배경 요소 50개를 바닥 레이어에 한 번만 그려 둠
+decals = DecalLayer((SCREEN_WIDTH, SCREEN_HEIGHT), BG_COLOR)
+for _ in range(50):
+    decals.paint(EnvironmentDetail().draw)
 
 font = pygame.font.SysFont("arial", 24, bold=True)
 SPAWN_EVENT = pygame.USEREVENT + 1
@@ -129,10 +135,7 @@ while True:
         if pygame.sprite.spritecollide(player, zombies, False): player.hp -= 0.15
 
     # --- 출력 (그리는 순서가 매우 중요합니다) ---
-    screen.fill(BG_COLOR) # 1. 배경색
-    
-    for detail in details: # 2. 배경 디테일 (바닥에 깔려야 함)
-        detail.draw(screen)
+    decals.draw(screen) # 1~2. 배경색 + 배경 디테일 (바닥에 깔려야 함)
     
     all_sprites.draw(screen) # 3. 캐릭터 및 좀비 (배경 위에 그려짐)
     
@@ -1,9 +1,13 @@
 import pygame
+import os
 import sys
 import math
 import random
 import time
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.decals import DecalLayer
+
 # --- 1. 초기 설정 ---
 pygame.init()
 SCREEN_WIDTH, SCREEN_HEIGHT = 1000, 800
@@ -160,11 +164,12 @@ prologue_lines = ["세상은 단 며칠 만에 무너졌다.", "이것은 당신
 pro_idx = 0
 
 def init_game():
-    global player, all_sprites, zombies, bullets, details
+    global player, all_sprites, zombies, bullets, decals
     player = Survivor()
     all_sprites = pygame.sprite.Group(player)
     zombies, bullets = pygame.sprite.Group(), pygame.sprite.Group()
-    details = [EnvDetail() for _ in range(40)]
+    decals = DecalLayer((SCREEN_WIDTH, SCREEN_HEIGHT), BG_COLOR)
+    for _ in range(40): decals.paint(EnvDetail().draw)
 
 SPAWN_EVENT = pygame.USEREVENT + 1
 pygame.time.set_timer(SPAWN_EVENT, 2500)
@@ -215,8 +220,7 @@ while True:
         screen.blit(tip, (500 - tip.get_width()//2, 700))
         
     elif current_state == STATE_GAME:
-        screen.fill(BG_COLOR)
-        for d in details: d.draw(screen)
+        decals.draw(screen)
         
         if player.hp > 0:
             all_sprites.update()
@@ -1,9 +1,15 @@
 import pygame
+import os
 import sys
 import math
 import random
 import time
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.spatial import SpatialGroup
+from common.pool import SpritePool
+from common.profiler import FrameProfiler
+
 # --- 1. 초기 설정 및 환경 변수 ---
 pygame.init()
 SCREEN_WIDTH, SCREEN_HEIGHT = 1000, 800
@@ -18,6 +24,7 @@ BG_COLOR = (35, 40, 35)
 AMMO_GLOCK_COLOR = (200, 200, 100)
 AMMO_SHOTGUN_COLOR = (200, 50, 50)
 ZOMBIE_SKIN = (140, 160, 140)
+MAX_ZOMBIES = 15
 
 # 폰트 로드
 try:
@@ -43,12 +50,18 @@ class Item(pygame.sprite.Sprite):
         pygame.draw.rect(self.image, WHITE, (0, 0, 20, 20), 1)
         self.rect = self.image.get_rect(center=(x, y))
 
+BULLET_IMAGE = pygame.Surface((6, 6))
+BULLET_IMAGE.fill((255, 255, 100))
+SCREEN_RECT = screen.get_rect()
+
 class Bullet(pygame.sprite.Sprite):
-    """권총 및 샷건 탄환"""
+    """권총 및 샷건 탄환 (BULLET_POOL에서 재사용, 이미지는 공유)"""
     def __init__(self, x, y, target_pos, spread_angle=0):
         super().__init__()
-        self.image = pygame.Surface((6, 6))
-        self.image.fill((255, 255, 100))
+        self.image = BULLET_IMAGE
+        self.reset(x, y, target_pos, spread_angle)
+
+    def reset(self, x, y, target_pos, spread_angle=0):
         self.rect = self.image.get_rect(center=(x, y))
         self.pos = pygame.Vector2(x, y)
         
@@ -63,9 +76,18 @@ class Bullet(pygame.sprite.Sprite):
     def update(self):
         self.pos += self.velocity
         self.rect.center = self.pos
-        if not screen.get_rect().contains(self.rect):
+        if not SCREEN_RECT.contains(self.rect):
             self.kill()
 
+    def kill(self):
+        # 그룹에서 빠지면 풀로 돌려보냄 (groupcollide의 dokill도 여기로 옴)
+        if self.alive():
+            super().kill()
+            BULLET_POOL.release(self)
+
+BULLET_POOL = SpritePool(Bullet)
+bullets = pygame.sprite.Group()
+
 class Survivor(pygame.sprite.Sprite):
     def __init__(self):
         super().__init__()
@@ -169,9 +191,10 @@ pro_idx = 0
 
 def init_game():
     global player, all_sprites, zombies, bullets, items
+    for b in bullets.sprites(): b.kill()    # 날아가던 총알도 kill해야 풀 in_use가 맞는다
     player = Survivor()
     all_sprites = pygame.sprite.Group(player)
-    zombies, bullets, items = pygame.sprite.Group(), pygame.sprite.Group(), pygame.sprite.Group()
+    zombies, bullets, items = SpatialGroup(), pygame.sprite.Group(), SpatialGroup()
     for _ in range(5): # 초기 아이템 스폰
         items.add(Item(random.randint(100, 900), random.randint(100, 700), random.choice(['AMMO_GLOCK', 'AMMO_SHOTGUN'])))
 
@@ -180,11 +203,15 @@ pygame.time.set_timer(SPAWN_ZOMBIE, 2500)
 
 # --- 4. 메인 루프 ---
 
+profiler = FrameProfiler()
+
 while True:
+    profiler.begin_frame()
     screen.fill(BLACK)
     events = pygame.event.get()
     for event in events:
-        if event.type == pygame.QUIT: pygame.quit(); sys.exit()
+        if event.type == pygame.QUIT: profiler.close(); pygame.quit(); sys.exit()
+        profiler.handle_event(event)
         
         if current_state == STATE_TITLE:
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
@@ -197,7 +224,7 @@ while True:
                 if pro_idx >= len(prologue_lines): init_game(); current_state = STATE_GAME
         
         elif current_state == STATE_GAME:
-            if event.type == SPAWN_ZOMBIE and len(zombies) < 15:
+            if event.type == SPAWN_ZOMBIE and len(zombies) < MAX_ZOMBIES:
                 z = Zombie(player); zombies.add(z); all_sprites.add(z)
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_1: player.weapon_mode = "BAT"
@@ -207,18 +234,17 @@ while True:
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and player.hp > 0:
                 now = pygame.time.get_ticks()
                 if player.weapon_mode == "GLOCK" and player.ammo_glock > 0 and now - player.last_action > 400:
-                    bullets.add(Bullet(player.rect.centerx, player.rect.centery, event.pos))
+                    bullets.add(BULLET_POOL.acquire(player.rect.centerx, player.rect.centery, event.pos))
                     player.ammo_glock -= 1; player.last_action = now
                 elif player.weapon_mode == "SHOTGUN" and player.ammo_shotgun > 0 and now - player.last_action > 800:
                     for angle in [-15, -7, 0, 7, 15]: # 5발 확산
-                        bullets.add(Bullet(player.rect.centerx, player.rect.centery, event.pos, angle))
+                        bullets.add(BULLET_POOL.acquire(player.rect.centerx, player.rect.centery, event.pos, angle))
                     player.ammo_shotgun -= 1; player.last_action = now
                 elif player.weapon_mode == "BAT" and now - player.last_action > 600:
-                    for z in zombies:
-                        if player.rect.inflate(50, 50).colliderect(z.rect):
-                            z.kill()
-                            if random.random() < 0.2: # 20% 확률로 아이템 드랍
-                                items.add(Item(z.rect.centerx, z.rect.centery, random.choice(['AMMO_GLOCK', 'AMMO_SHOTGUN'])))
+                    for z in zombies.collide_rect(player.rect.inflate(50, 50)):
+                        z.kill()
+                        if random.random() < 0.2: # 20% 확률로 아이템 드랍
+                            items.add(Item(z.rect.centerx, z.rect.centery, random.choice(['AMMO_GLOCK', 'AMMO_SHOTGUN'])))
                     player.last_action = now
 
     # --- 그리기 및 업데이트 ---
@@ -235,12 +261,12 @@ while True:
     elif current_state == STATE_GAME:
         screen.fill(BG_COLOR)
         if player.hp > 0:
-            all_sprites.update()
+            player.update(); zombies.update()
             bullets.update()
             # 아이템 습득 및 충돌
-            if pygame.sprite.spritecollide(player, zombies, False): player.check_injury()
-            pygame.sprite.groupcollide(bullets, zombies, True, True)
-            for item in pygame.sprite.spritecollide(player, items, True):
+            if zombies.spritecollide(player): player.check_injury()
+            zombies.groupcollide(bullets, True, True)
+            for item in items.spritecollide(player, True):
                 if item.type == 'AMMO_GLOCK': player.ammo_glock += 15
                 else: player.ammo_shotgun += 4
 
@@ -260,5 +286,9 @@ while True:
             over = font_main.render("YOU DIED", True, RED)
             screen.blit(over, (500 - over.get_width()//2, 350))
 
-    pygame.display.flip()
+    profiler.count("bullet_pool", BULLET_POOL.stats())
+    profiler.draw(screen)
+    with profiler.phase("flip"):
+        pygame.display.flip()
+    profiler.end_frame()
     clock.tick(FPS)
\ No newline at end of file
@@ -1,10 +1,17 @@
 
 import pygame
+import os
 import sys
 import math
 import random
 import time
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.spatial import SpatialGroup
+from common.pool import SpritePool
+from common.profiler import FrameProfiler
+from common.spriteframes import FrameCache, walk_phase, WALK_PHASES
+
 # --- 1. 초기 설정 ---
 pygame.init()
 SCREEN_WIDTH, SCREEN_HEIGHT = 1000, 800
@@ -17,6 +24,7 @@ clock = pygame.time.Clock()
 WHITE, BLACK, RED, GRAY, GREEN, BLUE = (255, 255, 255), (0, 0, 0), (200, 0, 0), (50, 50, 50), (0, 200, 0), (40, 80, 200)
 SKIN, ZOMBIE_SKIN = (235, 195, 165), (140, 160, 140)
 BG_COLOR = (30, 35, 30)
+MAX_ZOMBIES = 15
 
 try:
     font_main = pygame.font.SysFont("malgungothic", 45, bold=True)
@@ -38,6 +46,45 @@ JOBS = {
 
 # --- 2. 애니메이션 베이스 클래스 ---
 
+def draw_frame(surf, color, weapon_mode, is_zombie, phase):
+    """한 걷기 위상의 캐릭터 프레임 (FRAMES가 키마다 한 번만 호출)"""
+    cx, cy = 40, 40
+    base_skin = ZOMBIE_SKIN if is_zombie else SKIN
+    # 좀비는 더 느리고 흐느적거리는 사인파 적용
+    swing = math.sin(phase * 2 * math.pi / WALK_PHASES) * (10 if is_zombie else 12) if phase is not None else 0
+    
+    # 1. 다리 (하의)
+    leg_c = (max(0, color[0]-40), max(0, color[1]-40), max(0, color[2]-40))
+    pygame.draw.rect(surf, leg_c, (cx-9, cy+12 + swing, 7, 14)) # 왼다리
+    pygame.draw.rect(surf, leg_c, (cx+2, cy+12 - swing, 7, 14)) # 오른다리
+    
+    # 2. 팔 (좀비는 앞으로 나란히 하듯 흔들림)
+    arm_y = -15 if is_zombie else 0
+    pygame.draw.rect(surf, base_skin, (cx-18, cy-5 + arm_y - swing, 6, 16))
+    pygame.draw.rect(surf, base_skin, (cx+12, cy-5 + arm_y + swing, 6, 16))
+    
+    # 3. 몸통 (상의)
+    pygame.draw.rect(surf, color, (cx-12, cy-12, 24, 26))
+    
+    # 4. 머리
+    pygame.draw.rect(surf, (70, 45, 35) if not is_zombie else (40, 50, 40), (cx-8, cy-26, 16, 15))
+    pygame.draw.rect(surf, base_skin, (cx-7, cy-20, 14, 9))
+
+    # 5. 무기 (플레이어 전용)
+    if not is_zombie:
+        if weapon_mode == "BAT": pygame.draw.line(surf, (150,110,80), (cx+8, cy), (cx+22, cy-18), 5)
+        elif weapon_mode == "GLOCK": pygame.draw.rect(surf, (40,40,40), (cx+10, cy, 12, 6))
+        elif weapon_mode == "SHOTGUN": pygame.draw.rect(surf, (20,20,20), (cx+8, cy, 18, 8))
+
+# (색, 무기, 좀비 여부, 걷기 위상) -> 80x80 프레임
+FRAMES = FrameCache((80, 80), draw_frame)
+
+def warm_frames(player_color):
+    """init_game에서 플레이어 무기별 프레임과 직업 색 좀비 프레임을 미리 구움"""
+    phases = [None] + list(range(WALK_PHASES))
+    FRAMES.warm([(player_color, w, False, ph) for w in ["BAT", "GLOCK", "SHOTGUN"] for ph in phases])
+    FRAMES.warm([(job["color"], "NONE", True, ph) for job in JOBS.values() for ph in range(WALK_PHASES)])
+
 class AnimatedSprite(pygame.sprite.Sprite):
     def __init__(self, color, is_zombie=False):
         super().__init__()
@@ -48,41 +95,20 @@ class AnimatedSprite(pygame.sprite.Sprite):
         self.base_skin = ZOMBIE_SKIN if is_zombie else SKIN
 
     def draw_entity(self, is_moving, weapon_mode="NONE"):
-        self.image.fill((0,0,0,0))
-        cx, cy = 40, 40
-        # 좀비는 더 느리고 흐느적거리는 사인파 적용
         speed_factor = 0.15 if self.is_zombie else 0.22
-        swing = math.sin(self.walk_count * speed_factor) * (10 if self.is_zombie else 12) if is_moving else 0
-        
-        # 1. 다리 (하의)
-        leg_c = (max(0, self.color[0]-40), max(0, self.color[1]-40), max(0, self.color[2]-40))
-        pygame.draw.rect(self.image, leg_c, (cx-9, cy+12 + swing, 7, 14)) # 왼다리
-        pygame.draw.rect(self.image, leg_c, (cx+2, cy+12 - swing, 7, 14)) # 오른다리
-        
-        # 2. 팔 (좀비는 앞으로 나란히 하듯 흔들림)
-        arm_y = -15 if self.is_zombie else 0
-        pygame.draw.rect(self.image, self.base_skin, (cx-18, cy-5 + arm_y - swing, 6, 16))
-        pygame.draw.rect(self.image, self.base_skin, (cx+12, cy-5 + arm_y + swing, 6, 16))
-        
-        # 3. 몸통 (상의)
-        pygame.draw.rect(self.image, self.color, (cx-12, cy-12, 24, 26))
-        
-        # 4. 머리
-        pygame.draw.rect(self.image, (70, 45, 35) if not self.is_zombie else (40, 50, 40), (cx-8, cy-26, 16, 15))
-        pygame.draw.rect(self.image, self.base_skin, (cx-7, cy-20, 14, 9))
-
-        # 5. 무기 (플레이어 전용)
-        if not self.is_zombie:
-            if weapon_mode == "BAT": pygame.draw.line(self.image, (150,110,80), (cx+8, cy), (cx+22, cy-18), 5)
-            elif weapon_mode == "GLOCK": pygame.draw.rect(self.image, (40,40,40), (cx+10, cy, 12, 6))
-            elif weapon_mode == "SHOTGUN": pygame.draw.rect(self.image, (20,20,20), (cx+8, cy, 18, 8))
+        phase = walk_phase(self.walk_count, speed_factor, is_moving)
+        self.image = FRAMES.get(self.color, "NONE" if self.is_zombie else weapon_mode, self.is_zombie, phase)
 
 # --- 3. 게임 객체 클래스 ---
 
+BULLET_IMAGE = pygame.Surface((6, 6)); BULLET_IMAGE.fill((255, 255, 100))
+SCREEN_RECT = screen.get_rect()
+
 class Bullet(pygame.sprite.Sprite):
     def __init__(self, x, y, target_pos, spread=0):
         super().__init__()
-        self.image = pygame.Surface((6, 6)); self.image.fill((255, 255, 100))
+        self.image = BULLET_IMAGE; self.reset(x, y, target_pos, spread)
+    def reset(self, x, y, target_pos, spread=0):
         self.rect = self.image.get_rect(center=(x, y))
         self.pos = pygame.Vector2(x, y)
         dir_vec = pygame.Vector2(target_pos) - self.pos
@@ -90,7 +116,14 @@ class Bullet(pygame.sprite.Sprite):
         self.velocity = pygame.Vector2(15, 0).rotate(angle)
     def update(self):
         self.pos += self.velocity; self.rect.center = self.pos
-        if not screen.get_rect().contains(self.rect): self.kill()
+        if not SCREEN_RECT.contains(self.rect): self.kill()
+    def kill(self):
+        # 그룹에서 빠지면 풀로 돌려보냄 (groupcollide의 dokill도 여기로 옴)
+        if self.alive():
+            super().kill(); BULLET_POOL.release(self)
+
+BULLET_POOL = SpritePool(Bullet)
+bullets = pygame.sprite.Group()
 
 class Survivor(AnimatedSprite):
     def __init__(self, job):
@@ -148,26 +181,32 @@ class Item(pygame.sprite.Sprite):
 
 def init_game(job):
     global player, all_sprites, zombies, bullets, items
+    for b in bullets.sprites(): b.kill()    # 날아가던 총알도 kill해야 풀 in_use가 맞는다
     player = Survivor(job)
-    all_sprites, zombies = pygame.sprite.Group(player), pygame.sprite.Group()
-    bullets, items = pygame.sprite.Group(), pygame.sprite.Group()
+    warm_frames(player.color)
+    all_sprites, zombies = pygame.sprite.Group(player), SpatialGroup()
+    bullets, items = pygame.sprite.Group(), SpatialGroup()
 
 SPAWN_Z = pygame.USEREVENT + 1
 pygame.time.set_timer(SPAWN_Z, 2500)
 
+profiler = FrameProfiler()
+
 while True:
+    profiler.begin_frame()
     screen.fill(BLACK)
     m_p = pygame.mouse.get_pos()
     
     for e in pygame.event.get():
-        if e.type == pygame.QUIT: pygame.quit(); sys.exit()
+        if e.type == pygame.QUIT: profiler.close(); pygame.quit(); sys.exit()
+        profiler.handle_event(e)
         if current_state == STATE_TITLE and e.type == pygame.MOUSEBUTTONDOWN: current_state = STATE_SELECT
         elif current_state == STATE_SELECT and e.type == pygame.MOUSEBUTTONDOWN:
             for i, name in enumerate(JOBS.keys()):
                 if pygame.Rect(100+i*300, 300, 200, 300).collidepoint(m_p):
                     init_game(name); current_state = STATE_GAME
         elif current_state == STATE_GAME:
-            if e.type == SPAWN_Z and len(zombies) < 15:
+            if e.type == SPAWN_Z and len(zombies) < MAX_ZOMBIES:
                 z = Zombie(player); zombies.add(z); all_sprites.add(z)
             if e.type == pygame.KEYDOWN:
                 if e.key == pygame.K_1: player.weapon_mode = "BAT"
@@ -176,15 +215,14 @@ while True:
             if e.type == pygame.MOUSEBUTTONDOWN and e.button == 1 and player.hp > 0:
                 now = pygame.time.get_ticks()
                 if player.weapon_mode == "GLOCK" and player.ammo_glock > 0 and now - player.last_act > 400:
-                    bullets.add(Bullet(player.rect.centerx, player.rect.centery, m_p)); player.ammo_glock -= 1; player.last_act = now
+                    bullets.add(BULLET_POOL.acquire(player.rect.centerx, player.rect.centery, m_p)); player.ammo_glock -= 1; player.last_act = now
                 elif player.weapon_mode == "SHOTGUN" and player.ammo_shotgun > 0 and now - player.last_act > 800:
-                    for a in [-15, -7, 0, 7, 15]: bullets.add(Bullet(player.rect.centerx, player.rect.centery, m_p, a))
+                    for a in [-15, -7, 0, 7, 15]: bullets.add(BULLET_POOL.acquire(player.rect.centerx, player.rect.centery, m_p, a))
                     player.ammo_shotgun -= 1; player.last_act = now
                 elif player.weapon_mode == "BAT" and now - player.last_act > 600:
-                    for z in zombies:
-                        if player.rect.inflate(50,50).colliderect(z.rect):
-                            z.kill()
-                            if random.random() < 0.2: items.add(Item(z.rect.centerx, z.rect.centery, random.choice(['GLOCK','SHOTGUN'])))
+                    for z in zombies.collide_rect(player.rect.inflate(50,50)):
+                        z.kill()
+                        if random.random() < 0.2: items.add(Item(z.rect.centerx, z.rect.centery, random.choice(['GLOCK','SHOTGUN'])))
                     player.last_act = now
 
     if current_state == STATE_TITLE:
@@ -198,14 +236,18 @@ while True:
     elif current_state == STATE_GAME:
         screen.fill(BG_COLOR)
         if player.hp > 0:
-            all_sprites.update(); bullets.update()
-            pygame.sprite.groupcollide(bullets, zombies, True, True)
-            for it in pygame.sprite.spritecollide(player, items, True):
+            player.update(); zombies.update(); bullets.update()
+            zombies.groupcollide(bullets, True, True)
+            for it in items.spritecollide(player, True):
                 if it.type == 'GLOCK': player.ammo_glock += 15
                 else: player.ammo_shotgun += 4
-            if pygame.sprite.spritecollide(player, zombies, False): player.hp -= 0.1
+            if zombies.spritecollide(player): player.hp -= 0.1
         items.draw(screen); bullets.draw(screen); all_sprites.draw(screen)
         screen.blit(font_ui.render(f"HP: {int(player.hp)} | [1]BAT [2]Pistol:{player.ammo_glock} [3]Shotgun:{player.ammo_shotgun}", True, WHITE), (20, 20))
 
-    pygame.display.flip()
+    profiler.count("bullet_pool", BULLET_POOL.stats())
+    profiler.draw(screen)
+    with profiler.phase("flip"):
+        pygame.display.flip()
+    profiler.end_frame()
     clock.tick(FPS)
\ No newline at end of file
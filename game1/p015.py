@@ -1,9 +1,16 @@
 import pygame
+import os
 import sys
 import math
 import random
 import time
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.spatial import SpatialGroup
+from common.pool import SpritePool
+from common.profiler import FrameProfiler
+from common.spriteframes import FrameCache, walk_phase, phase_walk_count, WALK_PHASES
+
 # --- 1. 엔진 및 환경 설정 ---
 pygame.init()
 SCREEN_WIDTH, SCREEN_HEIGHT = 1000, 800
@@ -16,6 +23,7 @@ clock = pygame.time.Clock()
 WHITE, BLACK, RED, GRAY, GREEN, BLUE, YELLOW = (255,255,255), (0,0,0), (200,20,20), (50,50,50), (40,180,40), (40,80,200), (255,255,100)
 SKIN, ZOMBIE_SKIN = (235,195,165), (140,160,140)
 BG_COLOR = (28, 30, 28)
+MAX_ZOMBIES = 15
 
 # 폰트 로드 (크기별 최적화)
 try:
@@ -49,11 +57,18 @@ prologue_idx = 0
 
 # --- 2. 핵심 클래스 ---
 
+BULLET_IMAGE = pygame.Surface((8, 8), pygame.SRCALPHA)
+pygame.draw.circle(BULLET_IMAGE, YELLOW, (4, 4), 4)
+SCREEN_RECT = screen.get_rect()
+
 class Bullet(pygame.sprite.Sprite):
+    """탄환 (BULLET_POOL에서 재사용, 이미지는 공유)"""
     def __init__(self, x, y, target_pos, spread=0):
         super().__init__()
-        self.image = pygame.Surface((8, 8), pygame.SRCALPHA)
-        pygame.draw.circle(self.image, YELLOW, (4, 4), 4)
+        self.image = BULLET_IMAGE
+        self.reset(x, y, target_pos, spread)
+
+    def reset(self, x, y, target_pos, spread=0):
         self.rect = self.image.get_rect(center=(x, y))
         self.pos = pygame.Vector2(x, y)
         dir_vec = pygame.Vector2(target_pos) - self.pos
@@ -63,7 +78,16 @@ class Bullet(pygame.sprite.Sprite):
     def update(self):
         self.pos += self.velocity
         self.rect.center = self.pos
-        if not screen.get_rect().contains(self.rect): self.kill()
+        if not SCREEN_RECT.contains(self.rect): self.kill()
+
+    def kill(self):
+        # 그룹에서 빠지면 풀로 돌려보냄 (groupcollide의 dokill도 여기로 옴)
+        if self.alive():
+            super().kill()
+            BULLET_POOL.release(self)
+
+BULLET_POOL = SpritePool(Bullet)
+bullets = pygame.sprite.Group()
 
 def draw_entity_model(surface, x, y, color, is_moving, walk_cnt, weapon="NONE", is_zombie=False):
     """모든 캐릭터 렌더링 통합 (팔다리 애니메이션 + 무기 가시화)"""
@@ -97,6 +121,18 @@ def draw_entity_model(surface, x, y, color, is_moving, walk_cnt, weapon="NONE",
         # 좀비 팔 (앞으로 나란히)
         pygame.draw.rect(surface, skin_c, (cx+12, cy-15 + swing, 6, 16))
 
+# 캐릭터 프레임 캐시: (색, 무기, 좀비 여부, 걷기 위상) -> 100x100 프레임
+WALK_SPEED = 0.22
+FRAMES = FrameCache((100, 100), lambda surf, color, weapon, is_zombie, phase:
+                    draw_entity_model(surf, 50, 50, color, phase is not None,
+                                      phase_walk_count(phase, WALK_SPEED), weapon, is_zombie))
+
+def warm_frames(color):
+    """init_game에서 플레이어 무기별 프레임과 좀비 색별 프레임을 미리 구움"""
+    phases = [None] + list(range(WALK_PHASES))
+    FRAMES.warm([(color, w, False, ph) for w in ["BAT", "GLOCK", "SHOTGUN"] for ph in phases])
+    FRAMES.warm([(c, "NONE", True, ph) for c in [BLUE, RED, GREEN] for ph in range(WALK_PHASES)])
+
 class Survivor(pygame.sprite.Sprite):
     def __init__(self, job_name):
         super().__init__()
@@ -129,8 +165,7 @@ class Survivor(pygame.sprite.Sprite):
         
         self.rect.center = self.pos
         if self.is_infected: self.hp -= 0.015
-        self.image.fill((0,0,0,0))
-        draw_entity_model(self.image, 50, 50, self.color, self.is_moving, self.walk_count, self.weapon_mode)
+        self.image = FRAMES.get(self.color, self.weapon_mode, False, walk_phase(self.walk_count, WALK_SPEED, self.is_moving))
 
 class Zombie(pygame.sprite.Sprite):
     def __init__(self, target):
@@ -146,8 +181,7 @@ class Zombie(pygame.sprite.Sprite):
         if dir_v.length() > 0: self.pos += dir_v.normalize() * 0.95
         self.walk_count += 1
         self.rect.center = self.pos
-        self.image.fill((0,0,0,0))
-        draw_entity_model(self.image, 50, 50, self.color, True, self.walk_count, is_zombie=True)
+        self.image = FRAMES.get(self.color, "NONE", True, walk_phase(self.walk_count, WALK_SPEED))
 
 # --- 3. 통합 시스템 엔진 ---
 
@@ -159,18 +193,24 @@ def draw_text(text, font, color, x, y, align="center"):
 
 def init_game(job):
     global player, all_sprites, zombies, bullets, start_time
+    for b in bullets.sprites(): b.kill()    # 날아가던 총알도 kill해야 풀 in_use가 맞는다
     player = Survivor(job)
     all_sprites = pygame.sprite.Group(player)
-    zombies, bullets = pygame.sprite.Group(), pygame.sprite.Group()
+    warm_frames(player.color)
+    zombies, bullets = SpatialGroup(), pygame.sprite.Group()
     start_time = time.time()
 
 # 메인 루프
+profiler = FrameProfiler()
+
 while True:
+    profiler.begin_frame()
     screen.fill(BLACK)
     m_p = pygame.mouse.get_pos()
     m_clicked = False
     for e in pygame.event.get():
-        if e.type == pygame.QUIT: pygame.quit(); sys.exit()
+        if e.type == pygame.QUIT: profiler.close(); pygame.quit(); sys.exit()
+        profiler.handle_event(e)
         if e.type == pygame.MOUSEBUTTONDOWN: m_clicked = True
 
     if current_state == STATE_MENU:
@@ -212,22 +252,22 @@ while True:
         # 전투 발사 로직 (복구)
         if m_clicked and player.hp > 0:
             if player.weapon_mode == "GLOCK" and player.ammo_glock > 0 and now - player.last_shot > 300:
-                bullets.add(Bullet(player.rect.centerx, player.rect.centery, m_p))
+                bullets.add(BULLET_POOL.acquire(player.rect.centerx, player.rect.centery, m_p))
                 player.ammo_glock -= 1; player.last_shot = now
             elif player.weapon_mode == "SHOTGUN" and player.ammo_shotgun > 0 and now - player.last_shot > 800:
-                for a in [-12, 0, 12]: bullets.add(Bullet(player.rect.centerx, player.rect.centery, m_p, a))
+                for a in [-12, 0, 12]: bullets.add(BULLET_POOL.acquire(player.rect.centerx, player.rect.centery, m_p, a))
                 player.ammo_shotgun -= 1; player.last_shot = now
             elif player.weapon_mode == "BAT" and now - player.last_shot > 600:
-                hits = pygame.sprite.spritecollide(player, zombies, True)
+                hits = zombies.spritecollide(player, True)
                 if hits and random.random() < 0.4: player.ammo_glock += 5 # 루팅 복구
                 player.last_shot = now
 
-        if len(zombies) < 15 and random.random() < 0.03:
+        if len(zombies) < MAX_ZOMBIES and random.random() < 0.03:
             z = Zombie(player); zombies.add(z); all_sprites.add(z)
 
-        all_sprites.update(); bullets.update()
-        pygame.sprite.groupcollide(bullets, zombies, True, True)
-        if pygame.sprite.spritecollide(player, zombies, False):
+        player.update(); zombies.update(); bullets.update()
+        zombies.groupcollide(bullets, True, True)
+        if zombies.spritecollide(player):
             player.hp -= 0.4
             if random.random() < 0.008: player.is_infected = True # 감염 복구
         
@@ -243,5 +283,9 @@ while True:
         if pygame.key.get_pressed()[pygame.K_r]:
             prologue_idx = 0; current_state = STATE_MENU
 
-    pygame.display.flip()
+    profiler.count("bullet_pool", BULLET_POOL.stats())
+    profiler.draw(screen)
+    with profiler.phase("flip"):
+        pygame.display.flip()
+    profiler.end_frame()
     clock.tick(FPS)
\ No newline at end of file
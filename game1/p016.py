@@ -1,8 +1,17 @@
 import pygame
+import os
 import sys
 import math
 import random
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.spatial import SpatialGroup
+from common.pool import SpritePool
+from common.profiler import FrameProfiler
+from common.decals import DecalLayer
+from common.spriteframes import FrameCache, walk_phase, phase_walk_count, WALK_PHASES
+from common.horde import SpriteHorde, HAS_NUMPY
+
 # --- 1. 초기화 및 설정 ---
 pygame.init()
 SCREEN_WIDTH, SCREEN_HEIGHT = 1000, 800
@@ -14,6 +23,9 @@ clock = pygame.time.Clock()
 WHITE, BLACK, RED, GRAY, GREEN, BLUE, YELLOW = (255,255,255), (0,0,0), (220,20,20), (50,50,50), (40,180,40), (40,80,200), (255,255,100)
 SKIN, ZOMBIE_SKIN = (235,195,165), (140,160,140)
 BG_COLOR = (24, 26, 24)
+HORDE_BACKEND = HAS_NUMPY     # numpy가 있으면 좀비 추적 이동을 배열로 한 번에 (없으면 Zombie.update 루프)
+MAX_ZOMBIES = 400 if HORDE_BACKEND else 15
+ZOMBIE_SPEED = 0.95
 
 # 폰트 로드
 try:
@@ -58,6 +70,17 @@ def draw_entity(surf, x, y, color, move, walk_cnt, weapon="NONE", zombie=False):
     else:
         pygame.draw.rect(surf, skin, (cx+13, cy-15+swing, 7, 18)) # 좀비의 뻗은 팔
 
+# 캐릭터 프레임 캐시: (색, 무기, 좀비 여부, 걷기 위상) -> 100x100 프레임
+WALK_SPEED = 0.22
+ZOMBIE_COLOR = (70,90,70)
+FRAMES = FrameCache((100, 100), lambda surf, color, weapon, zombie, phase:
+                    draw_entity(surf, 50, 50, color, phase is not None, phase_walk_count(phase, WALK_SPEED), weapon, zombie))
+
+def warm_frames(color):
+    phases = [None] + list(range(WALK_PHASES))
+    FRAMES.warm([(color, w, False, ph) for w in ["BAT", "GLOCK", "SHOTGUN"] for ph in phases])
+    FRAMES.warm([(ZOMBIE_COLOR, "NONE", True, ph) for ph in range(WALK_PHASES)])
+
 class Blood(pygame.sprite.Sprite):
     def __init__(self, x, y):
         super().__init__()
@@ -66,16 +89,27 @@ class Blood(pygame.sprite.Sprite):
         pygame.draw.circle(self.image, (150,0,0,160), (s//2, s//2), s//2)
         self.rect = self.image.get_rect(center=(x,y))
 
+BULLET_IMAGE = pygame.Surface((8,8), pygame.SRCALPHA); pygame.draw.circle(BULLET_IMAGE, YELLOW, (4,4), 4)
+SCREEN_RECT = screen.get_rect()
+
 class Bullet(pygame.sprite.Sprite):
     def __init__(self, x, y, target, spread=0):
         super().__init__()
-        self.image = pygame.Surface((8,8), pygame.SRCALPHA); pygame.draw.circle(self.image, YELLOW, (4,4), 4)
+        self.image = BULLET_IMAGE; self.reset(x, y, target, spread)
+    def reset(self, x, y, target, spread=0):
         self.rect = self.image.get_rect(center=(x,y)); self.pos = pygame.Vector2(x,y)
         angle = math.degrees(math.atan2(target[1]-y, target[0]-x)) + spread
         self.vel = pygame.Vector2(22, 0).rotate(angle)
     def update(self):
         self.pos += self.vel; self.rect.center = self.pos
-        if not screen.get_rect().contains(self.rect): self.kill()
+        if not SCREEN_RECT.contains(self.rect): self.kill()
+    def kill(self):
+        # 그룹에서 빠지면 풀로 돌려보냄 (groupcollide의 dokill도 여기로 옴)
+        if self.alive():
+            super().kill(); BULLET_POOL.release(self)
+
+BULLET_POOL = SpritePool(Bullet)
+bullets = pygame.sprite.Group()
 
 class Survivor(pygame.sprite.Sprite):
     def __init__(self, job):
@@ -96,7 +130,7 @@ class Survivor(pygame.sprite.Sprite):
         if move.length() > 0:
             self.rect.center += move.normalize() * self.speed; self.walk_cnt += 1; self.moving = True
         if self.infected: self.hp -= 0.02
-        self.image.fill((0,0,0,0)); draw_entity(self.image, 50, 50, self.color, self.moving, self.walk_cnt, self.weapon)
+        self.image = FRAMES.get(self.color, self.weapon, False, walk_phase(self.walk_cnt, WALK_SPEED, self.moving))
 
 class Zombie(pygame.sprite.Sprite):
     def __init__(self, target):
@@ -106,8 +140,14 @@ class Zombie(pygame.sprite.Sprite):
         self.walk_cnt = random.random()*10
     def update(self):
         v = (pygame.Vector2(self.target.rect.center) - pygame.Vector2(self.rect.center))
-        if v.length() > 0: self.rect.center += v.normalize() * 0.95
-        self.walk_cnt += 1; self.image.fill((0,0,0,0)); draw_entity(self.image, 50, 50, (70,90,70), True, self.walk_cnt, zombie=True)
+        if v.length() > 0: self.rect.center += v.normalize() * ZOMBIE_SPEED
+        self.walk_cnt += 1; self.pick_frame()
+    def pick_frame(self):
+        self.image = FRAMES.get(ZOMBIE_COLOR, "NONE", True, walk_phase(self.walk_cnt, WALK_SPEED))
+    def kill(self):
+        # 무리 배열에서도 빼서 칸을 비움 (방망이/groupcollide의 dokill도 여기로 옴)
+        if horde is not None: horde.remove(self)
+        super().kill()
 
 # --- 3. 게임 엔진 통합 ---
 
@@ -116,15 +156,26 @@ def draw_t(txt, f, c, x, y, center=True):
     r = s.get_rect(center=(x,y)) if center else s.get_rect(topleft=(x,y))
     screen.blit(s, r)
 
+def splat(x, y):
+    b = Blood(x, y); bloods.stamp(b.image, b.rect)
+
 def init_game(job):
-    global p, all_s, zombies, bullets, bloods
-    p = Survivor(job); all_s = pygame.sprite.Group(p)
-    zombies, bullets, bloods = [pygame.sprite.Group() for _ in range(3)]
+    global p, all_s, zombies, bullets, bloods, horde
+    for b in bullets.sprites(): b.kill()    # 날아가던 총알도 kill해야 풀 in_use가 맞는다
+    p = Survivor(job); all_s = pygame.sprite.Group(p); warm_frames(p.color)
+    zombies, bullets = SpatialGroup(), pygame.sprite.Group()
+    horde = SpriteHorde() if HORDE_BACKEND else None
+    bloods = DecalLayer((SCREEN_WIDTH, SCREEN_HEIGHT), BG_COLOR)
+
+profiler = FrameProfiler()
+horde = None
 
 while True:
+    profiler.begin_frame()
     screen.fill(BLACK); m_pos, m_down = pygame.mouse.get_pos(), False
     for ev in pygame.event.get():
-        if ev.type == pygame.QUIT: pygame.quit(); sys.exit()
+        if ev.type == pygame.QUIT: profiler.close(); pygame.quit(); sys.exit()
+        profiler.handle_event(ev)
         if ev.type == pygame.MOUSEBUTTONDOWN: m_down = True
         if curr_state == STATE_PROLOGUE and ev.type == pygame.KEYDOWN and ev.key == pygame.K_SPACE:
             prologue_idx += 1
@@ -149,27 +200,34 @@ while True:
         draw_t(PROLOGUE_LINES[prologue_idx], f_md, WHITE, 500, 400); draw_t("[ SPACE TO CONTINUE ]", f_sm, GRAY, 500, 700)
 
     elif curr_state == STATE_GAME:
-        screen.fill(BG_COLOR); bloods.draw(screen); now = pygame.time.get_ticks()
+        bloods.draw(screen); now = pygame.time.get_ticks()
         if m_down and p.hp > 0:
             if p.weapon == "GLOCK" and p.ammo_g > 0 and now - p.last_shot > 300:
-                bullets.add(Bullet(p.rect.centerx, p.rect.centery, m_pos)); p.ammo_g -= 1; p.last_shot = now
+                bullets.add(BULLET_POOL.acquire(p.rect.centerx, p.rect.centery, m_pos)); p.ammo_g -= 1; p.last_shot = now
             elif p.weapon == "SHOTGUN" and p.ammo_s > 0 and now - p.last_shot > 850:
-                for a in [-12, 0, 12]: bullets.add(Bullet(p.rect.centerx, p.rect.centery, m_pos, a))
+                for a in [-12, 0, 12]: bullets.add(BULLET_POOL.acquire(p.rect.centerx, p.rect.centery, m_pos, a))
                 p.ammo_s -= 1; p.last_shot = now
             elif p.weapon == "BAT" and now - p.last_shot > 600:
-                for z in zombies:
-                    if pygame.Vector2(p.rect.center).distance_to(z.rect.center) < 60:
-                        bloods.add(Blood(z.rect.centerx, z.rect.centery)); z.kill(); p.ammo_g += 5; p.last_shot = now
+                for z in zombies.within(p.rect.center, 60):
+                    splat(z.rect.centerx, z.rect.centery); z.kill(); p.ammo_g += 5; p.last_shot = now
         
-        if len(zombies) < 15 and random.random() < 0.035:
+        if len(zombies) < MAX_ZOMBIES and random.random() < 0.035:
             z = Zombie(p); zombies.add(z); all_s.add(z)
-        all_s.update(); bullets.update()
-        for b in bullets:
-            hits = pygame.sprite.groupcollide(bullets, zombies, True, True)
-            for z_list in hits.values():
-                for hz in z_list: bloods.add(Blood(hz.rect.centerx, hz.rect.centery))
-
-        if pygame.sprite.spritecollide(p, zombies, False):
+            if horde is not None: horde.add(z, ZOMBIE_SPEED)
+        p.update()
+        if horde is not None:
+            # 이동은 배열로 한 번에, 스프라이트에는 그릴 위치/프레임만 돌려 쓰고 격자 칸 갱신
+            horde.step(p.rect.center)
+            for z in horde.sync():
+                z.pick_frame(); zombies.move(z)
+        else:
+            zombies.update()
+        bullets.update()
+        hits = zombies.groupcollide(bullets, True, True)
+        for z_list in hits.values():
+            for hz in z_list: splat(hz.rect.centerx, hz.rect.centery)
+
+        if zombies.spritecollide(p):
             p.hp -= 0.5
             if random.random() < 0.01: p.infected = True
         
@@ -182,4 +240,9 @@ while True:
         draw_t("THIS IS HOW YOU DIED", f_lg, RED, 500, 400); draw_t("Press R to Restart", f_md, WHITE, 500, 500)
         if pygame.key.get_pressed()[pygame.K_r]: curr_state = STATE_MENU; prologue_idx = 0
 
-    pygame.display.flip(); clock.tick(60)
\ No newline at end of file
+    profiler.count("bullet_pool", BULLET_POOL.stats())
+    profiler.draw(screen)
+    with profiler.phase("flip"):
+        pygame.display.flip()
+    profiler.end_frame()
+    clock.tick(60)
\ No newline at end of file
@@ -1,5 +1,12 @@
 import pygame
 import math
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.profiler import FrameProfiler
+from common.quality import QualityGovernor, ImpostorCache
+from common.iso import to_iso, DiamondBuffer
 
 # --- 초기 설정 ---
 pygame.init()
@@ -50,9 +57,6 @@ COLOR_OUTSIDE = (255, 255, 255)
 COLOR_BACKPACK = (85, 107, 47)
 COLOR_LIMB = (255, 203, 164)
 
-def iso_projection(x, y):
-    return (x - y), (x + y) / 2
-
 class Character:
     def __init__(self, x, y, role="father"):
         self.world_pos = pygame.Vector2(x, y)
@@ -123,7 +127,7 @@ class Character:
         self.world_pos.y = max(0, min(self.world_pos.y, MAP_LIMIT))
 
     def draw(self, surface, cam_off):
-        iso_p = (self.world_pos.x - self.world_pos.y, (self.world_pos.x + self.world_pos.y) / 2)
+        iso_p = to_iso(self.world_pos.x, self.world_pos.y)
         cx, cy = iso_p[0] + cam_off[0], iso_p[1] + cam_off[1]
         
         swing = math.sin(self.walk_count) * (self.limb_len / 2.5)
@@ -231,22 +235,62 @@ class Character:
             pygame.draw.circle(surface, (50, 50, 50), (int(eye_x - eye_spacing), int(eye_y)), 2)
             pygame.draw.circle(surface, (50, 50, 50), (int(eye_x + eye_spacing), int(eye_y)), 2)
 
-def draw_map(surface, current_map, cam_off, cur_w, cur_h):
-    """맵 렌더링 - 색상별로 구분"""
+# 바닥 타일을 맵(MAP_COLORS 항목)·테두리 여부·격자선 여부마다 한 번 그려 두고 blit만 함
+PREBAKED_TILES = True
+TILE_SPRITES = {}
+TILE_DIAMOND = DiamondBuffer(TILE_SIZE)     # PREBAKED_TILES=False일 때 타일 꼭짓점 버퍼
+
+
+def get_tile_sprite(current_map, is_border, outlines):
+    key = (current_map, is_border, outlines)
+    sprite = TILE_SPRITES.get(key)
+    if sprite is None:
+        colors = MAP_COLORS[current_map]
+        sprite = pygame.Surface((TILE_SIZE * 2 + 1, TILE_SIZE + 1), pygame.SRCALPHA)
+        pts = [(TILE_SIZE, 0), (TILE_SIZE * 2, TILE_SIZE / 2), (TILE_SIZE, TILE_SIZE), (0, TILE_SIZE / 2)]
+        pygame.draw.polygon(sprite, colors["floor"], pts)
+        if outlines or is_border:
+            pygame.draw.polygon(sprite, colors["border"] if is_border else colors["grid"], pts, 2)
+        TILE_SPRITES[key] = sprite
+    return sprite
+
+
+def visible_tile_range(cam_off, cur_w, cur_h, margin):
+    """타일 윗꼭짓점이 화면 ±margin 안에 들어오는 타일만 고르기 위한 iso 역변환 범위.
+    타일 (i, j)의 윗꼭짓점은 iso (T*(i-j), T*(i+j)/2) → u = i-j, v = i+j 범위로 바꿔 돌려줌 (양끝 제외)"""
+    u_lo = (-margin - cam_off[0]) / TILE_SIZE
+    u_hi = (cur_w + margin - cam_off[0]) / TILE_SIZE
+    v_lo = 2 * (-margin - cam_off[1]) / TILE_SIZE
+    v_hi = 2 * (cur_h + margin - cam_off[1]) / TILE_SIZE
+    return u_lo, u_hi, v_lo, v_hi
+
+
+def draw_map(surface, current_map, cam_off, cur_w, cur_h, outlines=True, cull_margin=150):
+    """맵 렌더링 - 색상별로 구분. outlines/cull_margin은 품질 조절용 (격자선 여부, 화면 밖 여유 px)
+    화면에 걸리는 타일만 돌기 때문에 비용은 맵 크기가 아니라 화면 크기에 비례"""
     colors = MAP_COLORS[current_map]
-    
-    for x in range(0, MAP_LIMIT, TILE_SIZE):
-        for y in range(0, MAP_LIMIT, TILE_SIZE):
-            p = (x - y, (x + y) / 2)
-            if -150 < p[0] + cam_off[0] < cur_w + 150 and -150 < p[1] + cam_off[1] < cur_h + 150:
-                pts = [(p[0]+cam_off[0], p[1]+cam_off[1]) for p in [
-                    (x-y, (x+y)/2), 
-                    (x+TILE_SIZE-y, (x+TILE_SIZE+y)/2), 
-                    (x+TILE_SIZE-(y+TILE_SIZE), (x+TILE_SIZE+y+TILE_SIZE)/2), 
-                    (x-(y+TILE_SIZE), (x+y+TILE_SIZE)/2)
-                ]]
-                pygame.draw.polygon(surface, colors["floor"], pts)
-                is_border = (x == 0 or y == 0 or x + TILE_SIZE >= MAP_LIMIT or y + TILE_SIZE >= MAP_LIMIT)
+    n = MAP_TILES
+    u_lo, u_hi, v_lo, v_hi = visible_tile_range(cam_off, cur_w, cur_h, cull_margin)
+    ox, oy = cam_off
+
+    # x(i) 바깥, y(j) 안쪽 순서는 예전과 같게
+    i_min = max(0, math.floor((u_lo + v_lo) / 2))
+    i_max = min(n - 1, math.ceil((u_hi + v_hi) / 2))
+    for i in range(i_min, i_max + 1):
+        j_min = max(0, math.floor(i - u_hi) + 1, math.floor(v_lo - i) + 1)
+        j_max = min(n - 1, math.ceil(i - u_lo) - 1, math.ceil(v_hi - i) - 1)
+        x = i * TILE_SIZE
+        for j in range(j_min, j_max + 1):
+            y = j * TILE_SIZE
+            is_border = (x == 0 or y == 0 or x + TILE_SIZE >= MAP_LIMIT or y + TILE_SIZE >= MAP_LIMIT)
+            ix, iy = to_iso(x, y)
+            px, py = ix + ox, iy + oy
+            if PREBAKED_TILES:
+                surface.blit(get_tile_sprite(current_map, is_border, outlines), (int(px) - TILE_SIZE, int(py)))
+                continue
+            pts = TILE_DIAMOND.at(px, py)
+            pygame.draw.polygon(surface, colors["floor"], pts)
+            if outlines or is_border:
                 pygame.draw.polygon(surface, colors["border"] if is_border else colors["grid"], pts, 2)
 
 def main():
@@ -267,12 +311,20 @@ def main():
     
     # 폰트 (맵 이름 표시용)
     font = pygame.font.Font(None, 36)
+    profiler = FrameProfiler()
+    quality = QualityGovernor(FPS)
+    impostors = ImpostorCache()
     
     while True:
+        profiler.begin_frame()
+        quality.begin_frame()
         for event in pygame.event.get():
             if event.type == pygame.QUIT: 
+                profiler.close()
                 pygame.quit()
                 return
+            if profiler.handle_event(event):
+                continue
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_f:
                     is_fullscreen = not is_fullscreen
@@ -307,16 +359,19 @@ def main():
         daughter.update(mother.world_pos)
         
         screen.fill(COLOR_OUTSIDE)
-        cam_iso = (father.world_pos.x - father.world_pos.y, (father.world_pos.x + father.world_pos.y) / 2)
+        cam_iso = to_iso(father.world_pos.x, father.world_pos.y)
         off_x, off_y = cur_w // 2 - cam_iso[0], cur_h // 2 - cam_iso[1]
         
         # 맵 렌더링
-        draw_map(screen, current_map, (off_x, off_y), cur_w, cur_h)
+        draw_map(screen, current_map, (off_x, off_y), cur_w, cur_h,
+                 outlines=quality.get("outlines"), cull_margin=int(150 * quality.get("cull_scale")))
         
-        # 캐릭터 그리기
-        daughter.draw(screen, (off_x, off_y))
-        mother.draw(screen, (off_x, off_y))
-        father.draw(screen, (off_x, off_y))
+        # 캐릭터 그리기 (느릴 때는 캐시한 임포스터로)
+        for char in (daughter, mother, father):
+            if quality.get("impostors"):
+                impostors.draw(screen, char, (off_x, off_y))
+            else:
+                char.draw(screen, (off_x, off_y))
         
         # 맵 이름 표시
         map_name = MAP_COLORS[current_map]["name"]
@@ -327,7 +382,11 @@ def main():
         screen.blit(text_bg, (10, 10))
         screen.blit(text, (20, 15))
         
+        profiler.count("quality", quality.level)
+        profiler.draw(screen, pos=(10, 60))
         pygame.display.flip()
+        profiler.end_frame()
+        quality.end_frame()
         clock.tick(FPS)
 
 if __name__ == "__main__":
@@ -1,5 +1,10 @@
 import pygame
 import math
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.iso import to_iso, DiamondBuffer
 
 # --- 초기 설정 ---
 pygame.init()
@@ -25,8 +30,8 @@ COLOR_DOOR_GLOW = (255, 200, 100)
 COLOR_BACKPACK = (85, 107, 47)
 COLOR_LIMB = (255, 203, 164)
 
-def to_iso(x, y):
-    return (x - y), (x + y) / 2
+# 바닥 타일마다 꼭짓점 리스트를 새로 만들지 않고 재사용
+FLOOR_DIAMOND = DiamondBuffer(TILE_SIZE)
 
 # --- 독립 맵 클래스 ---
 class IndependentRoom:
@@ -250,18 +255,12 @@ def render_room(screen, room, characters, cam_off):
     screen.fill(COLOR_BG)
     
     # 1. 바닥
+    ox, oy = cam_off
     for tx in range(room.tw):
+        wx = (room.origin_x + tx) * TILE_SIZE
         for ty in range(room.th):
-            wx = (room.origin_x + tx) * TILE_SIZE
             wy = (room.origin_y + ty) * TILE_SIZE
-            ix, iy = to_iso(wx, wy)
-            
-            pts = [
-                (ix + cam_off[0], iy + cam_off[1]),
-                (ix + TILE_SIZE + cam_off[0], iy + TILE_SIZE/2 + cam_off[1]),
-                (ix + cam_off[0], iy + TILE_SIZE + cam_off[1]),
-                (ix - TILE_SIZE + cam_off[0], iy + TILE_SIZE/2 + cam_off[1])
-            ]
+            pts = FLOOR_DIAMOND.at(wx - wy + ox, (wx + wy) / 2 + oy)
             pygame.draw.polygon(screen, room.floor_color, pts)
             pygame.draw.polygon(screen, COLOR_GRID, pts, 1)
     
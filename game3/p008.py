@@ -7,7 +7,21 @@
 - 폰트 폴백 (Linux 대비)
 """
 import pygame
+import argparse
+import bisect
+import heapq
 import math
+import os
+import sys
+import weakref
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.profiler import FrameProfiler
+from common.fonts import init_fonts, get_font
+from common.flowfield import FlowField
+from common.regions import RegionWorld
+from common.quality import QualityGovernor, ImpostorCache, QUALITY_LEVELS
+from common.iso import to_iso, DiamondBuffer
 
 # --- 초기 설정 ---
 pygame.init()
@@ -32,27 +46,87 @@ COLOR_LIMB = (255, 203, 164)
 WALL_H = 90
 WALL_D = 15
 
-def to_iso(x, y):
-    return (x - y), (x + y) / 2
-
 
 # ========== 통합 맵 (Single Map) ==========
-# grid[ty][tx] = {"room_id": str, "room_name": str, "color": tuple} or None(벽/빈칸)
+# 타일당 1바이트: cells[rows[ty] + tx] = 방 번호 (0이면 벽/빈칸 → 못 지나감)
+# 방 번호 → rooms[i] = {"room_id": str, "room_name": str, "color": tuple} 팔레트
 # 타일 좌표 (tx, ty) → 월드 픽셀 (tx*TILE_SIZE, ty*TILE_SIZE)
 
+class TileMap:
+    def __init__(self, map_tw, map_th):
+        self.map_tw = map_tw
+        self.map_th = map_th
+        self.cells = bytearray(map_tw * map_th)
+        self.rows = [ty * map_tw for ty in range(map_th)]   # 행 시작 오프셋
+        self.rooms = [None]                                   # 0번은 벽/빈칸
+        self.room_index = {}
+
+    def add_room(self, room_id, room_name, color):
+        index = self.room_index.get(room_id)
+        if index is None:
+            if len(self.rooms) > 255:
+                raise ValueError("방은 255개까지")
+            index = len(self.rooms)
+            self.rooms.append({"room_id": room_id, "room_name": room_name, "color": color})
+            self.room_index[room_id] = index
+        return index
+
+    def index_at(self, tx, ty):
+        """타일의 방 번호 (맵 밖이면 0)"""
+        if 0 <= tx < self.map_tw and 0 <= ty < self.map_th:
+            return self.cells[self.rows[ty] + tx]
+        return 0
+
+    def cell(self, tx, ty):
+        return self.rooms[self.index_at(tx, ty)]
+
+    def walkable(self, wx, wy):
+        return self.index_at(int(wx // TILE_SIZE), int(wy // TILE_SIZE)) != 0
+
+    def walkable_many(self, points):
+        """여러 월드 좌표를 한 번에 검사 → bool 리스트"""
+        cells, rows, tw, th = self.cells, self.rows, self.map_tw, self.map_th
+        result = []
+        for wx, wy in points:
+            tx, ty = int(wx // TILE_SIZE), int(wy // TILE_SIZE)
+            result.append(0 <= tx < tw and 0 <= ty < th and cells[rows[ty] + tx] != 0)
+        return result
+
+    def row_slice(self, ty, tx0, tx1):
+        """ty행의 tx0~tx1-1 방 번호 (맵 안쪽 범위만)"""
+        row = self.rows[ty]
+        return self.cells[row + tx0:row + tx1]
+
+    def passable_rows(self):
+        """FlowField용 passable[ty][tx]"""
+        return [[c != 0 for c in self.cells[r:r + self.map_tw]] for r in self.rows]
+
+    def tiled(self, map_tw, map_th):
+        """바둑판처럼 반복해서 더 큰 맵 (벤치마크용). 방 팔레트는 같이 씀"""
+        big = TileMap(map_tw, map_th)
+        big.rooms, big.room_index = self.rooms, self.room_index
+        for ty in range(map_th):
+            src = self.rows[ty % self.map_th]
+            row = self.cells[src:src + self.map_tw]
+            line = row * (map_tw // self.map_tw + 1)
+            big.cells[big.rows[ty]:big.rows[ty] + map_tw] = line[:map_tw]
+        return big
+
+
 def build_unified_map():
     """설계도 기준: 현관(좌상), 주방(상중), 거실(중앙), 베란다(하중), 동쪽 방1·욕실·방2"""
     # 맵 크기 (타일 단위)
     MAP_TW = 28
     MAP_TH = 30
-    grid = [[None] * MAP_TW for _ in range(MAP_TH)]
+    grid = TileMap(MAP_TW, MAP_TH)
     room_names = {}
 
     def fill(tx0, ty0, tw, th, room_id, room_name, color):
-        for ty in range(ty0, min(ty0 + th, MAP_TH)):
-            for tx in range(tx0, min(tx0 + tw, MAP_TW)):
-                if 0 <= ty < MAP_TH and 0 <= tx < MAP_TW:
-                    grid[ty][tx] = {"room_id": room_id, "room_name": room_name, "color": color}
+        index = grid.add_room(room_id, room_name, color)
+        for ty in range(max(0, ty0), min(ty0 + th, MAP_TH)):
+            row = grid.rows[ty]
+            for tx in range(max(0, tx0), min(tx0 + tw, MAP_TW)):
+                grid.cells[row + tx] = index
         room_names[room_id] = room_name
 
     # 설계도 배치 (타일 좌표)
@@ -74,19 +148,13 @@ def world_to_tile(wx, wy):
 
 
 def is_walkable(grid, map_tw, map_th, wx, wy):
-    tx, ty = world_to_tile(wx, wy)
-    if tx < 0 or ty < 0 or tx >= map_tw or ty >= map_th:
-        return False
-    cell = grid[ty][tx]
-    return cell is not None
+    return grid.walkable(wx, wy)
 
 
 def get_room_at(grid, map_tw, map_th, wx, wy):
     tx, ty = world_to_tile(wx, wy)
-    if tx < 0 or ty < 0 or tx >= map_tw or ty >= map_th:
-        return None
-    cell = grid[ty][tx]
-    return cell.get("room_name") if cell else None
+    cell = grid.rooms[grid.index_at(tx, ty)]
+    return cell["room_name"] if cell else None
 
 
 # ========== 카메라 컬링 ==========
@@ -103,40 +171,220 @@ def get_visible_tile_bounds(cam_wx, cam_wy, map_tw, map_th, margin_tiles=4):
 
 
 # ========== 벽 정보 (Z-Order / 가림용) ==========
-def collect_wall_segments(grid, map_tw, map_th, tx_min, ty_min, tx_max, ty_max):
-    """지정 타일 범위 내에서 그릴 벽 세그먼트 수집. 각 벽에 depth(iso) 부여."""
+# 격자는 바뀌지 않으므로 벽 메시는 맵을 불러올 때 한 번만 만든다.
+# 같은 줄에 이어지는 벽 타일은 한 세그먼트로 합치고, iso 좌표를 미리 계산해 depth 순으로 정렬해 둔다.
+# 매 프레임은 보이는 depth 구간만 잘라 쓰고 캐릭터 몇 명과 병합만 한다.
+def wall_quad(b_iso, e_iso):
+    pts = [b_iso, e_iso, (e_iso[0], e_iso[1] - WALL_H), (b_iso[0], b_iso[1] - WALL_H)]
+    top_pts = [(b_iso[0], b_iso[1] - WALL_H), (e_iso[0], e_iso[1] - WALL_H),
+               (e_iso[0], e_iso[1] - WALL_H - WALL_D), (b_iso[0], b_iso[1] - WALL_H - WALL_D)]
+    xs = [p[0] for p in pts + top_pts]
+    ys = [p[1] for p in pts + top_pts]
+    return {
+        "pts": pts,
+        "top_pts": top_pts,
+        # 화면 범위 (iso, 카메라 오프셋 전). 폴리곤 가장자리 1px 여유
+        "bbox": pygame.Rect(int(min(xs)) - 1, int(min(ys)) - 1,
+                            int(max(xs) - min(xs)) + 3, int(max(ys) - min(ys)) + 3),
+    }
+
+
+def build_wall_mesh(grid, map_tw, map_th, chunk=None):
+    """격자의 벽 세그먼트를 만들어 depth 순으로 정렬. chunk = (tx0, ty0, tx1, ty1)이면 그 범위만 (기본: 전체).
+    벽 depth는 세그먼트 앞쪽 끝 타일의 tx + ty, tiles는 (tx0, ty0, tx1, ty1) 타일 범위"""
+    cx0, cy0, cx1, cy1 = chunk or (0, 0, map_tw, map_th)
+
+    def has_wall(tx, ty, dx, dy):
+        # 북쪽(dy=-1)/서쪽(dx=-1) 타일이 없거나 다른 방이면 벽
+        index = grid.index_at(tx, ty)
+        return index != 0 and grid.index_at(tx + dx, ty + dy) != index
+
+    def north_wall(tx, ty):
+        return 0 <= tx < map_tw and 0 <= ty < map_th and has_wall(tx, ty, 0, -1)
+
+    def west_wall(tx, ty):
+        return 0 <= tx < map_tw and 0 <= ty < map_th and has_wall(tx, ty, -1, 0)
+
+    # 다른 방향 벽과 맞닿는 타일(모서리)은 합치지 않음 → 모서리의 그리는 순서가 타일 단위와 같게 유지
+    def north_corner(tx, ty):
+        return any(west_wall(x, y) for x in (tx, tx + 1) for y in (ty - 1, ty))
+
+    def west_corner(tx, ty):
+        return any(north_wall(x, y) for x in (tx - 1, tx) for y in (ty, ty + 1))
+
     walls = []
-    for ty in range(ty_min, ty_max):
-        for tx in range(tx_min, tx_max):
-            cell = grid[ty][tx] if 0 <= ty < map_th and 0 <= tx < map_tw else None
-            wx = tx * TILE_SIZE
-            wy = ty * TILE_SIZE
-            depth = tx + ty  # iso depth
-            # 북쪽 벽: 위쪽 타일이 없거나 다른 방
-            north = grid[ty - 1][tx] if ty - 1 >= 0 else None
-            if north is None or north.get("room_id") != (cell.get("room_id") if cell else None):
-                if cell is not None:
-                    b_iso = to_iso(wx, wy)
-                    e_iso = to_iso(wx + TILE_SIZE, wy)
-                    walls.append({
-                        "pts": [b_iso, e_iso, (e_iso[0], e_iso[1] - WALL_H), (b_iso[0], b_iso[1] - WALL_H)],
-                        "depth": depth,
-                        "top_pts": [(b_iso[0], b_iso[1] - WALL_H), (e_iso[0], e_iso[1] - WALL_H),
-                                    (e_iso[0], e_iso[1] - WALL_H - WALL_D), (b_iso[0], b_iso[1] - WALL_H - WALL_D)],
-                    })
-            # 서쪽 벽
-            west = grid[ty][tx - 1] if tx - 1 >= 0 else None
-            if west is None or west.get("room_id") != (cell.get("room_id") if cell else None):
-                if cell is not None:
-                    b_iso = to_iso(wx, wy)
-                    e_iso = to_iso(wx, wy + TILE_SIZE)
-                    walls.append({
-                        "pts": [b_iso, e_iso, (e_iso[0], e_iso[1] - WALL_H), (b_iso[0], b_iso[1] - WALL_H)],
-                        "depth": depth,
-                        "top_pts": [(b_iso[0], b_iso[1] - WALL_H), (e_iso[0], e_iso[1] - WALL_H),
-                                    (e_iso[0], e_iso[1] - WALL_H - WALL_D), (b_iso[0], b_iso[1] - WALL_H - WALL_D)],
-                    })
-    return walls
+    # 북쪽 벽: 같은 행에서 x로 이어지는 것끼리
+    for ty in range(cy0, cy1):
+        tx = cx0
+        while tx < cx1:
+            if not north_wall(tx, ty):
+                tx += 1
+                continue
+            tx0 = tx
+            while tx + 1 < cx1 and not north_corner(tx, ty) and north_wall(tx + 1, ty) and not north_corner(tx + 1, ty):
+                tx += 1
+            wall = wall_quad(to_iso(tx0 * TILE_SIZE, ty * TILE_SIZE), to_iso((tx + 1) * TILE_SIZE, ty * TILE_SIZE))
+            wall["depth"] = tx + ty
+            wall["tiles"] = (tx0, ty, tx, ty)
+            wall["axis"], wall["line"] = "y", ty * TILE_SIZE
+            walls.append(wall)
+            tx += 1
+    # 서쪽 벽: 같은 열에서 y로 이어지는 것끼리
+    for tx in range(cx0, cx1):
+        ty = cy0
+        while ty < cy1:
+            if not west_wall(tx, ty):
+                ty += 1
+                continue
+            ty0 = ty
+            while ty + 1 < cy1 and not west_corner(tx, ty) and west_wall(tx, ty + 1) and not west_corner(tx, ty + 1):
+                ty += 1
+            wall = wall_quad(to_iso(tx * TILE_SIZE, ty0 * TILE_SIZE), to_iso(tx * TILE_SIZE, (ty + 1) * TILE_SIZE))
+            wall["depth"] = tx + ty
+            wall["tiles"] = (tx, ty0, tx, ty)
+            wall["axis"], wall["line"] = "x", tx * TILE_SIZE
+            walls.append(wall)
+            ty += 1
+
+    walls.sort(key=lambda w: w["depth"])
+
+    # 가림 인덱스: 벽 화면 범위(iso)를 OCCLUDE_CELL 칸에 나눠 담음
+    cells = {}
+    for w in walls:
+        for key in iso_cells(w["bbox"]):
+            cells.setdefault(key, []).append(w)
+    return {
+        "walls": walls,
+        "depths": [w["depth"] for w in walls],
+        "max_span": max((w["tiles"][2] - w["tiles"][0] + w["tiles"][3] - w["tiles"][1] for w in walls), default=0),
+        "cells": cells,
+    }
+
+
+OCCLUDE_CELL = 128
+CHAR_BOX = (48, 90)     # 캐릭터 화면 범위 (팔다리 포함). 발 위치 기준 위로 80, 아래로 10
+
+
+def iso_cells(rect):
+    for cy in range(rect.top // OCCLUDE_CELL, (rect.bottom - 1) // OCCLUDE_CELL + 1):
+        for cx in range(rect.left // OCCLUDE_CELL, (rect.right - 1) // OCCLUDE_CELL + 1):
+            yield cx, cy
+
+
+def wall_in_front(wall, wx, wy):
+    """월드 좌표 (wx, wy)가 벽 뒤(북쪽/서쪽)에 있으면 True"""
+    return (wy if wall["axis"] == "y" else wx) < wall["line"]
+
+
+def occluding_walls(meshes, char):
+    """캐릭터와 화면에서 겹치고 캐릭터보다 앞에 있는 벽들"""
+    box = char.iso_rect()
+    found = []
+    seen = set()        # id(wall): 여러 칸에 걸친 벽을 한 번만 (dict ==로 비교하지 않게)
+    for mesh in meshes:
+        for key in iso_cells(box):
+            for w in mesh["cells"].get(key, ()):
+                if id(w) in seen:
+                    continue
+                seen.add(id(w))
+                if w["bbox"].colliderect(box) and wall_in_front(w, char.world_pos.x, char.world_pos.y):
+                    found.append(w)
+    return found
+
+
+def visible_walls(mesh, tx_min, ty_min, tx_max, ty_max):
+    """보이는 타일 범위와 겹치는 벽 (depth 순). depth 구간으로 먼저 자르고 타일 범위로 거름"""
+    lo = bisect.bisect_left(mesh["depths"], tx_min + ty_min)
+    hi = bisect.bisect_right(mesh["depths"], tx_max + ty_max - 2 + mesh["max_span"])
+    result = []
+    for w in mesh["walls"][lo:hi]:
+        x0, y0, x1, y1 = w["tiles"]
+        if x1 >= tx_min and x0 < tx_max and y1 >= ty_min and y0 < ty_max:
+            result.append(w)
+    return result
+
+
+WALL_MESHES = weakref.WeakKeyDictionary()     # grid -> 벽 메시 (grid가 버려지면 같이 사라짐)
+
+
+def get_wall_mesh(grid, map_tw, map_th):
+    """grid마다 한 번만 만든 벽 메시"""
+    mesh = WALL_MESHES.get(grid)
+    if mesh is None:
+        mesh = build_wall_mesh(grid, map_tw, map_th)
+        WALL_MESHES[grid] = mesh
+    return mesh
+
+
+def get_wall_meshes(grid, map_tw, map_th, tx_min, ty_min, tx_max, ty_max):
+    """보이는 범위의 벽 메시 목록. 리전 월드(RegionWorld)는 리전마다 따로 만들고 리전을 내보낼 때 같이 버림"""
+    size = getattr(grid, "region_size", None)
+    if size is None:
+        return [get_wall_mesh(grid, map_tw, map_th)]
+    cache = WALL_MESHES.get(grid)
+    if cache is None:
+        cache = {"chunks": {}}
+        WALL_MESHES[grid] = cache
+        grid.on_evict = lambda key: cache["chunks"].pop(key, None)
+    meshes = []
+    for ry in range(max(0, ty_min) // size, (max(ty_min, ty_max - 1)) // size + 1):
+        for rx in range(max(0, tx_min) // size, (max(tx_min, tx_max - 1)) // size + 1):
+            mesh = cache["chunks"].get((rx, ry))
+            if mesh is None:
+                chunk = (rx * size, ry * size, min(map_tw, (rx + 1) * size), min(map_th, (ry + 1) * size))
+                mesh = build_wall_mesh(grid, map_tw, map_th, chunk)
+                cache["chunks"][(rx, ry)] = mesh
+            meshes.append(mesh)
+    return meshes
+
+
+# ========== 가림 레이어 ==========
+OCCLUDE_ALPHA = 160
+OCCLUDE_COLORKEY = (1, 1, 1)
+
+
+class OcclusionLayer:
+    """가리는 벽을 재사용하는 화면 크기 Surface 한 장에 모아 그리고, 벽들의 범위 합집합만 한 번 합성"""
+
+    def __init__(self):
+        self.surface = None
+        self.walls = []
+
+    def begin(self, size):
+        if self.surface is None or self.surface.get_size() != size:
+            self.surface = pygame.Surface(size)
+            self.surface.set_colorkey(OCCLUDE_COLORKEY)
+            self.surface.set_alpha(OCCLUDE_ALPHA)
+        self.walls.clear()
+
+    def add(self, wall):
+        self.walls.append(wall)
+
+    def draw(self, screen, cam_off, wall_tops=True):
+        if not self.walls:
+            return
+        ox, oy = int(cam_off[0]), int(cam_off[1])
+        area = self.walls[0]["bbox"].unionall([w["bbox"] for w in self.walls[1:]])
+        area = area.move(ox, oy).clip(self.surface.get_rect())
+        if not area.width or not area.height:
+            return
+        self.surface.set_clip(area)
+        self.surface.fill(OCCLUDE_COLORKEY, area)
+        for w in self.walls:
+            pygame.draw.polygon(self.surface, COLOR_WALL, [(p[0] + cam_off[0], p[1] + cam_off[1]) for p in w["pts"]])
+            if wall_tops:
+                pygame.draw.polygon(self.surface, COLOR_WALL_TOP, [(p[0] + cam_off[0], p[1] + cam_off[1]) for p in w["top_pts"]])
+        self.surface.set_clip(None)
+        screen.blit(self.surface, area.topleft, area)
+
+
+OCCLUSION = OcclusionLayer()
+
+# 실루엣 마스크: (역할, 몸 너비)마다 한 번만 그림. 기준점(발 위치 cx, cy)은 아래 가운데
+SILHOUETTE_SIZE = (40, 80)
+SILHOUETTE_COLOR = (60, 60, 80)
+SILHOUETTE_EDGE = (80, 80, 100)
+SILHOUETTES = {}
 
 
 # ========== 캐릭터 클래스 (p007 유지, update만 통합 맵 대응) ==========
@@ -168,7 +416,7 @@ class Character:
             self.ribbon_color = (255, 100, 150)
             self.speed = 5
 
-    def update(self, target_pos=None, grid=None, map_tw=0, map_th=0):
+    def update(self, target_pos=None, grid=None, map_tw=0, map_th=0, flow=None):
         move_vec = pygame.Vector2(0, 0)
         if target_pos is None:
             keys = pygame.key.get_pressed()
@@ -185,6 +433,13 @@ class Character:
             diff = target_pos - self.world_pos
             if diff.length() > 65:
                 move_vec = diff.normalize() * self.speed
+                # 다른 방에 있으면 직선 대신 플로우 필드를 따라 통로로 돌아감
+                if flow is not None and grid is not None and \
+                        get_room_at(grid, map_tw, map_th, self.world_pos.x, self.world_pos.y) != \
+                        get_room_at(grid, map_tw, map_th, target_pos.x, target_pos.y):
+                    step = flow.direction(self.world_pos.x, self.world_pos.y)
+                    if step is not None:
+                        move_vec = pygame.Vector2(step) * self.speed
                 self.look_dir = pygame.Vector2(move_vec.x - move_vec.y, move_vec.x + move_vec.y).normalize()
 
         if move_vec.length() > 0 and grid is not None:
@@ -201,6 +456,28 @@ class Character:
     def get_depth(self):
         return self.world_pos.x + self.world_pos.y
 
+    def iso_rect(self):
+        ix, iy = to_iso(self.world_pos.x, self.world_pos.y)
+        return pygame.Rect(int(ix) - CHAR_BOX[0] // 2, int(iy) - CHAR_BOX[1] + 10, CHAR_BOX[0], CHAR_BOX[1])
+
+    def get_silhouette(self, draw_w):
+        """단색 + 테두리 실루엣 마스크 (역할·몸 너비별 캐시)"""
+        key = (self.role, draw_w)
+        mask = SILHOUETTES.get(key)
+        if mask is None:
+            mask = pygame.Surface(SILHOUETTE_SIZE, pygame.SRCALPHA)
+            cx, cy = SILHOUETTE_SIZE[0] // 2, SILHOUETTE_SIZE[1]
+            pelvis_y = cy - self.limb_len
+            pants_h = self.body_h // 2
+            body_top = pelvis_y - pants_h
+            head_y = body_top - (self.body_h - pants_h) + 3 - 8
+            pygame.draw.rect(mask, SILHOUETTE_COLOR, (cx - draw_w // 2, body_top - (self.body_h - pants_h), draw_w, self.body_h - pants_h))
+            pygame.draw.rect(mask, SILHOUETTE_COLOR, (cx - draw_w // 2, pelvis_y - pants_h, draw_w, pants_h))
+            pygame.draw.circle(mask, SILHOUETTE_COLOR, (cx, head_y), self.head_r)
+            pygame.draw.circle(mask, SILHOUETTE_EDGE, (cx, head_y), self.head_r, 2)
+            SILHOUETTES[key] = mask
+        return mask
+
     def draw(self, surface, cam_off, force_silhouette=False):
         iso_p = to_iso(self.world_pos.x, self.world_pos.y)
         cx = iso_p[0] + cam_off[0]
@@ -219,12 +496,9 @@ class Character:
         head_y = shoulder_y - 8
 
         if force_silhouette:
-            # 벽에 가려질 때 실루엣 (단색 + 테두리)
-            silhouette_color = (60, 60, 80)
-            pygame.draw.rect(surface, silhouette_color, (cx - draw_w // 2, body_top - (self.body_h - pants_h), draw_w, self.body_h - pants_h))
-            pygame.draw.rect(surface, silhouette_color, (cx - draw_w // 2, pelvis_y - pants_h, draw_w, pants_h))
-            pygame.draw.circle(surface, silhouette_color, (int(cx), int(head_y)), self.head_r)
-            pygame.draw.circle(surface, (80, 80, 100), (int(cx), int(head_y)), self.head_r, 2)
+            # 벽에 가려질 때 실루엣 (캐시한 마스크를 찍기만 함)
+            mask = self.get_silhouette(draw_w)
+            surface.blit(mask, (int(cx) - SILHOUETTE_SIZE[0] // 2, int(cy) - SILHOUETTE_SIZE[1]))
             return
 
         if not is_back:
@@ -276,125 +550,157 @@ class Character:
 
 
 # 컬링 + Z-Order + 벽 반투명 / 가려진 캐릭터 실루엣
-def render_unified_v2(screen, grid, map_tw, map_th, characters, cam_off, cam_wx, cam_wy):
+IMPOSTORS = ImpostorCache()
+FLOOR_DIAMOND = DiamondBuffer(TILE_SIZE)     # 바닥 타일마다 꼭짓점 리스트를 새로 만들지 않고 재사용
+
+
+def render_unified_v2(screen, grid, map_tw, map_th, characters, cam_off, cam_wx, cam_wy, quality=None):
+    # quality: QualityGovernor (없으면 최고 품질)
+    setting = quality.get if quality is not None else QUALITY_LEVELS[0].get
     screen.fill(COLOR_BG)
-    tx_min, ty_min, tx_max, ty_max = get_visible_tile_bounds(cam_wx, cam_wy, map_tw, map_th)
+    margin = max(1, round(4 * setting("cull_scale")))
+    tx_min, ty_min, tx_max, ty_max = get_visible_tile_bounds(cam_wx, cam_wy, map_tw, map_th, margin)
+    outlines, wall_tops = setting("outlines"), setting("wall_tops")
 
     # 1) 바닥 (카메라 컬링)
-    for ty in range(ty_min, ty_max):
-        for tx in range(tx_min, tx_max):
-            if ty < 0 or tx < 0 or ty >= map_th or tx >= map_tw:
-                continue
-            cell = grid[ty][tx]
-            if cell is None:
+    rooms = grid.rooms
+    ox, oy = cam_off
+    x0, x1 = max(0, tx_min), min(tx_max, map_tw)
+    for ty in range(max(0, ty_min), min(ty_max, map_th)):
+        wy = ty * TILE_SIZE
+        for tx, index in enumerate(grid.row_slice(ty, x0, x1), x0):
+            if not index:
                 continue
-            wx, wy = tx * TILE_SIZE, ty * TILE_SIZE
-            ix, iy = to_iso(wx, wy)
-            pts = [
-                (ix + cam_off[0], iy + cam_off[1]),
-                (ix + TILE_SIZE + cam_off[0], iy + TILE_SIZE / 2 + cam_off[1]),
-                (ix + cam_off[0], iy + TILE_SIZE + cam_off[1]),
-                (ix - TILE_SIZE + cam_off[0], iy + TILE_SIZE / 2 + cam_off[1]),
-            ]
+            cell = rooms[index]
+            wx = tx * TILE_SIZE
+            pts = FLOOR_DIAMOND.at(wx - wy + ox, (wx + wy) / 2 + oy)
             pygame.draw.polygon(screen, cell["color"], pts)
-            pygame.draw.polygon(screen, COLOR_GRID, pts, 1)
-
-    walls = collect_wall_segments(grid, map_tw, map_th, tx_min, ty_min, tx_max, ty_max)
-    walls_sorted = sorted(walls, key=lambda w: w["depth"])
+            if outlines:
+                pygame.draw.polygon(screen, COLOR_GRID, pts, 1)
+
+    meshes = get_wall_meshes(grid, map_tw, map_th, tx_min, ty_min, tx_max, ty_max)
+    if len(meshes) == 1:
+        walls_sorted = visible_walls(meshes[0], tx_min, ty_min, tx_max, ty_max)
+    else:
+        walls_sorted = list(heapq.merge(*(visible_walls(m, tx_min, ty_min, tx_max, ty_max) for m in meshes),
+                                        key=lambda w: w["depth"]))
     chars_sorted = sorted(characters, key=lambda c: c.get_depth())
 
-    # 2) Z-Order: depth 순으로 벽·캐릭터 교차. 가리는 벽은 반투명, 가려진 캐릭터는 실루엣
-    all_items = [(w["depth"], "wall", w) for w in walls_sorted] + [(c.get_depth(), "char", c) for c in chars_sorted]
-    all_items.sort(key=lambda x: x[0])
-    drawn_chars = set()
-
-    for depth, kind, obj in all_items:
-        if kind == "wall":
-            w = obj
-            pts = [(p[0] + cam_off[0], p[1] + cam_off[1]) for p in w["pts"]]
-            top_pts = [(p[0] + cam_off[0], p[1] + cam_off[1]) for p in w["top_pts"]]
-            for c in chars_sorted:
-                if c.get_depth() < depth and id(c) not in drawn_chars:
-                    c.draw(screen, cam_off, force_silhouette=True)
-                    drawn_chars.add(id(c))
-            occludes = any(c.get_depth() < depth for c in chars_sorted)
-            if occludes:
-                surf = pygame.Surface((WINDOW_WIDTH + 400, WINDOW_HEIGHT + 400))
-                surf.set_colorkey((1, 1, 1))
-                surf.fill((1, 1, 1))
-                off = (200 - cam_off[0], 200 - cam_off[1])
-                pygame.draw.polygon(surf, COLOR_WALL, [(p[0] + off[0], p[1] + off[1]) for p in w["pts"]])
-                pygame.draw.polygon(surf, COLOR_WALL_TOP, [(p[0] + off[0], p[1] + off[1]) for p in w["top_pts"]])
-                surf.set_alpha(160)
-                screen.blit(surf, (-200, -200))
-            else:
-                pygame.draw.polygon(screen, COLOR_WALL, pts)
-                pygame.draw.polygon(screen, COLOR_WALL_TOP, top_pts)
+    # 2) 가림 판정: 캐릭터마다 화면에서 겹치고 앞에 있는 벽만 (가림 인덱스로 조회)
+    occluders = set()   # id(wall)
+    occluded = []
+    for c in chars_sorted:
+        walls = occluding_walls(meshes, c)
+        if walls:
+            occluded.append(c)
+            occluders.update(id(w) for w in walls)
+
+    # 3) 벽 (depth 순). 가리는 벽은 가림 레이어에 모았다가 한 번에 반투명 합성
+    OCCLUSION.begin(screen.get_size())
+    for w in walls_sorted:
+        if id(w) in occluders:
+            OCCLUSION.add(w)
         else:
-            c = obj
-            if id(c) not in drawn_chars:
-                in_front = any(w["depth"] > c.get_depth() for w in walls_sorted)
-                c.draw(screen, cam_off, force_silhouette=in_front)
-                drawn_chars.add(id(c))
-
-    # 3) 벽에 가려지지 않은 캐릭터만 일반 그리기로 한 번 더 (앞에 나오도록)
+            pygame.draw.polygon(screen, COLOR_WALL, [(p[0] + cam_off[0], p[1] + cam_off[1]) for p in w["pts"]])
+            if wall_tops:
+                pygame.draw.polygon(screen, COLOR_WALL_TOP, [(p[0] + cam_off[0], p[1] + cam_off[1]) for p in w["top_pts"]])
+
+    # 4) 가려진 캐릭터는 실루엣 → 그 위로 반투명 벽 → 안 가려진 캐릭터는 한 번만 일반 그리기
+    for c in occluded:
+        c.draw(screen, cam_off, force_silhouette=True)
+    OCCLUSION.draw(screen, cam_off, wall_tops)
     for c in chars_sorted:
-        if not any(w["depth"] > c.get_depth() for w in walls_sorted):
-            c.draw(screen, cam_off, force_silhouette=False)
+        if c not in occluded:
+            if setting("impostors"):
+                IMPOSTORS.draw(screen, c, cam_off)
+            else:
+                c.draw(screen, cam_off, force_silhouette=False)
 
 
 # ========== 메인 ==========
-def main():
+def main(world_path=None):
     screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
     pygame.display.set_caption("아파트 - 통합 맵 (단일 평면도)")
     clock = pygame.time.Clock()
 
-    grid, room_names, MAP_TW, MAP_TH = build_unified_map()
-
-    # 캐릭터 시작: 거실 중앙 (타일 4+7, 6+6 등)
-    start_wx = (4 + 7) * TILE_SIZE + TILE_SIZE // 2
-    start_wy = (6 + 6) * TILE_SIZE + TILE_SIZE // 2
+    if world_path:
+        # 리전 월드: 카메라 근처 리전만 읽고 벽 메시도 리전마다 필요할 때 만듦
+        grid = RegionWorld(world_path)
+        MAP_TW, MAP_TH = grid.map_tw, grid.map_th
+        start_wx, start_wy = grid.spawn
+        grid.update(start_wx, start_wy)
+    else:
+        grid, room_names, MAP_TW, MAP_TH = build_unified_map()
+        get_wall_mesh(grid, MAP_TW, MAP_TH)  # 벽 메시는 맵 불러올 때 한 번
+
+        # 캐릭터 시작: 거실 중앙 (타일 4+7, 6+6 등)
+        start_wx = (4 + 7) * TILE_SIZE + TILE_SIZE // 2
+        start_wy = (6 + 6) * TILE_SIZE + TILE_SIZE // 2
     father = Character(start_wx, start_wy, "father")
     mother = Character(start_wx - 40, start_wy - 40, "mother")
     daughter = Character(start_wx - 80, start_wy - 80, "daughter")
     characters = [daughter, mother, father]
 
-    try:
-        font = pygame.font.SysFont("malgungothic", 28)
-    except Exception:
-        try:
-            font = pygame.font.SysFont("nanumgothic", 28)
-        except Exception:
-            font = pygame.font.SysFont(None, 28)
+    # 아빠 타일 기준 플로우 필드 (아빠가 다른 타일로 옮길 때만 다시 계산). 리전 월드는 맵 전체를 올리지 않으므로 직선 추적
+    flow = None if world_path else FlowField.from_tilemap(grid, TILE_SIZE)
 
-    while True:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                return
+    init_fonts()
+    font = get_font(28)
 
-        father.update(grid=grid, map_tw=MAP_TW, map_th=MAP_TH)
-        mother.update(father.world_pos, grid=grid, map_tw=MAP_TW, map_th=MAP_TH)
-        daughter.update(mother.world_pos, grid=grid, map_tw=MAP_TW, map_th=MAP_TH)
+    profiler = FrameProfiler()
+    quality = QualityGovernor(FPS)
+
+    while True:
+        profiler.begin_frame()
+        quality.begin_frame()
+        with profiler.phase("events"):
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    profiler.close()
+                    pygame.quit()
+                    return
+                profiler.handle_event(event)
+
+        with profiler.phase("update"):
+            father.update(grid=grid, map_tw=MAP_TW, map_th=MAP_TH)
+            if flow is not None:
+                flow.update(father.world_pos.x, father.world_pos.y)
+            mother.update(father.world_pos, grid=grid, map_tw=MAP_TW, map_th=MAP_TH, flow=flow)
+            daughter.update(mother.world_pos, grid=grid, map_tw=MAP_TW, map_th=MAP_TH, flow=flow)
+        if flow is not None:
+            profiler.count("flow_rebuilds", flow.rebuilds)
+
+        if world_path:
+            grid.update(father.world_pos.x, father.world_pos.y)
+            profiler.count("regions", len(grid.loaded))
 
         cam_wx = father.world_pos.x
         cam_wy = father.world_pos.y
         ix, iy = to_iso(cam_wx, cam_wy)
         cam_off = (WINDOW_WIDTH // 2 - ix, WINDOW_HEIGHT // 2 - iy)
 
-        render_unified_v2(screen, grid, MAP_TW, MAP_TH, characters, cam_off, cam_wx, cam_wy)
-
-        room_name = get_room_at(grid, MAP_TW, MAP_TH, father.world_pos.x, father.world_pos.y) or "?"
-        text = font.render(f"{room_name} | WASD: 이동 | 통합 맵", True, (255, 255, 255))
-        text_bg = pygame.Surface((text.get_width() + 20, text.get_height() + 10))
-        text_bg.fill((0, 0, 0))
-        text_bg.set_alpha(180)
-        screen.blit(text_bg, (10, 10))
-        screen.blit(text, (20, 15))
-
-        pygame.display.flip()
+        with profiler.phase("render"):
+            render_unified_v2(screen, grid, MAP_TW, MAP_TH, characters, cam_off, cam_wx, cam_wy, quality)
+
+        with profiler.phase("ui"):
+            room_name = get_room_at(grid, MAP_TW, MAP_TH, father.world_pos.x, father.world_pos.y) or "?"
+            text = font.render(f"{room_name} | WASD: 이동 | 통합 맵", True, (255, 255, 255))
+            text_bg = pygame.Surface((text.get_width() + 20, text.get_height() + 10))
+            text_bg.fill((0, 0, 0))
+            text_bg.set_alpha(180)
+            screen.blit(text_bg, (10, 10))
+            screen.blit(text, (20, 15))
+
+        profiler.count("quality", quality.level)
+        profiler.draw(screen, pos=(10, 60))
+        with profiler.phase("flip"):
+            pygame.display.flip()
+        profiler.end_frame()
+        quality.end_frame()
         clock.tick(FPS)
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="아파트 - 통합 맵")
+    parser.add_argument("--world", help="리전 월드 폴더 (tools/convert_regions.py로 만든 것)")
+    main(parser.parse_args().world)
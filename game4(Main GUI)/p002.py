@@ -1,6 +1,10 @@
 import pygame
+import os
 import sys
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.fonts import init_fonts, get_font
+
 # --- 초기 설정 ---
 pygame.init()
 WINDOW_WIDTH, WINDOW_HEIGHT = 800, 600
@@ -48,31 +52,11 @@ class MenuItem:
 
 class MainMenu:
     def __init__(self):
-        # 한글 지원 폰트 (시스템 폰트 사용)
-        try:
-            # Windows: 맑은 고딕
-            self.font_title = pygame.font.SysFont('malgungothic', 72)
-            self.font_menu = pygame.font.SysFont('malgungothic', 48)
-            self.font_small = pygame.font.SysFont('malgungothic', 24)
-        except:
-            # 맑은 고딕 없으면 다른 한글 폰트 시도
-            try:
-                self.font_title = pygame.font.SysFont('nanumgothic', 72)
-                self.font_menu = pygame.font.SysFont('nanumgothic', 48)
-                self.font_small = pygame.font.SysFont('nanumgothic', 24)
-            except:
-                # 그래도 없으면 아무 한글 폰트
-                available_fonts = pygame.font.get_fonts()
-                korean_fonts = [f for f in available_fonts if 'gothic' in f or 'malgun' in f or 'nanum' in f]
-                if korean_fonts:
-                    self.font_title = pygame.font.SysFont(korean_fonts[0], 72)
-                    self.font_menu = pygame.font.SysFont(korean_fonts[0], 48)
-                    self.font_small = pygame.font.SysFont(korean_fonts[0], 24)
-                else:
-                    # 최후의 수단: 기본 폰트
-                    self.font_title = pygame.font.Font(None, 72)
-                    self.font_menu = pygame.font.Font(None, 48)
-                    self.font_small = pygame.font.Font(None, 24)
+        # 한글 지원 폰트 (공용 레지스트리: malgungothic → nanumgothic → 기본 폰트)
+        init_fonts()
+        self.font_title = get_font(72)
+        self.font_menu = get_font(48)
+        self.font_small = get_font(24)
         
         # 메뉴 아이템들
         menu_start_y = 200
@@ -1,6 +1,11 @@
 import pygame
 import math
 import random
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.fonts import init_fonts, get_font
 
 # --- 초기 설정 ---
 pygame.init()
@@ -285,7 +290,7 @@ class Item:
 
 # --- UI 그리기 ---
 def draw_ui(screen, survivor):
-    font = pygame.font.SysFont('malgungothic', 24)
+    font = get_font(24)
     
     # 체력 바
     bar_x, bar_y = 20, 20
@@ -319,7 +324,7 @@ def draw_ui(screen, survivor):
     
     # 사망 메시지
     if not survivor.alive:
-        big_font = pygame.font.SysFont('malgungothic', 72)
+        big_font = get_font(72)
         death_text = big_font.render("사망", True, (255, 0, 0))
         text_rect = death_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2))
         screen.blit(death_text, text_rect)
@@ -393,7 +398,8 @@ def main():
         Item(520, 280, "food")
     ]
     
-    font = pygame.font.SysFont('malgungothic', 20)
+    init_fonts()
+    font = get_font(20)
     
     while True:
         for event in pygame.event.get():
@@ -1,6 +1,15 @@
 import pygame
 import math
 import random
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.fonts import init_fonts, get_font
+from common.profiler import FrameProfiler
+from common.horde import Horde, HAS_NUMPY
+from common.quality import QualityGovernor
+from common.iso import to_iso, project_many, tile_mesh, wall_mesh
 
 # --- 초기 설정 ---
 pygame.init()
@@ -8,6 +17,10 @@ WINDOW_WIDTH, WINDOW_HEIGHT = 1200, 800
 FPS = 60
 TILE_SIZE = 40
 
+# 좀비 수 (2마리 넘으면 나머지는 집 안 무작위 위치) / numpy가 있으면 배열로 한꺼번에 업데이트
+ZOMBIE_COUNT = 2
+HORDE_BACKEND = HAS_NUMPY
+
 # 색상
 COLOR_BG = (30, 30, 35)
 COLOR_WALL = (100, 90, 80)
@@ -21,9 +34,6 @@ COLOR_ITEM = (255, 215, 0)
 COLOR_BACKPACK = (85, 107, 47)
 COLOR_LIMB = (255, 203, 164)
 
-def to_iso(x, y):
-    return (x - y), (x + y) / 2
-
 # --- 집 맵 ---
 class House:
     def __init__(self):
@@ -33,7 +43,19 @@ class House:
         self.th = 12
         self.wall_h = 90
         self.wall_d = 15
-        
+        self.meshes = None
+        
+    def get_meshes(self):
+        """바닥 마름모 / 북·서쪽 벽 폴리곤 (iso 공간). 처음 그릴 때 한 번만 계산 (그릴 때는 카메라 오프셋만 더함)"""
+        if self.meshes is None:
+            ox, oy = self.origin_x * TILE_SIZE, self.origin_y * TILE_SIZE
+            self.meshes = (tile_mesh(self.origin_x, self.origin_y, self.tw, self.th, TILE_SIZE),
+                           wall_mesh([
+                               (ox, oy, ox + self.tw * TILE_SIZE, oy),     # 북쪽
+                               (ox, oy, ox, oy + self.th * TILE_SIZE),     # 서쪽
+                           ], -self.wall_h))
+        return self.meshes
+
     def get_floor_rect(self):
         return pygame.Rect(
             (self.origin_x + 0.5) * TILE_SIZE,
@@ -75,7 +97,7 @@ class Survivor:
         self.attack_cooldown = 0
         self.attack_animation = 0  # 공격 애니메이션 카운터 (0 = 안함, >0 = 진행중)
         
-    def update(self, house, zombies):
+    def update(self, house, zombies, horde=None):
         if not self.alive:
             return
         
@@ -127,16 +149,19 @@ class Survivor:
             self.health = max(0, self.health - 0.02)
         
         # 좀비 충돌 (좀비가 공격 중일 때만)
-        for zombie in zombies:
-            if zombie.alive and zombie.attack_animation > 0:
-                if self.world_pos.distance_to(zombie.world_pos) < 35:
-                    self.health -= 0.5
+        if horde is not None:
+            self.health -= 0.5 * horde.count_attacking(self.world_pos, 35)
+        else:
+            for zombie in zombies:
+                if zombie.alive and zombie.attack_animation > 0:
+                    if self.world_pos.distance_to(zombie.world_pos) < 35:
+                        self.health -= 0.5
         
         # 사망 체크
         if self.health <= 0:
             self.alive = False
     
-    def attack(self, zombies):
+    def attack(self, zombies, horde=None):
         """마우스 클릭으로 공격"""
         if self.attack_cooldown > 0 or not self.alive or self.attack_animation > 0:
             return False
@@ -147,6 +172,12 @@ class Survivor:
         # 공격 범위 내 좀비 찾기
         attack_range = 60
         hit_zombie = False
+        if horde is not None:
+            i = horde.first_within(self.world_pos, attack_range)
+            if i is not None:
+                horde.hit(i, self.weapon_damage[self.weapon], 15)
+                hit_zombie = True
+            zombies = []
         for zombie in zombies:
             if zombie.alive and self.world_pos.distance_to(zombie.world_pos) < attack_range:
                 damage = self.weapon_damage[self.weapon]
@@ -422,7 +453,7 @@ class Item:
 
 # --- UI 그리기 ---
 def draw_ui(screen, survivor):
-    font = pygame.font.SysFont('malgungothic', 24)
+    font = get_font(24)
     
     # 체력 바
     bar_x, bar_y = 20, 20
@@ -461,55 +492,23 @@ def draw_ui(screen, survivor):
     
     # 사망 메시지
     if not survivor.alive:
-        big_font = pygame.font.SysFont('malgungothic', 72)
+        big_font = get_font(72)
         death_text = big_font.render("사망", True, (255, 0, 0))
         text_rect = death_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2))
         screen.blit(death_text, text_rect)
 
 # --- 맵 렌더링 ---
-def render_house(screen, house, cam_off):
-    # 바닥
-    for tx in range(house.tw):
-        for ty in range(house.th):
-            wx = (house.origin_x + tx) * TILE_SIZE
-            wy = (house.origin_y + ty) * TILE_SIZE
-            ix, iy = to_iso(wx, wy)
-            
-            pts = [
-                (ix + cam_off[0], iy + cam_off[1]),
-                (ix + TILE_SIZE + cam_off[0], iy + TILE_SIZE/2 + cam_off[1]),
-                (ix + cam_off[0], iy + TILE_SIZE + cam_off[1]),
-                (ix - TILE_SIZE + cam_off[0], iy + TILE_SIZE/2 + cam_off[1])
-            ]
-            pygame.draw.polygon(screen, COLOR_FLOOR, pts)
+def render_house(screen, house, cam_off, outlines=True):
+    floor_mesh, walls = house.get_meshes()
+    # 바닥 (outlines=False면 격자선 생략 - 품질 조절)
+    for pts in floor_mesh.at(cam_off):
+        pygame.draw.polygon(screen, COLOR_FLOOR, pts)
+        if outlines:
             pygame.draw.polygon(screen, COLOR_GRID, pts, 1)
     
     # 벽 (북쪽, 서쪽)
-    # 북쪽
-    bx, by = house.origin_x * TILE_SIZE, house.origin_y * TILE_SIZE
-    ex, ey = (house.origin_x + house.tw) * TILE_SIZE, house.origin_y * TILE_SIZE
-    b_iso, e_iso = to_iso(bx, by), to_iso(ex, ey)
-    
-    wall_pts = [
-        (b_iso[0] + cam_off[0], b_iso[1] + cam_off[1]),
-        (e_iso[0] + cam_off[0], e_iso[1] + cam_off[1]),
-        (e_iso[0] + cam_off[0], e_iso[1] - house.wall_h + cam_off[1]),
-        (b_iso[0] + cam_off[0], b_iso[1] - house.wall_h + cam_off[1])
-    ]
-    pygame.draw.polygon(screen, COLOR_WALL, wall_pts)
-    
-    # 서쪽
-    bx, by = house.origin_x * TILE_SIZE, house.origin_y * TILE_SIZE
-    ex, ey = house.origin_x * TILE_SIZE, (house.origin_y + house.th) * TILE_SIZE
-    b_iso, e_iso = to_iso(bx, by), to_iso(ex, ey)
-    
-    wall_pts = [
-        (b_iso[0] + cam_off[0], b_iso[1] + cam_off[1]),
-        (e_iso[0] + cam_off[0], e_iso[1] + cam_off[1]),
-        (e_iso[0] + cam_off[0], e_iso[1] - house.wall_h + cam_off[1]),
-        (b_iso[0] + cam_off[0], b_iso[1] - house.wall_h + cam_off[1])
-    ]
-    pygame.draw.polygon(screen, COLOR_WALL, wall_pts)
+    for wall_pts in walls.at(cam_off):
+        pygame.draw.polygon(screen, COLOR_WALL, wall_pts)
 
 # --- 메인 ---
 def main():
@@ -525,6 +524,15 @@ def main():
         Zombie(450, 200),
         Zombie(250, 450)
     ]
+    floor = house.get_floor_rect()
+    for _ in range(ZOMBIE_COUNT - len(zombies)):
+        zombies.append(Zombie(random.uniform(floor.left, floor.right - 1), random.uniform(floor.top, floor.bottom - 1)))
+    
+    horde = None
+    if HORDE_BACKEND:
+        horde = Horde()
+        for zombie in zombies:
+            horde.add(zombie)
     
     # 아이템 생성
     items = [
@@ -534,59 +542,88 @@ def main():
         Item(520, 280, "knife")     # 칼
     ]
     
-    font = pygame.font.SysFont('malgungothic', 20)
+    init_fonts()
+    font = get_font(20)
+    profiler = FrameProfiler()
+    quality = QualityGovernor(FPS)
     
     while True:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT: 
-                pygame.quit()
-                return
-            
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                # 좌클릭: 공격
-                if event.button == 1:
-                    survivor.attack(zombies)
+        profiler.begin_frame()
+        quality.begin_frame()
+        with profiler.phase("events"):
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT: 
+                    profiler.close()
+                    pygame.quit()
+                    return
+
+                if profiler.handle_event(event):
+                    continue
                 
-                # 우클릭: 아이템 줍기
-                elif event.button == 3:
-                    if survivor.alive:
-                        for item in items:
-                            if not item.picked and survivor.world_pos.distance_to(item.world_pos) < 40:
-                                survivor.pickup_item(item)
-                                item.picked = True
-                                break
+                if event.type == pygame.MOUSEBUTTONDOWN:
+                    # 좌클릭: 공격
+                    if event.button == 1:
+                        survivor.attack(zombies, horde)
+                    
+                    # 우클릭: 아이템 줍기
+                    elif event.button == 3:
+                        if survivor.alive:
+                            for item in items:
+                                if not item.picked and survivor.world_pos.distance_to(item.world_pos) < 40:
+                                    survivor.pickup_item(item)
+                                    item.picked = True
+                                    break
 
         # 업데이트
-        survivor.update(house, zombies)
-        for zombie in zombies:
-            if survivor.alive:
-                zombie.update(survivor.world_pos, house)
+        with profiler.phase("update"):
+            survivor.update(house, zombies, horde)
+            if horde is not None:
+                if survivor.alive:
+                    horde.step(survivor.world_pos, house.get_floor_rect())
+            else:
+                for zombie in zombies:
+                    if survivor.alive:
+                        zombie.update(survivor.world_pos, house)
         
         # 카메라
         ix, iy = to_iso(survivor.world_pos.x, survivor.world_pos.y)
         cam_off = (WINDOW_WIDTH // 2 - ix, WINDOW_HEIGHT // 2 - iy)
         
         # 렌더링
-        screen.fill(COLOR_BG)
-        render_house(screen, house, cam_off)
-        
-        # 아이템
-        for item in items:
-            item.draw(screen, cam_off)
-        
-        # 캐릭터
-        for zombie in zombies:
-            zombie.draw(screen, cam_off)
-        survivor.draw(screen, cam_off)
-        
-        # UI
-        draw_ui(screen, survivor)
-        
-        # 조작법
-        help_text = font.render("WASD: 이동 | 좌클릭: 공격 | 우클릭: 줍기", True, (255, 255, 255))
-        screen.blit(help_text, (WINDOW_WIDTH - 450, 20))
-        
-        pygame.display.flip()
+        with profiler.phase("house"):
+            screen.fill(COLOR_BG)
+            render_house(screen, house, cam_off, outlines=quality.get("outlines"))
+        
+        with profiler.phase("chars"):
+            # 아이템
+            for item in items:
+                item.draw(screen, cam_off)
+            
+            # 캐릭터 (horde면 화면 안의 좀비만 값을 받아와 그림)
+            if horde is not None:
+                visible = horde.sync_visible(
+                    lambda xs, ys: project_many(xs, ys, cam_off),
+                    (-60, -20, WINDOW_WIDTH + 60, WINDOW_HEIGHT + 80))
+            else:
+                visible = zombies
+            for zombie in visible:
+                zombie.draw(screen, cam_off)
+            survivor.draw(screen, cam_off)
+        
+        with profiler.phase("ui"):
+            # UI
+            draw_ui(screen, survivor)
+            
+            # 조작법
+            help_text = font.render("WASD: 이동 | 좌클릭: 공격 | 우클릭: 줍기", True, (255, 255, 255))
+            screen.blit(help_text, (WINDOW_WIDTH - 450, 20))
+        
+        profiler.count("quality", quality.level)
+        profiler.draw(screen)
+        with profiler.phase("flip"):
+            pygame.display.flip()
+        profiler.end_frame()
+        quality.end_frame()
         clock.tick(FPS)
 
 if __name__ == "__main__":
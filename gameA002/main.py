@@ -1,6 +1,14 @@
 import pygame
 import math
 import random
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.fonts import init_fonts, get_font
+from common.profiler import FrameProfiler
+from common.quality import QualityGovernor, ImpostorCache
+from common.iso import tile_mesh, wall_mesh
 
 pygame.init()
 
@@ -24,9 +32,6 @@ COLOR_HP_BAR = (200, 50, 50)
 COLOR_HP_BG = (80, 30, 30)
 COLOR_TIMER = (255, 200, 100)
 
-def iso_projection(x, y):
-    return (x - y), (x + y) / 2
-
 class FamilyMember:
     def __init__(self, x, y, role, name):
         self.world_pos = pygame.Vector2(x, y)
@@ -254,6 +259,22 @@ class Room:
         self.events = []
         self.puzzles = []
         self.is_completed = False
+        self.meshes = None
+
+    def get_meshes(self, tile_size):
+        """바닥 마름모 / 벽 폴리곤 (iso 공간). 처음 그릴 때 한 번만 계산"""
+        if self.meshes is None:
+            floor = self.floor_area
+            segments = []
+            for wall in self.walls:
+                wx, wy = wall["x"] * tile_size, wall["y"] * tile_size
+                if wall["type"] == "horizontal":
+                    segments.append((wx, wy, wx + wall["w"] * tile_size, wy))
+                else:
+                    segments.append((wx, wy, wx, wy + wall["h"] * tile_size))
+            self.meshes = (tile_mesh(floor["x"], floor["y"], floor["w"], floor["h"], tile_size),
+                           wall_mesh(segments, 40))
+        return self.meshes
 
     def create_walls(self, x, y, w, h):
         walls = [
@@ -272,19 +293,11 @@ class Game:
         self.is_fullscreen = False
         self.cur_w, self.cur_h = WINDOW_WIDTH, WINDOW_HEIGHT
 
-        try:
-            self.font = pygame.font.SysFont('malgungothic', 28)
-            self.font_small = pygame.font.SysFont('malgungothic', 22)
-            self.font_title = pygame.font.SysFont('malgungothic', 48)
-        except:
-            try:
-                self.font = pygame.font.SysFont('nanumgothic', 28)
-                self.font_small = pygame.font.SysFont('nanumgothic', 22)
-                self.font_title = pygame.font.SysFont('nanumgothic', 48)
-            except:
-                self.font = pygame.font.Font(None, 28)
-                self.font_small = pygame.font.Font(None, 22)
-                self.font_title = pygame.font.Font(None, 48)
+        # 한글 폰트 (공용 레지스트리에서 한 번만 탐색)
+        init_fonts()
+        self.font = get_font(28)
+        self.font_small = get_font(22)
+        self.font_title = get_font(48)
 
         self.state = "intro"
         self.current_room_index = 0
@@ -307,6 +320,10 @@ class Game:
         
         self.cam_off = (WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2)
 
+        self.profiler = FrameProfiler()
+        self.quality = QualityGovernor(FPS)
+        self.impostors = ImpostorCache()
+
     def create_rooms(self):
         return [
             Room("현관", 5, 5, 6, 5, next_room=1),
@@ -329,51 +346,51 @@ class Game:
     def create_dialogs(self):
         return {
             0: [
-                ("엄마", "오늘 할머니 댁에 가야지. 오래 만났으니까"},
-                ("아빠", "그래, 오래간만이야. 서두르자"},
-                ("딸", "할머니 댁! 재밌겠다~"},
+                ("엄마", "오늘 할머니 댁에 가야지. 오래 만났으니까"),
+                ("아빠", "그래, 오래간만이야. 서두르자"),
+                ("딸", "할머니 댁! 재밌겠다~"),
                 ("강아지", "멍! (신나!)"),
                 ("시스템", "방향키로 이동하세요. TAB으로 캐릭터 변경"),
             ],
             1: [
-                ("아빠", "와, 이 미술관 정말 크다..."},
-                ("엄마", "할머니 댁이 여기서 멀지 않아. 서두르자"},
-                ("딸", "저기 뭐가 있는지 내가 먼저 볼게!"},
+                ("아빠", "와, 이 미술관 정말 크다..."),
+                ("엄마", "할머니 댁이 여기서 멀지 않아. 서두르자"),
+                ("딸", "저기 뭐가 있는지 내가 먼저 볼게!"),
             ],
             2: [
-                ("딸", "엄마, 저기 고미술관이 보여!"},
-                ("아빠", "좋아. 따라와"},
+                ("딸", "엄마, 저기 고미술관이 보여!"),
+                ("아빠", "좋아. 따라와"),
                 ("시스템", "강아지가 무언가를 발견했습니다! SPACE로 확인"),
             ],
             3: [
-                ("아빠", "이 전시물들... 정말 아름답다"},
-                ("엄마", "아..., 아빠!"},
-                ("아빠", "괜찮아... 살짝 다쳤을 뿐이야"},
-                ("시스템", "아빠가 다쳤습니다! 엄마의 치료가 필요합니다"},
+                ("아빠", "이 전시물들... 정말 아름답다"),
+                ("엄마", "아..., 아빠!"),
+                ("아빠", "괜찮아... 살짝 다쳤을 뿐이야"),
+                ("시스템", "아빠가 다쳤습니다! 엄마의 치료가 필요합니다"),
             ],
             4: [
-                ("엄마", "아빠, 괜찮아? 많이 다쳤어..."},
-                ("아빠", "괜찮아... 딸이랑 엄마가 잘 따라와"},
-                ("딸", "아빠! 힘내!"},
+                ("엄마", "아빠, 괜찮아? 많이 다쳤어..."),
+                ("아빠", "괜찮아... 딸이랑 엄마가 잘 따라와"),
+                ("딸", "아빠! 힘내!"),
                 ("강아지", "멍... (걱정)"),
             ],
             5: [
-                ("아빠", "거의 다 왔어...!"},
-                ("엄마", "아빠는 여기서 기다려. 내가 먼저 가서 할머니를 모실게"},
-                ("아빠", "미안... 내가 먼저 가야 했는데..."},
-                ("딸", "아빠는 여기서 쉴 거야. 우리 곧 올게"},
+                ("아빠", "거의 다 왔어...!"),
+                ("엄마", "아빠는 여기서 기다려. 내가 먼저 가서 할머니를 모실게"),
+                ("아빠", "미안... 내가 먼저 가야 했는데..."),
+                ("딸", "아빠는 여기서 쉴 거야. 우리 곧 올게"),
             ],
             "ending_good": [
-                ("시스템", "가족이 할머니 댁에 도착했습니다..."},
-                ("엄마", "와, 할머니!"},
-                ("할머니", "와, 우리 가족! 오래간만이야"},
-                ("딸", "할머니~!"},
-                ("시스템", "하지만 아빠는 병원에서 쉬고 있습니다..."},
+                ("시스템", "가족이 할머니 댁에 도착했습니다..."),
+                ("엄마", "와, 할머니!"),
+                ("할머니", "와, 우리 가족! 오래간만이야"),
+                ("딸", "할머니~!"),
+                ("시스템", "하지만 아빠는 병원에서 쉬고 있습니다..."),
             ],
             "ending_sad": [
-                ("시스템", "아빠는 도착하지 못했습니다..."},
-                ("엄마", "아빠는... 우리를 위해..."},
-                ("딸", "아빠는 어디야...?"},
+                ("시스템", "아빠는 도착하지 못했습니다..."),
+                ("엄마", "아빠는... 우리를 위해..."),
+                ("딸", "아빠는 어디야...?"),
                 ("시스템", "아빠는 그 길을 떠나갔습니다."),
             ],
         }
@@ -384,6 +401,9 @@ class Game:
                 pygame.quit()
                 return False
 
+            if self.profiler.handle_event(event):
+                continue
+
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_f:
                     self.is_fullscreen = not self.is_fullscreen
@@ -517,62 +537,27 @@ class Game:
                         self.state = "dialog"
 
     def draw_room(self, room):
-        floor = room.floor_area
-        for tx in range(floor["w"]):
-            for ty in range(floor["h"]):
-                x = (floor["x"] + tx) * TILE_SIZE
-                y = (floor["y"] + ty) * TILE_SIZE
-
-                iso_x = x - y
-                iso_y = (x + y) / 2
-
-                pts = [
-                    (iso_x + self.cam_off[0], iso_y + self.cam_off[1]),
-                    (iso_x + TILE_SIZE + self.cam_off[0], iso_y + TILE_SIZE/2 + self.cam_off[1]),
-                    (iso_x + self.cam_off[0], iso_y + TILE_SIZE + self.cam_off[1]),
-                    (iso_x - TILE_SIZE + self.cam_off[0], iso_y + TILE_SIZE/2 + self.cam_off[1])
-                ]
-
-                pygame.draw.polygon(self.screen, COLOR_FLOOR, pts)
+        # 품질 조절: 바닥 격자선 / 벽 테두리(이 렌더러의 벽 윗면 대신)
+        outlines = self.quality.get("outlines")
+        wall_tops = self.quality.get("wall_tops")
+        floor_mesh, walls = room.get_meshes(TILE_SIZE)
+        for pts in floor_mesh.at(self.cam_off):
+            pygame.draw.polygon(self.screen, COLOR_FLOOR, pts)
+            if outlines:
                 pygame.draw.polygon(self.screen, (180, 180, 180), pts, 1)
 
-        for wall in room.walls:
-            wx = wall["x"] * TILE_SIZE
-            wy = wall["y"] * TILE_SIZE
-
-            if wall["type"] == "horizontal":
-                ww = wall["w"] * TILE_SIZE
-                start_x = wx - wy
-                start_y = (wx + wy) / 2
-                end_x = (wx + ww) - wy
-                end_y = (wx + ww + wy) / 2
-
-                wall_height = 40
-                wall_pts = [
-                    (start_x + self.cam_off[0], start_y + self.cam_off[1]),
-                    (end_x + self.cam_off[0], end_y + self.cam_off[1]),
-                    (end_x + self.cam_off[0], end_y + wall_height + self.cam_off[1]),
-                    (start_x + self.cam_off[0], start_y + wall_height + self.cam_off[1])
-                ]
-                pygame.draw.polygon(self.screen, COLOR_WALL, wall_pts)
+        for wall_pts in walls.at(self.cam_off):
+            pygame.draw.polygon(self.screen, COLOR_WALL, wall_pts)
+            if wall_tops:
                 pygame.draw.polygon(self.screen, (80, 70, 60), wall_pts, 2)
 
-            elif wall["type"] == "vertical":
-                wh = wall["h"] * TILE_SIZE
-                start_x = wx - wy
-                start_y = (wx + wy) / 2
-                end_x = wx - (wy + wh)
-                end_y = (wx + wy + wh) / 2
-
-                wall_height = 40
-                wall_pts = [
-                    (start_x + self.cam_off[0], start_y + self.cam_off[1]),
-                    (end_x + self.cam_off[0], end_y + self.cam_off[1]),
-                    (end_x + self.cam_off[0], end_y + wall_height + self.cam_off[1]),
-                    (start_x + self.cam_off[0], start_y + wall_height + self.cam_off[1])
-                ]
-                pygame.draw.polygon(self.screen, COLOR_WALL, wall_pts)
-                pygame.draw.polygon(self.screen, (80, 70, 60), wall_pts, 2)
+    def draw_family(self):
+        # 느릴 때는 캐시한 임포스터로 (조종 중 표시는 모습이 달라서 키에 넣음)
+        for member in self.family:
+            if self.quality.get("impostors"):
+                self.impostors.draw(self.screen, member, self.cam_off, member.is_controlled)
+            else:
+                member.draw(self.screen, self.cam_off)
 
     def draw_ui(self):
         pygame.draw.rect(self.screen, (20, 20, 25), (0, 0, self.cur_w, 50))
@@ -724,40 +709,36 @@ class Game:
 
     def draw(self):
         self.screen.fill(COLOR_OUTSIDE)
+        profiler = self.profiler
 
         if self.state == "intro":
             self.draw_intro()
-        elif self.state == "playing":
-            self.draw_room(self.rooms[self.current_room_index])
+        elif self.state in ("playing", "dialog"):
+            with profiler.phase("room"):
+                self.draw_room(self.rooms[self.current_room_index])
 
-            for member in self.family:
-                member.draw(self.screen, self.cam_off)
+            with profiler.phase("chars"):
+                self.draw_family()
 
-            self.draw_ui()
-            self.draw_dialog()
-        elif self.state == "dialog":
-            self.draw_room(self.rooms[self.current_room_index])
-
-            for member in self.family:
-                member.draw(self.screen, self.cam_off)
-
-            self.draw_ui()
-            self.draw_dialog()
+            with profiler.phase("ui"):
+                self.draw_ui()
+                self.draw_dialog()
         elif self.state == "ending":
             self.draw_ending()
         elif self.state == "game_over":
             self.draw_room(self.rooms[self.current_room_index])
-            for member in self.family:
-                member.draw(self.screen, self.cam_off)
+            self.draw_family()
             self.draw_game_over()
         elif self.state == "paused":
             self.draw_room(self.rooms[self.current_room_index])
-            for member in self.family:
-                member.draw(self.screen, self.cam_off)
+            self.draw_family()
             self.draw_ui()
             self.draw_paused()
 
-        pygame.display.flip()
+        profiler.count("quality", self.quality.level)
+        profiler.draw(self.screen, pos=(10, 60))
+        with profiler.phase("flip"):
+            pygame.display.flip()
 
     def start_intro(self):
         self.current_dialog = self.dialogs[0]
@@ -769,11 +750,19 @@ class Game:
 
         running = True
         while running:
-            running = self.handle_events()
-            self.update()
-            self.draw()
-            self.clock.tick(FPS)
-
+            self.profiler.begin_frame()
+            self.quality.begin_frame()
+            with self.profiler.phase("events"):
+                running = self.handle_events()
+            if running:
+                with self.profiler.phase("update"):
+                    self.update()
+                self.draw()
+                self.profiler.end_frame()
+                self.quality.end_frame()
+                self.clock.tick(FPS)
+
+        self.profiler.close()
         pygame.quit()
 
 if __name__ == "__main__":
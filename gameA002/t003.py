@@ -1,6 +1,20 @@
 import pygame
 import math
 import random
+import re
+import queue
+import threading
+import os
+import sys
+import json
+import time
+from collections import OrderedDict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common.fonts import init_fonts, get_font
+from common.profiler import FrameProfiler
+from common.iso import screen_to_world, tile_mesh
+from common.poses import PoseCache
 
 pygame.init()
 
@@ -11,6 +25,37 @@ FULLSCREEN_WIDTH, FULLSCREEN_HEIGHT = info.current_w, info.current_h
 FPS = 60
 TILE_SIZE = 40
 
+# 고정 틱 시뮬레이션: 이동 속도·체력 감소(300틱)·max_time은 모두 틱 단위
+# 그리기는 RENDER_FPS까지 따로 돌고, 틱 사이 위치는 보간. 한 프레임에 따라잡는 틱은 MAX_CATCHUP_TICKS까지
+TICK_RATE = FPS
+RENDER_FPS = 144
+MAX_CATCHUP_TICKS = 5
+
+# 바닥 청크 캐시: 청크 한 변의 타일 수 / 청크 표면 여백 / 메모리 예산(바이트)
+FLOOR_CHUNK_TILES = 16
+FLOOR_CHUNK_PAD = 50
+FLOOR_CACHE_BUDGET = 48 * 1024 * 1024
+
+# 현재 방을 이 비율만큼 지나가면 다음 방을 작업 스레드에서 미리 굽는다
+PREFETCH_FRACTION = 0.6
+
+# 캐릭터 포즈 캐시 (common/poses.py): 걷기 위상 수 / 셀 크기 / 셀 안에서 발 위치(기준점)
+POSE_PHASES = 8
+POSE_CELL_W, POSE_CELL_H = 64, 104
+POSE_ANCHOR = (32, 92)
+POSES_LAZY = True
+
+# 텍스트 표면 캐시 최대 개수 (LRU)
+TEXT_CACHE_SIZE = 256
+
+# 정적인 화면(인트로/일시정지/게임오버/엔딩)은 바뀐 영역만 display.update
+DIRTY_RECT_MODE = True
+STATIC_STATES = ("intro", "paused", "game_over", "ending")
+
+# 헤드리스 시뮬레이션: 대화 상태에서 자동으로 넘길지 / 기본 최대 틱 수
+HEADLESS_AUTO_DIALOG = True
+HEADLESS_MAX_TICKS = 1080000 + 10000
+
 COLOR_WALL = (120, 100, 80)
 COLOR_FLOOR = (230, 220, 200)
 COLOR_OUTSIDE = (173, 216, 230)
@@ -24,12 +69,10 @@ COLOR_HP_BAR = (200, 50, 50)
 COLOR_HP_BG = (80, 30, 30)
 COLOR_TIMER = (255, 200, 100)
 
-def iso_projection(x, y):
-    return (x - y), (x + y) / 2
-
 class FamilyMember:
     def __init__(self, x, y, role, name):
         self.world_pos = pygame.Vector2(x, y)
+        self.prev_pos = self.world_pos.copy()   # 직전 틱 위치 (그리기 보간용)
         self.look_dir = pygame.Vector2(0, 1)
         self.walk_count = 0
         self.role = role
@@ -93,8 +136,9 @@ class FamilyMember:
             self.ability_name = "발견"
             self.ability_desc = "숨겨진 물건을 찾고 위험을 미리 알려줌"
 
-    def update(self, target_pos=None, room=None):
-        if not pygame.display.get_init():
+    def update(self, target_pos=None, room=None, keys=None):
+        # keys를 넘기면(헤드리스/재생) 디스플레이 없이도 움직임
+        if keys is None and not pygame.display.get_init():
             return
         
         old_pos = self.world_pos.copy()
@@ -103,7 +147,8 @@ class FamilyMember:
             if not self.is_controlled:
                 return
 
-            keys = pygame.key.get_pressed()
+            if keys is None:
+                keys = pygame.key.get_pressed()
             screen_move = pygame.Vector2(0, 0)
             if keys[pygame.K_w]: screen_move.y -= 1
             if keys[pygame.K_s]: screen_move.y += 1
@@ -140,17 +185,26 @@ class FamilyMember:
                     min_y + margin <= self.world_pos.y <= max_y - margin):
                 self.world_pos = old_pos
 
-    def draw(self, surface, cam_off):
-        iso_p = (self.world_pos.x - self.world_pos.y, (self.world_pos.x + self.world_pos.y) / 2)
+    def draw(self, surface, cam_off, pos=None):
+        """pos: 그릴 위치 (틱 사이 보간한 값). 없으면 world_pos"""
+        if pos is None:
+            pos = self.world_pos
+        iso_p = (pos.x - pos.y, (pos.x + pos.y) / 2)
         cx, cy = iso_p[0] + cam_off[0], iso_p[1] + cam_off[1]
 
+        if POSES is not None:
+            POSES.draw(surface, self, cx, cy)
+        else:
+            self.draw_pose(surface, cx, cy)
+
+    def draw_pose(self, surface, cx, cy):
+        """pygame.draw로 직접 그리기 (아틀라스 굽기에도 사용). 머리 y 좌표를 돌려줌"""
         swing = math.sin(self.walk_count) * (self.limb_len / 3)
         bobbing = abs(math.sin(self.walk_count)) * 2
 
         if self.role == "dog":
-            self.draw_dog(surface, cx, cy, swing, bobbing)
-        else:
-            self.draw_human(surface, cx, cy, swing, bobbing)
+            return self.draw_dog(surface, cx, cy, swing, bobbing)
+        return self.draw_human(surface, cx, cy, swing, bobbing)
 
     def draw_human(self, surface, cx, cy, swing, bobbing):
         pelvis_y = cy - self.limb_len
@@ -222,6 +276,8 @@ class FamilyMember:
         if self.is_controlled:
             pygame.draw.circle(surface, (255, 255, 0), (int(cx), int(head_y - self.head_r - 10)), 4)
 
+        return head_y
+
     def draw_dog(self, surface, cx, cy, swing, bobbing):
         body_y = cy - self.limb_len - bobbing
         body_w = self.body_w + 4
@@ -261,6 +317,89 @@ class FamilyMember:
         if self.is_controlled:
             pygame.draw.circle(surface, (255, 255, 0), (int(cx), int(head_y - self.head_r - 10)), 4)
 
+        return head_y
+
+def render_pose(member, cell, ax, ay):
+    """포즈 셀에 그리고 발 기준 머리 높이를 돌려줌 (조종 중 표시 위치용)"""
+    return member.draw_pose(cell, ax, ay) - ay
+
+
+class MemberPoses(PoseCache):
+    """역할 × 방향(8) × 걷기 위상(POSE_PHASES) 포즈를 미리 그려두고 draw는 blit 한 번만 한다.
+    조종 중 표시는 포즈와 따로 찍으므로 같은 역할이면 몇 명이든 같은 셀을 공유."""
+
+    def __init__(self, lazy=POSES_LAZY):
+        super().__init__(render_pose, (POSE_CELL_W, POSE_CELL_H), POSE_ANCHOR, phases=POSE_PHASES,
+                         neutral={"is_controlled": False})
+        self.lazy = lazy
+        self.marker = pygame.Surface((9, 9), pygame.SRCALPHA)
+        pygame.draw.circle(self.marker, (255, 255, 0), (4, 4), 4)
+
+    def draw(self, surface, member, cx, cy):
+        key = super().draw(surface, member, cx, cy)
+        if member.is_controlled:
+            marker_y = int(cy) + self.info[key] - member.head_r - 10
+            surface.blit(self.marker, (int(cx) - 4, int(marker_y) - 4))
+        return key
+
+POSES = MemberPoses()
+
+class TextCache:
+    """(폰트, 문자열, 색, 안티앨리어싱) → 렌더된 Surface LRU 캐시.
+
+    고정 문자열은 통째로 캐시하고, 숫자가 섞인 줄(타이머, 개수)은
+    숫자가 아닌 조각만 캐시한 뒤 숫자는 글리프 아틀라스에서 한 자씩 찍는다."""
+
+    DIGITS = "0123456789"
+
+    def __init__(self, max_entries=TEXT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.surfaces = OrderedDict()
+        self.digit_atlas = {}
+
+    def render(self, font, text, antialias, color):
+        key = (font, text, tuple(color), antialias)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = font.render(text, antialias, color)
+            self.surfaces[key] = surface
+            if len(self.surfaces) > self.max_entries:
+                self.surfaces.popitem(last=False)
+        else:
+            self.surfaces.move_to_end(key)
+        return surface
+
+    def get_digits(self, font, color, antialias):
+        """0~9를 한 줄로 렌더한 아틀라스와 글자별 소스 사각형"""
+        key = (font, tuple(color), antialias)
+        entry = self.digit_atlas.get(key)
+        if entry is None:
+            surface = font.render(self.DIGITS, antialias, color)
+            rects = {}
+            for i, ch in enumerate(self.DIGITS):
+                x0 = font.size(self.DIGITS[:i])[0]
+                x1 = font.size(self.DIGITS[:i + 1])[0]
+                rects[ch] = pygame.Rect(x0, 0, x1 - x0, surface.get_height())
+            entry = (surface, rects)
+            self.digit_atlas[key] = entry
+        return entry
+
+    def blit_line(self, surface, font, text, color, pos, antialias=True):
+        """text를 pos(좌상단)에 그림. 숫자는 글리프 단위로, 나머지는 캐시된 조각으로."""
+        x, y = pos
+        for i, part in enumerate(re.split(r"(\d+)", text)):
+            if not part:
+                continue
+            if i % 2 == 0:
+                piece = self.render(font, part, antialias, color)
+                surface.blit(piece, (x, y))
+                x += piece.get_width()
+            else:
+                digits, rects = self.get_digits(font, color, antialias)
+                for ch in part:
+                    surface.blit(digits, (x, y), rects[ch])
+                    x += rects[ch].width
+
 class Room:
     def __init__(self, name, x, y, w, h, is_transition=False, next_room=None, theme_colors=None):
         self.name = name
@@ -271,7 +410,7 @@ class Room:
         self.events = []
         self.puzzles = []
         self.is_completed = False
-        self.rendered_surface = None
+        self.chunk_cache = None
         self.theme_colors = theme_colors or {"floor": (230, 220, 200), "floor_border": (200, 200, 190), "wall": (120, 100, 80), "wall_border": (100, 80, 60)}
 
     def create_walls(self, x, y, w, h):
@@ -284,87 +423,299 @@ class Room:
         return walls
 
     def pre_render(self, tile_size):
-        floor = self.floor_area
-        surf_w = (floor["w"] + floor["h"]) * tile_size + 100
-        surf_h = (floor["w"] + floor["h"]) * tile_size // 2 + 100
-        self.rendered_surface = pygame.Surface((int(surf_w), int(surf_h)), pygame.SRCALPHA)
-
-        for tx in range(floor["w"]):
-            for ty in range(floor["h"]):
-                x = (floor["x"] + tx) * tile_size
-                y = (floor["y"] + ty) * tile_size
-                iso_x = x - y
-                iso_y = (x + y) / 2
-                pts = [
-                    (iso_x + 50, iso_y + 50),
-                    (iso_x + tile_size + 50, iso_y + tile_size/2 + 50),
-                    (iso_x + 50, iso_y + tile_size + 50),
-                    (iso_x - tile_size + 50, iso_y + tile_size/2 + 50)
-                ]
-                pygame.draw.polygon(self.rendered_surface, self.theme_colors["floor"], pts)
-                pygame.draw.polygon(self.rendered_surface, self.theme_colors["floor_border"], pts, 1)
-
-        for wall in self.walls:
-            wx = wall["x"] * tile_size
-            wy = wall["y"] * tile_size
-            if wall["type"] == "horizontal":
-                ww = wall["w"] * tile_size
-                start_x = wx - wy
-                start_y = (wx + wy) / 2
-                end_x = (wx + ww) - wy
-                end_y = (wx + ww + wy) / 2
-                wall_height = 40
-                wall_pts = [
-                    (start_x + 50, start_y + 50),
-                    (end_x + 50, end_y + 50),
-                    (end_x + 50, end_y + wall_height + 50),
-                    (start_x + 50, start_y + wall_height + 50)
-                ]
-                pygame.draw.polygon(self.rendered_surface, self.theme_colors["wall"], wall_pts)
-                pygame.draw.polygon(self.rendered_surface, self.theme_colors["wall_border"], wall_pts, 2)
-            elif wall["type"] == "vertical":
-                wh = wall["h"] * tile_size
-                start_x = wx - wy
-                start_y = (wx + wy) / 2
-                end_x = wx - (wy + wh)
-                end_y = (wx + wy + wh) / 2
-                wall_height = 40
-                wall_pts = [
-                    (start_x + 50, start_y + 50),
-                    (end_x + 50, end_y + 50),
-                    (end_x + 50, end_y + wall_height + 50),
-                    (start_x + 50, start_y + wall_height + 50)
-                ]
-                pygame.draw.polygon(self.rendered_surface, self.theme_colors["wall"], wall_pts)
-                pygame.draw.polygon(self.rendered_surface, self.theme_colors["wall_border"], wall_pts, 2)
+        # 방 전체를 한 장으로 굽지 않고, 화면에 들어오는 청크만 그때그때 굽는다
+        self.chunk_cache = FloorChunkCache(self, tile_size)
+
+    def release(self):
+        """방을 떠날 때 구워둔 청크 표면을 모두 해제"""
+        if self.chunk_cache is not None:
+            self.chunk_cache.clear()
+
+    def get_wall_points(self, wall, tile_size):
+        """벽 하나의 iso 폴리곤 (카메라 오프셋 미적용)"""
+        wx = wall["x"] * tile_size
+        wy = wall["y"] * tile_size
+        wall_height = 40
+        start_x = wx - wy
+        start_y = (wx + wy) / 2
+        if wall["type"] == "horizontal":
+            ww = wall["w"] * tile_size
+            end_x = (wx + ww) - wy
+            end_y = (wx + ww + wy) / 2
+        else:
+            wh = wall["h"] * tile_size
+            end_x = wx - (wy + wh)
+            end_y = (wx + wy + wh) / 2
+        return [
+            (start_x, start_y),
+            (end_x, end_y),
+            (end_x, end_y + wall_height),
+            (start_x, start_y + wall_height)
+        ]
+
+class FloorChunkCache:
+    """방 바닥/벽을 FLOOR_CHUNK_TILES x FLOOR_CHUNK_TILES 타일 청크로 나눠 굽는 LRU 캐시.
+
+    청크는 카메라 시야에 처음 들어올 때 굽고, 메모리 예산을 넘으면
+    이번 프레임에 보이지 않은 청크부터 버린다."""
+
+    def __init__(self, room, tile_size, chunk_tiles=FLOOR_CHUNK_TILES, budget=FLOOR_CACHE_BUDGET):
+        self.room = room
+        self.tile_size = tile_size
+        self.chunk_tiles = chunk_tiles
+        self.budget = budget
+        self.chunks = OrderedDict()
+        self.used_bytes = 0
+
+        floor = room.floor_area
+        self.chunks_w = (floor["w"] + chunk_tiles - 1) // chunk_tiles
+        self.chunks_h = (floor["h"] + chunk_tiles - 1) // chunk_tiles
+        self.wall_pts = [room.get_wall_points(wall, tile_size) for wall in room.walls]
+
+    def chunk_rect(self, key):
+        """청크 표면이 차지하는 iso 공간 사각형 (여백 포함)"""
+        ctx, cty = key
+        floor = self.room.floor_area
+        ts = self.tile_size
+        tx0 = ctx * self.chunk_tiles
+        ty0 = cty * self.chunk_tiles
+        nw = min(self.chunk_tiles, floor["w"] - tx0)
+        nh = min(self.chunk_tiles, floor["h"] - ty0)
+        wx0 = (floor["x"] + tx0) * ts
+        wy0 = (floor["y"] + ty0) * ts
+        left = (wx0 - wy0) - nh * ts - FLOOR_CHUNK_PAD
+        top = (wx0 + wy0) // 2 - FLOOR_CHUNK_PAD
+        return pygame.Rect(left, top, (nw + nh) * ts + FLOOR_CHUNK_PAD * 2,
+                           (nw + nh) * ts // 2 + FLOOR_CHUNK_PAD * 2)
+
+    def bake_chunk(self, key):
+        ctx, cty = key
+        floor = self.room.floor_area
+        colors = self.room.theme_colors
+        ts = self.tile_size
+        rect = self.chunk_rect(key)
+        surface = pygame.Surface(rect.size, pygame.SRCALPHA)
+
+        tx0 = ctx * self.chunk_tiles
+        ty0 = cty * self.chunk_tiles
+        nw = min(self.chunk_tiles, floor["w"] - tx0)
+        nh = min(self.chunk_tiles, floor["h"] - ty0)
+        tiles = tile_mesh(floor["x"] + tx0, floor["y"] + ty0, nw, nh, ts)
+        for pts in tiles.at((-rect.x, -rect.y)):
+            pygame.draw.polygon(surface, colors["floor"], pts)
+            pygame.draw.polygon(surface, colors["floor_border"], pts, 1)
+
+        # 벽은 겹치는 모든 청크에 그려야 청크 경계에서 바닥에 덮이지 않는다
+        for wall_pts in self.wall_pts:
+            xs = [p[0] for p in wall_pts]
+            ys = [p[1] for p in wall_pts]
+            wall_rect = pygame.Rect(min(xs) - 2, min(ys) - 2, max(xs) - min(xs) + 4, max(ys) - min(ys) + 4)
+            if not wall_rect.colliderect(rect):
+                continue
+            pts = [(p[0] - rect.x, p[1] - rect.y) for p in wall_pts]
+            pygame.draw.polygon(surface, colors["wall"], pts)
+            pygame.draw.polygon(surface, colors["wall_border"], pts, 2)
+
+        return surface
+
+    def get_chunk(self, key):
+        surface = self.chunks.get(key)
+        if surface is None:
+            surface = self.bake_chunk(key)
+            self.insert_chunk(key, surface)
+        else:
+            self.chunks.move_to_end(key)
+        return surface
+
+    def insert_chunk(self, key, surface):
+        self.chunks[key] = surface
+        self.used_bytes += surface.get_width() * surface.get_height() * 4
+
+    def visible_chunks(self, cam_off, screen_w, screen_h):
+        """화면과 겹치는 청크 키 목록. 화면 모서리를 역투영해서 후보 범위만 검사한다."""
+        pad = FLOOR_CHUNK_PAD
+        corners = [(-pad, -pad), (screen_w + pad, -pad), (-pad, screen_h + pad), (screen_w + pad, screen_h + pad)]
+        world = [screen_to_world(sx, sy, cam_off) for sx, sy in corners]
+
+        floor = self.room.floor_area
+        span = self.chunk_tiles * self.tile_size
+        ctx_min = max(0, int((min(p[0] for p in world) - floor["x"] * self.tile_size) // span))
+        ctx_max = min(self.chunks_w - 1, int((max(p[0] for p in world) - floor["x"] * self.tile_size) // span))
+        cty_min = max(0, int((min(p[1] for p in world) - floor["y"] * self.tile_size) // span))
+        cty_max = min(self.chunks_h - 1, int((max(p[1] for p in world) - floor["y"] * self.tile_size) // span))
+
+        screen_rect = pygame.Rect(-cam_off[0], -cam_off[1], screen_w, screen_h)
+        keys = []
+        for cty in range(cty_min, cty_max + 1):
+            for ctx in range(ctx_min, ctx_max + 1):
+                if self.chunk_rect((ctx, cty)).colliderect(screen_rect):
+                    keys.append((ctx, cty))
+        return keys
+
+    def draw(self, surface, cam_off):
+        keys = self.visible_chunks(cam_off, surface.get_width(), surface.get_height())
+        for key in keys:
+            rect = self.chunk_rect(key)
+            surface.blit(self.get_chunk(key), (rect.x + cam_off[0], rect.y + cam_off[1]))
+        self.evict(set(keys))
+
+    def evict(self, keep=()):
+        """예산을 넘으면 오래 안 쓴 청크부터 해제 (이번 프레임에 보인 청크는 유지)"""
+        for key in list(self.chunks):
+            if self.used_bytes <= self.budget:
+                break
+            if key in keep:
+                continue
+            surface = self.chunks.pop(key)
+            self.used_bytes -= surface.get_width() * surface.get_height() * 4
+
+    def clear(self):
+        self.chunks.clear()
+        self.used_bytes = 0
+
+class RoomPrefetcher:
+    """다음 방의 시작 지점 청크를 작업 스레드에서 미리 굽는다.
+
+    작업 스레드는 화면과 무관한 Surface에 그려서 큐로 넘기기만 하고,
+    캐시에 넣는 건 항상 메인 루프(collect)에서 한다."""
 
-class Game:
     def __init__(self):
-        self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
-        pygame.display.set_caption("그리운 집으로 - 가족 여정")
-        self.clock = pygame.time.Clock()
+        self.results = queue.Queue()
+        self.thread = None
+        self.cancel_event = threading.Event()
+        self.room_index = None
+
+    def start(self, room_index, room, keys):
+        if self.room_index == room_index:
+            return
+        self.cancel()
+        if room.chunk_cache is None:
+            room.pre_render(TILE_SIZE)
+        self.room_index = room_index
+        self.cancel_event = threading.Event()
+        self.thread = threading.Thread(target=self.work,
+                                       args=(room_index, room.chunk_cache, keys, self.cancel_event),
+                                       daemon=True)
+        self.thread.start()
+
+    def work(self, room_index, cache, keys, cancel_event):
+        for key in keys:
+            if cancel_event.is_set():
+                return
+            self.results.put((room_index, key, cache.bake_chunk(key)))
+
+    def collect(self, rooms, active_index):
+        """작업 스레드가 구운 청크를 캐시에 넣음 (메인 루프에서만 호출)"""
+        while True:
+            try:
+                room_index, key, surface = self.results.get_nowait()
+            except queue.Empty:
+                return
+            if room_index not in (self.room_index, active_index):
+                continue
+            cache = rooms[room_index].chunk_cache
+            if cache is not None and key not in cache.chunks:
+                cache.insert_chunk(key, surface)
+
+    def finish(self, rooms, room_index, keys):
+        """플레이어가 작업보다 먼저 도착하면 남은 청크를 동기로 마저 굽는다"""
+        self.cancel()
+        self.collect(rooms, room_index)
+        room = rooms[room_index]
+        if room.chunk_cache is None:
+            room.pre_render(TILE_SIZE)
+        for key in keys:
+            room.chunk_cache.get_chunk(key)
+
+    def cancel(self):
+        self.cancel_event.set()
+        self.room_index = None
+
+class HeldKeys(frozenset):
+    """pygame.key.get_pressed()처럼 keys[pygame.K_w]로 조회되는 눌린 키 집합"""
+    __getitem__ = frozenset.__contains__
+
+
+class InputScript:
+    """틱별 키 입력 기록. 바뀐 틱에만 (누르고 있는 키, 이번 틱에 누른 키)를 저장"""
+    def __init__(self, changes=None, seed=None):
+        self.seed = seed
+        self.changes = {}
+        for tick, held, taps in changes or []:
+            self.changes[tick] = (HeldKeys(held), tuple(taps))
+        self.ticks = sorted(self.changes)
+        self.held = HeldKeys()
+        self.pos = 0
+
+    def record(self, tick, held, taps):
+        held = HeldKeys(held)
+        if taps or held != self.held:
+            self.changes[tick] = (held, tuple(taps))
+            self.ticks.append(tick)
+        self.held = held
+
+    def rewind(self):
+        self.held = HeldKeys()
+        self.pos = 0
+
+    def step(self, tick):
+        """tick 시점에 누르고 있는 키와 새로 누른 키 목록"""
+        taps = ()
+        if self.pos < len(self.ticks) and self.ticks[self.pos] == tick:
+            self.held, taps = self.changes[tick]
+            self.pos += 1
+        return self.held, taps
+
+    def save(self, path):
+        changes = [[t, sorted(self.changes[t][0]), list(self.changes[t][1])] for t in self.ticks]
+        with open(path, "w") as f:
+            json.dump({"seed": self.seed, "changes": changes}, f)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            data = json.load(f)
+        return cls(data["changes"], data["seed"])
+
+    @classmethod
+    def random_walk(cls, seed, ticks, tap_rate=0.002):
+        """오른쪽 아래(월드 +x)로 걸으면서 가끔 TAB/SPACE를 누르는 밸런싱용 입력"""
+        rng = random.Random(seed)
+        walk = (pygame.K_s, pygame.K_d)
+        changes = [(0, walk, ())]
+        for tick in range(1, ticks):
+            if rng.random() < tap_rate:
+                changes.append((tick, walk, (rng.choice((pygame.K_TAB, pygame.K_SPACE)),)))
+        return cls(changes)
+
+
+class Game:
+    def __init__(self, headless=False, seed=None):
+        self.headless = headless
+        self.seed = seed
+        self.rng = random.Random(seed)
         self.is_fullscreen = False
         self.cur_w, self.cur_h = WINDOW_WIDTH, WINDOW_HEIGHT
+        self.recording = getattr(self, "recording", None)
+        self.profiler = getattr(self, "profiler", None) or FrameProfiler()
 
-        # ✅ 한글 폰트
-        try:
-            self.font = pygame.font.SysFont('malgungothic', 28)
-            self.font_small = pygame.font.SysFont('malgungothic', 22)
-            self.font_title = pygame.font.SysFont('malgungothic', 48)
-        except:
-            try:
-                self.font = pygame.font.SysFont('nanumgothic', 28)
-                self.font_small = pygame.font.SysFont('nanumgothic', 22)
-                self.font_title = pygame.font.SysFont('nanumgothic', 48)
-            except:
-                self.font = pygame.font.Font(None, 28)
-                self.font_small = pygame.font.Font(None, 22)
-                self.font_title = pygame.font.Font(None, 48)
+        if not headless:
+            self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+            pygame.display.set_caption("그리운 집으로 - 가족 여정")
+            self.clock = pygame.time.Clock()
+
+            # ✅ 한글 폰트 (공용 레지스트리에서 한 번만 탐색)
+            init_fonts()
+            self.font = get_font(28)
+            self.font_small = get_font(22)
+            self.font_title = get_font(48)
 
         self.state = "intro"
         self.current_room_index = 0
         self.rooms = self.create_rooms()
         self.family = self.create_family()
+        if not headless and not POSES.lazy:
+            POSES.bake_all(self.family)
         self.current_member = 0
         self.story_progress = 0
         self.game_time = 0
@@ -381,6 +732,17 @@ class Game:
         self.required_items = 3
         
         self.cam_off = (WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2)
+        self.text_cache = TextCache()
+        self.overlays = {}
+        self.dirty_rect_mode = DIRTY_RECT_MODE
+        self.static_bg = None
+        self.static_bg_key = None
+        self.static_dialog_key = None
+
+        self.prefetch_fraction = PREFETCH_FRACTION
+        if hasattr(self, "prefetcher"):
+            self.prefetcher.cancel()
+        self.prefetcher = RoomPrefetcher()
 
     def create_rooms(self):
         return [
@@ -466,54 +828,73 @@ class Game:
                 pygame.quit()
                 return False
 
+            # 창이 가려졌다 다시 보이면 정적 화면도 전체를 다시 그림
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                self.invalidate_static()
+
+            if self.profiler.handle_event(event):
+                continue
+
             if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_f:
-                    self.is_fullscreen = not self.is_fullscreen
-                    if self.is_fullscreen:
-                        self.screen = pygame.display.set_mode((FULLSCREEN_WIDTH, FULLSCREEN_HEIGHT), pygame.FULLSCREEN)
-                        self.cur_w, self.cur_h = FULLSCREEN_WIDTH, FULLSCREEN_HEIGHT
-                    else:
-                        self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
-                        self.cur_w, self.cur_h = WINDOW_WIDTH, WINDOW_HEIGHT
-
-                # ✅ 수정: ESC가 intro/ending 상태에서도 작동하지 않도록
-                if event.key == pygame.K_ESCAPE and self.state == "playing":
-                    self.state = "paused"
-
-                if self.state == "playing":
-                    if event.key == pygame.K_TAB:
-                        self.family[self.current_member].is_controlled = False
-                        self.current_member = (self.current_member + 1) % len(self.family)
-                        self.family[self.current_member].is_controlled = True
-
-                    if event.key == pygame.K_SPACE:
-                        self.check_ability()
-
-                # ✅ 수정: intro와 ending 모두 SPACE/ENTER로 진행
-                if self.state in ["intro", "dialog", "ending"]:
-                    if event.key in [pygame.K_RETURN, pygame.K_SPACE]:
-                        self.next_dialog()
-
-                if self.state == "game_over":
-                    if event.key == pygame.K_r:
-                        self.__init__()
-
-                if self.state == "paused":
-                    if event.key == pygame.K_c:
-                        self.state = "playing"
-                    elif event.key == pygame.K_q:
-                        pygame.quit()
-                        return False
+                if self.recording is not None:
+                    self.taps.append(event.key)
+                if not self.handle_key(event.key):
+                    pygame.quit()
+                    return False
+
+        return True
+
+    def handle_key(self, key):
+        """키 하나 처리 (실제 이벤트와 헤드리스 입력 재생이 같이 씀). 종료면 False"""
+        if key == pygame.K_f and not self.headless:
+            self.is_fullscreen = not self.is_fullscreen
+            if self.is_fullscreen:
+                self.screen = pygame.display.set_mode((FULLSCREEN_WIDTH, FULLSCREEN_HEIGHT), pygame.FULLSCREEN)
+                self.cur_w, self.cur_h = FULLSCREEN_WIDTH, FULLSCREEN_HEIGHT
+            else:
+                self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+                self.cur_w, self.cur_h = WINDOW_WIDTH, WINDOW_HEIGHT
+            self.overlays.clear()
+            self.invalidate_static()
+
+        # ✅ 수정: ESC가 intro/ending 상태에서도 작동하지 않도록
+        if key == pygame.K_ESCAPE and self.state == "playing":
+            self.state = "paused"
+
+        if self.state == "playing":
+            if key == pygame.K_TAB:
+                self.family[self.current_member].is_controlled = False
+                self.current_member = (self.current_member + 1) % len(self.family)
+                self.family[self.current_member].is_controlled = True
+
+            if key == pygame.K_SPACE:
+                self.check_ability()
+
+        # ✅ 수정: intro와 ending 모두 SPACE/ENTER로 진행
+        if self.state in ["intro", "dialog", "ending"]:
+            if key in [pygame.K_RETURN, pygame.K_SPACE]:
+                self.next_dialog()
+
+        if self.state == "game_over":
+            if key == pygame.K_r:
+                self.__init__(self.headless, self.seed)
+
+        if self.state == "paused":
+            if key == pygame.K_c:
+                self.state = "playing"
+            elif key == pygame.K_q:
+                return False
 
         return True
 
     def check_ability(self):
         member = self.family[self.current_member]
         if member.role == "dog":
-            if random.random() < 0.4:
+            if self.rng.random() < 0.4:
                 self.secret_items_found += 1
                 # ✅ 추가: 발견 피드백 메시지
-                print(f"[강아지] 무언가를 발견했어요! ({self.secret_items_found}/{self.required_items})")
+                if not self.headless:
+                    print(f"[강아지] 무언가를 발견했어요! ({self.secret_items_found}/{self.required_items})")
 
     def next_dialog(self):
         if self.current_dialog is None:
@@ -545,13 +926,16 @@ class Game:
         self.state = "ending"
         self.dialog_index = 0
 
-    def update(self):
+    def update(self, keys=None):
+        for member in self.family:
+            member.prev_pos.update(member.world_pos)
+
         if self.state == "playing":
             self.game_time += 1
 
             for member in self.family:
                 if member.is_controlled:
-                    member.update(room=self.rooms[self.current_room_index])
+                    member.update(room=self.rooms[self.current_room_index], keys=keys)
                 else:
                     leader = self.family[self.current_member]
                     member.update(leader.world_pos, self.rooms[self.current_room_index])
@@ -579,56 +963,72 @@ class Game:
 
             leader = self.family[self.current_member]
             room = self.rooms[self.current_room_index]
+            room_left_edge = room.floor_area["x"] * TILE_SIZE
             room_right_edge = (room.floor_area["x"] + room.floor_area["w"]) * TILE_SIZE - 100
 
+            # 다음 방 미리 굽기: 일정 비율 이상 진행하면 작업 스레드 시작
+            if not self.headless and self.current_room_index < len(self.rooms) - 1:
+                next_index = self.current_room_index + 1
+                progress = (leader.world_pos.x - room_left_edge) / max(1, room_right_edge - room_left_edge)
+                if progress >= self.prefetch_fraction and not self.rooms[next_index].is_transition:
+                    self.prefetcher.start(next_index, self.rooms[next_index],
+                                          self.get_entry_chunks(self.rooms[next_index]))
+            self.prefetcher.collect(self.rooms, self.current_room_index)
+
             if leader.world_pos.x > room_right_edge and self.current_room_index < len(self.rooms) - 1:
+                room.release()
                 self.current_room_index += 1
                 next_room = self.rooms[self.current_room_index]
                 
                 if next_room.is_transition:
+                    self.prefetcher.cancel()
                     self.trigger_ending()
                 else:
-                    if next_room.rendered_surface is None:
-                        next_room.pre_render(TILE_SIZE)
-                    start_x = next_room.floor_area["x"] * TILE_SIZE + 200
-                    start_y = (next_room.floor_area["y"] + next_room.floor_area["h"] // 2) * TILE_SIZE
+                    if not self.headless:
+                        self.prefetcher.finish(self.rooms, self.current_room_index, self.get_entry_chunks(next_room))
+                    start_x, start_y = self.get_room_entry(next_room)
                     
                     for member in self.family:
                         member.world_pos.x = start_x
                         member.world_pos.y = start_y
+                        member.prev_pos.update(member.world_pos)   # 방을 옮길 때는 보간하지 않음
 
-    def draw_room(self, room):
-        if room.rendered_surface is None:
-            room.pre_render(TILE_SIZE)
+    def get_room_entry(self, room):
+        start_x = room.floor_area["x"] * TILE_SIZE + 200
+        start_y = (room.floor_area["y"] + room.floor_area["h"] // 2) * TILE_SIZE
+        return start_x, start_y
 
-        floor = room.floor_area
-        base_x = floor["x"] * TILE_SIZE - floor["y"] * TILE_SIZE
-        base_y = (floor["x"] + floor["y"]) * TILE_SIZE // 2
+    def get_entry_chunks(self, room):
+        """방에 들어섰을 때 첫 화면에 보일 청크 키 목록"""
+        if room.chunk_cache is None:
+            room.pre_render(TILE_SIZE)
+        start_x, start_y = self.get_room_entry(room)
+        cam_off = (self.cur_w // 2 - (start_x - start_y), self.cur_h // 2 - (start_x + start_y) / 2)
+        return room.chunk_cache.visible_chunks(cam_off, self.cur_w, self.cur_h)
 
-        offset_x = self.cam_off[0] - base_x + 50
-        offset_y = self.cam_off[1] - base_y + 50
+    def draw_room(self, room):
+        if room.chunk_cache is None:
+            room.pre_render(TILE_SIZE)
 
-        self.screen.blit(room.rendered_surface, (offset_x, offset_y))
+        room.chunk_cache.draw(self.screen, self.cam_off)
 
     def draw_ui(self):
         pygame.draw.rect(self.screen, (20, 20, 25), (0, 0, self.cur_w, 50))
         pygame.draw.rect(self.screen, (40, 40, 50), (0, 50, self.cur_w, 2))
 
         time_left = max(0, (self.max_time - self.game_time) // 60)
-        time_text = self.font.render(f"남은 시간: {time_left}초", True, COLOR_TIMER)
-        self.screen.blit(time_text, (20, 15))
+        self.text_cache.blit_line(self.screen, self.font, f"남은 시간: {time_left}초", COLOR_TIMER, (20, 15))
 
         room = self.rooms[self.current_room_index]
-        room_text = self.font.render(f"장소: {room.name}", True, COLOR_TEXT)
+        room_text = self.text_cache.render(self.font, f"장소: {room.name}", True, COLOR_TEXT)
         self.screen.blit(room_text, (200, 15))
 
-        items_text = self.font.render(f"발견한 것: {self.secret_items_found}/{self.required_items}", True, COLOR_TEXT)
-        self.screen.blit(items_text, (450, 15))
+        self.text_cache.blit_line(self.screen, self.font, f"발견한 것: {self.secret_items_found}/{self.required_items}", COLOR_TEXT, (450, 15))
 
         pygame.draw.rect(self.screen, COLOR_HP_BG, (self.cur_w - 220, 10, 200, 30))
         hp_percent = max(0, self.family[0].hp / self.family[0].max_hp)
         pygame.draw.rect(self.screen, COLOR_HP_BAR, (self.cur_w - 220, 10, 200 * hp_percent, 30))
-        hp_text = self.font.render("아빠", True, (255, 255, 255))
+        hp_text = self.text_cache.render(self.font, "아빠", True, (255, 255, 255))
         self.screen.blit(hp_text, (self.cur_w - 150, 15))
 
         y_offset = 60
@@ -637,11 +1037,11 @@ class Game:
             if member.hp < 50:
                 color = (255, 150, 150)
 
-            name_text = self.font_small.render(f"{member.name} ({member.ability_name})", True, color)
+            name_text = self.text_cache.render(self.font_small, f"{member.name} ({member.ability_name})", True, color)
             self.screen.blit(name_text, (10, y_offset))
             y_offset += 22
 
-        help_text = self.font_small.render("TAB: 캐릭터 변경 | SPACE: 능력 사용 | ESC: 일시정지", True, (150, 150, 150))
+        help_text = self.text_cache.render(self.font_small, "TAB: 캐릭터 변경 | SPACE: 능력 사용 | ESC: 일시정지", True, (150, 150, 150))
         self.screen.blit(help_text, (self.cur_w - 350, self.cur_h - 30))
 
     def draw_dialog(self):
@@ -651,9 +1051,7 @@ class Game:
         speaker, text = self.current_dialog[self.dialog_index]
 
         dialog_h = 150
-        dialog_surface = pygame.Surface((self.cur_w, dialog_h), pygame.SRCALPHA)
-        dialog_surface.fill((0, 0, 0, 220))
-        self.screen.blit(dialog_surface, (0, self.cur_h - dialog_h))
+        self.screen.blit(self.get_overlay(self.cur_w, dialog_h, (0, 0, 0, 220)), (0, self.cur_h - dialog_h))
 
         speaker_color = (255, 200, 100) if speaker == "시스템" else (200, 200, 255)
         if speaker in ["아빠", "엄마", "딸", "강아지", "할머니"]:
@@ -665,88 +1063,99 @@ class Game:
                 "할머니": (255, 200, 150)
             }.get(speaker, (200, 200, 255))
 
-        speaker_text = self.font.render(f"{speaker}:", True, speaker_color)
+        speaker_text = self.text_cache.render(self.font, f"{speaker}:", True, speaker_color)
         self.screen.blit(speaker_text, (30, self.cur_h - dialog_h + 20))
 
-        content_text = self.font.render(text, True, COLOR_TEXT)
+        content_text = self.text_cache.render(self.font, text, True, COLOR_TEXT)
         self.screen.blit(content_text, (30, self.cur_h - dialog_h + 55))
 
-        continue_text = self.font_small.render(" SPACE나 ENTER를 눌러 계속 ", True, (150, 150, 150))
+        continue_text = self.text_cache.render(self.font_small, " SPACE나 ENTER를 눌러 계속 ", True, (150, 150, 150))
         continue_rect = continue_text.get_rect(right=self.cur_w - 30, bottom=self.cur_h - 15)
         self.screen.blit(continue_text, continue_rect)
 
+    def get_overlay(self, w, h, rgba):
+        """반투명 오버레이 Surface는 해상도/색별로 한 번만 만든다"""
+        key = (w, h, rgba)
+        overlay = self.overlays.get(key)
+        if overlay is None:
+            overlay = pygame.Surface((w, h), pygame.SRCALPHA)
+            overlay.fill(rgba)
+            self.overlays[key] = overlay
+        return overlay
+
     def draw_intro(self):
+        self.draw_intro_background()
+        if self.current_dialog:
+            self.draw_dialog()
+
+    def draw_intro_background(self):
         self.screen.fill((135, 206, 250))
 
-        title = self.font_title.render("그리운 집으로", True, (255, 220, 150))
+        title = self.text_cache.render(self.font_title, "그리운 집으로", True, (255, 220, 150))
         title_rect = title.get_rect(center=(self.cur_w // 2, self.cur_h // 3))
         self.screen.blit(title, title_rect)
 
-        subtitle = self.font.render("가족 여정", True, (200, 200, 220))
+        subtitle = self.text_cache.render(self.font, "가족 여정", True, (200, 200, 220))
         subtitle_rect = subtitle.get_rect(center=(self.cur_w // 2, self.cur_h // 3 + 50))
         self.screen.blit(subtitle, subtitle_rect)
 
-        story = self.font_small.render("아빠, 엄마, 딸, 강아지.", True, (180, 180, 180))
+        story = self.text_cache.render(self.font_small, "아빠, 엄마, 딸, 강아지.", True, (180, 180, 180))
         self.screen.blit(story, (self.cur_w // 2 - 100, self.cur_h // 2))
 
-        story2 = self.font_small.render("할머니 댁까지 가는 여정.", True, (180, 180, 180))
+        story2 = self.text_cache.render(self.font_small, "할머니 댁까지 가는 여정.", True, (180, 180, 180))
         self.screen.blit(story2, (self.cur_w // 2 - 110, self.cur_h // 2 + 30))
 
-        story3 = self.font_small.render("돌아올 수 없는, 하지만 소중한 시간.", True, (180, 180, 180))
+        story3 = self.text_cache.render(self.font_small, "돌아올 수 없는, 하지만 소중한 시간.", True, (180, 180, 180))
         self.screen.blit(story3, (self.cur_w // 2 - 140, self.cur_h // 2 + 60))
 
-        start_text = self.font.render("SPACE를 눌러 시작하세요", True, (255, 255, 100))
+        start_text = self.text_cache.render(self.font, "SPACE를 눌러 시작하세요", True, (255, 255, 100))
         start_rect = start_text.get_rect(center=(self.cur_w // 2, self.cur_h * 3 // 4))
         self.screen.blit(start_text, start_rect)
-        
-        if self.current_dialog:
-            self.draw_dialog()
 
     def draw_game_over(self):
-        overlay = pygame.Surface((self.cur_w, self.cur_h), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 200))
-        self.screen.blit(overlay, (0, 0))
+        self.screen.blit(self.get_overlay(self.cur_w, self.cur_h, (0, 0, 0, 200)), (0, 0))
 
         if self.ending_type == "good":
-            title = self.font_title.render("도착", True, (150, 255, 150))
+            title = self.text_cache.render(self.font_title, "도착", True, (150, 255, 150))
         else:
-            title = self.font_title.render("이별", True, (255, 150, 150))
+            title = self.text_cache.render(self.font_title, "이별", True, (255, 150, 150))
 
         title_rect = title.get_rect(center=(self.cur_w // 2, self.cur_h // 3))
         self.screen.blit(title, title_rect)
 
-        restart_text = self.font.render("R을 눌러 다시 시작", True, (200, 200, 200))
+        restart_text = self.text_cache.render(self.font, "R을 눌러 다시 시작", True, (200, 200, 200))
         restart_rect = restart_text.get_rect(center=(self.cur_w // 2, self.cur_h // 2))
         self.screen.blit(restart_text, restart_rect)
 
     def draw_paused(self):
-        overlay = pygame.Surface((self.cur_w, self.cur_h), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 150))
-        self.screen.blit(overlay, (0, 0))
+        self.screen.blit(self.get_overlay(self.cur_w, self.cur_h, (0, 0, 0, 150)), (0, 0))
 
-        pause_text = self.font_title.render("일시정지", True, (255, 255, 255))
+        pause_text = self.text_cache.render(self.font_title, "일시정지", True, (255, 255, 255))
         pause_rect = pause_text.get_rect(center=(self.cur_w // 2, self.cur_h // 3))
         self.screen.blit(pause_text, pause_rect)
 
-        cont_text = self.font.render("C: 계속하기", True, (200, 200, 200))
+        cont_text = self.text_cache.render(self.font, "C: 계속하기", True, (200, 200, 200))
         cont_rect = cont_text.get_rect(center=(self.cur_w // 2, self.cur_h // 2))
         self.screen.blit(cont_text, cont_rect)
 
-        quit_text = self.font.render("Q: 종료하기", True, (200, 200, 200))
+        quit_text = self.text_cache.render(self.font, "Q: 종료하기", True, (200, 200, 200))
         quit_rect = quit_text.get_rect(center=(self.cur_w // 2, self.cur_h // 2 + 40))
         self.screen.blit(quit_text, quit_rect)
 
     def draw_ending(self):
+        self.draw_ending_background()
+        self.draw_ending_dialog()
+
+    def draw_ending_background(self):
         self.screen.fill((255, 240, 200))
 
         for i, member in enumerate(self.family):
             member.draw(self.screen, (self.cur_w // 2 + (i - 1.5) * 80, self.cur_h // 2))
 
+    def draw_ending_dialog(self):
         if self.current_dialog and self.dialog_index < len(self.current_dialog):
             dialog_h = 120
-            dialog_surface = pygame.Surface((self.cur_w, dialog_h), pygame.SRCALPHA)
-            dialog_surface.fill((0, 0, 0, 230))
-            self.screen.blit(dialog_surface, (0, self.cur_h - dialog_h))
+            self.screen.blit(self.get_overlay(self.cur_w, dialog_h, (0, 0, 0, 230)), (0, self.cur_h - dialog_h))
 
             speaker, text = self.current_dialog[self.dialog_index]
 
@@ -754,37 +1163,101 @@ class Game:
             if speaker == "할머니":
                 speaker_color = (255, 200, 150)
             
-            speaker_text = self.font.render(f"{speaker}:", True, speaker_color)
+            speaker_text = self.text_cache.render(self.font, f"{speaker}:", True, speaker_color)
             self.screen.blit(speaker_text, (30, self.cur_h - dialog_h + 20))
 
-            content_text = self.font.render(text, True, COLOR_TEXT)
+            content_text = self.text_cache.render(self.font, text, True, COLOR_TEXT)
             self.screen.blit(content_text, (30, self.cur_h - dialog_h + 55))
 
-            continue_text = self.font_small.render(" SPACE나 ENTER를 눌러 계속 ", True, (150, 150, 150))
+            continue_text = self.text_cache.render(self.font_small, " SPACE나 ENTER를 눌러 계속 ", True, (150, 150, 150))
             continue_rect = continue_text.get_rect(right=self.cur_w - 30, bottom=self.cur_h - 15)
             self.screen.blit(continue_text, continue_rect)
 
-    def draw(self):
-        self.screen.fill(COLOR_OUTSIDE)
+    def invalidate_static(self):
+        self.static_bg_key = None
 
+    def draw_static_background(self):
+        """정적 상태에서 대화창을 뺀 나머지 (한 번 그려서 static_bg로 보관)"""
+        self.screen.fill(COLOR_OUTSIDE)
         if self.state == "intro":
-            self.draw_intro()
-        elif self.state == "playing":
+            self.draw_intro_background()
+        elif self.state == "ending":
+            self.draw_ending_background()
+        elif self.state == "game_over":
             self.draw_room(self.rooms[self.current_room_index])
-
             for member in self.family:
                 member.draw(self.screen, self.cam_off)
-
-            self.draw_ui()
-            self.draw_dialog()
-        elif self.state == "dialog":
+            self.draw_game_over()
+        elif self.state == "paused":
             self.draw_room(self.rooms[self.current_room_index])
-
             for member in self.family:
                 member.draw(self.screen, self.cam_off)
-
             self.draw_ui()
-            self.draw_dialog()
+            self.draw_paused()
+
+    def get_static_dirty_rect(self):
+        """정적 상태에서 바뀔 수 있는 영역: 인트로/엔딩의 대화창뿐"""
+        if self.state == "intro":
+            return pygame.Rect(0, self.cur_h - 150, self.cur_w, 150)
+        if self.state == "ending":
+            return pygame.Rect(0, self.cur_h - 120, self.cur_w, 120)
+        return None
+
+    def draw_static(self):
+        bg_key = (self.state, self.cur_w, self.cur_h, self.ending_type)
+        full = bg_key != self.static_bg_key
+        if full:
+            self.draw_static_background()
+            self.static_bg = self.screen.copy()
+            self.static_bg_key = bg_key
+            self.static_dialog_key = None
+
+        dirty = self.get_static_dirty_rect()
+        dialog_key = (id(self.current_dialog), self.dialog_index)
+        if dirty is not None and dialog_key != self.static_dialog_key:
+            if not full:
+                self.screen.blit(self.static_bg, dirty, dirty)
+            if self.state == "intro":
+                if self.current_dialog:
+                    self.draw_dialog()
+            else:
+                self.draw_ending_dialog()
+            self.static_dialog_key = dialog_key
+            if not full:
+                pygame.display.update(dirty)
+
+        if full:
+            pygame.display.flip()
+
+    def draw(self, alpha=1.0):
+        """alpha: 직전 틱에서 다음 틱까지 지난 비율 (0~1). 캐릭터와 카메라를 그만큼 보간해서 그림"""
+        # 프로파일러 오버레이는 매 프레임 바뀌므로 켜져 있으면 전체 다시 그리기
+        if self.dirty_rect_mode and not self.profiler.enabled and self.state in STATIC_STATES:
+            self.draw_static()
+            return
+        self.static_bg_key = None
+
+        self.screen.fill(COLOR_OUTSIDE)
+        profiler = self.profiler
+
+        if self.state == "intro":
+            self.draw_intro()
+        elif self.state in ("playing", "dialog"):
+            positions = [member.prev_pos.lerp(member.world_pos, alpha) for member in self.family]
+            leader_pos = positions[self.current_member]
+            self.cam_off = (self.cur_w // 2 - (leader_pos.x - leader_pos.y),
+                            self.cur_h // 2 - (leader_pos.x + leader_pos.y) / 2)
+
+            with profiler.phase("room"):
+                self.draw_room(self.rooms[self.current_room_index])
+
+            with profiler.phase("chars"):
+                for member, pos in zip(self.family, positions):
+                    member.draw(self.screen, self.cam_off, pos)
+
+            with profiler.phase("ui"):
+                self.draw_ui()
+                self.draw_dialog()
         elif self.state == "ending":
             self.draw_ending()
         elif self.state == "game_over":
@@ -799,30 +1272,141 @@ class Game:
             self.draw_ui()
             self.draw_paused()
 
-        pygame.display.flip()
+        profiler.draw(self.screen)
+        with profiler.phase("flip"):
+            pygame.display.flip()
 
     def start_intro(self):
         self.current_dialog = self.dialogs[0]
         self.dialog_index = 0
         self.state = "intro"
 
-    def run(self):
+    def run(self, record_path=None):
         self.start_intro()
-
+        if record_path:
+            # 재생 때 강아지 발견 판정이 같도록 시드도 같이 저장
+            if self.seed is None:
+                self.seed = random.randrange(2 ** 31)
+                self.rng.seed(self.seed)
+            self.recording = InputScript(seed=self.seed)
+
+        # 고정 틱: 흐른 실제 시간을 쌓아 두고 1/TICK_RATE초마다 update 한 번.
+        # 그리기가 느려져도 게임 시간은 그대로 흐르고, 빠르면 틱 사이를 보간해서 그림
+        tick_seconds = 1.0 / TICK_RATE
+        accumulator = 0.0
+        last = time.perf_counter()
         running = True
+        tick = 0
+        self.taps = []
         while running:
-            running = self.handle_events()
+            self.profiler.begin_frame()
+            with self.profiler.phase("events"):
+                running = self.handle_events()
             if running:
-                self.update()
-                self.draw()
-                self.clock.tick(FPS)
-
+                now = time.perf_counter()
+                accumulator += min(now - last, tick_seconds * MAX_CATCHUP_TICKS)
+                last = now
+
+                steps = 0
+                with self.profiler.phase("update"):
+                    while accumulator >= tick_seconds and steps < MAX_CATCHUP_TICKS:
+                        if self.recording is not None:
+                            pressed = pygame.key.get_pressed()
+                            held = [k for k in (pygame.K_w, pygame.K_a, pygame.K_s, pygame.K_d) if pressed[k]]
+                            self.recording.record(tick, held, self.taps)
+                            self.taps = []
+                        self.update()
+                        accumulator -= tick_seconds
+                        tick += 1
+                        steps += 1
+                self.profiler.count("ticks", steps)
+                if steps == MAX_CATCHUP_TICKS:
+                    # 따라잡지 못한 만큼은 버림 (느린 기계에서 틱이 끝없이 밀리지 않게)
+                    accumulator = min(accumulator, tick_seconds)
+
+                self.draw(min(1.0, accumulator / tick_seconds))
+                self.profiler.end_frame()
+                self.clock.tick(RENDER_FPS)
+
+        if self.recording is not None:
+            self.recording.save(record_path)
+        self.profiler.close()
         pygame.quit()
 
+    def run_headless(self, script, max_ticks=HEADLESS_MAX_TICKS, auto_dialog=HEADLESS_AUTO_DIALOG):
+        """화면 없이 입력 기록을 재생하며 CPU가 허용하는 만큼 빠르게 update만 돌린다.
+        auto_dialog면 대화를 매 틱 자동으로 넘김 (녹화한 입력을 재생할 때는 끌 것)"""
+        self.start_intro()
+        script.rewind()
+
+        start = time.perf_counter()
+        tick = 0
+        running = True
+        while running and tick < max_ticks and self.state != "game_over":
+            held, taps = script.step(tick)
+            for key in taps:
+                running = running and self.handle_key(key)
+            if auto_dialog and self.state in ("intro", "dialog", "ending"):
+                self.next_dialog()
+            self.update(held)
+            tick += 1
+        elapsed = time.perf_counter() - start
+
+        self.prefetcher.cancel()
+        return {
+            "seed": self.seed,
+            "ticks": tick,
+            "seconds": elapsed,
+            "ticks_per_sec": tick / elapsed if elapsed > 0 else 0.0,
+            "state": self.state,
+            "ending": self.ending_type,
+            "game_time": self.game_time,
+            "room": self.current_room_index,
+            "father_hp": self.family[0].hp,
+            "items": self.secret_items_found,
+        }
+
+
+def run_simulations(runs, seed=0, script=None, max_ticks=HEADLESS_MAX_TICKS):
+    """여러 판을 헤드리스로 돌려 결과 목록과 전체 틱/초를 돌려줌"""
+    results = []
+    total_ticks = 0
+    start = time.perf_counter()
+    for i in range(runs):
+        if script is None:
+            game = Game(headless=True, seed=seed + i)
+            result = game.run_headless(InputScript.random_walk(seed + i, max_ticks), max_ticks)
+        else:
+            game = Game(headless=True, seed=script.seed if script.seed is not None else seed + i)
+            result = game.run_headless(script, max_ticks, auto_dialog=False)
+        results.append(result)
+        total_ticks += result["ticks"]
+    elapsed = time.perf_counter() - start
+    return results, total_ticks / elapsed if elapsed > 0 else 0.0
+
+
+if __name__ == "__main__" and "--headless" in sys.argv:
+    import argparse
+    parser = argparse.ArgumentParser(description="그리운 집으로 - 헤드리스 시뮬레이션")
+    parser.add_argument("--headless", action="store_true")
+    parser.add_argument("--runs", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-ticks", type=int, default=HEADLESS_MAX_TICKS)
+    parser.add_argument("--script", help="InputScript.save로 저장한 입력 기록(JSON)")
+    args = parser.parse_args()
+
+    script = InputScript.load(args.script) if args.script else None
+    results, tps = run_simulations(args.runs, args.seed, script, args.max_ticks)
+    for r in results:
+        print(f"[seed {r['seed']}] {r['ticks']}틱 {r['ticks_per_sec']:.0f}틱/초 "
+              f"결말={r['ending']} 방={r['room']} 아빠HP={r['father_hp']} 아이템={r['items']}")
+    print(f"[전체] {args.runs}판 평균 {tps:.0f}틱/초")
+    sys.exit(0)
+
 if __name__ == "__main__":
     try:
         game = Game()
-        game.run()
+        game.run(record_path=os.environ.get("OSH_RECORD_INPUT"))
     except pygame.error as e:
         print(f"Pygame 에러 발생: {e}")
     except Exception as e:
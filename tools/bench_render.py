@@ -0,0 +1,326 @@
+# -*- coding: utf-8 -*-
+"""
+맵 렌더러 벤치마크
+- 각 게임의 바닥/벽 렌더러를 화면 없이(SDL dummy) 정해진 카메라 경로로 돌려서 비교
+- 해상도 × 맵 크기 조합마다 별도 프로세스로 실행 (모듈 전역 상태와 RSS가 섞이지 않게)
+- 결과: 초당 프레임, 프레임당 파이썬 할당량(tracemalloc 피크), 최대 RSS
+- JSON으로 저장해서 커밋끼리 비교
+
+    python tools/bench_render.py                      # 전체 실행, bench_results/<커밋>.json
+    python tools/bench_render.py --only t003 p008     # 일부 렌더러만
+    python tools/bench_render.py --compare bench_results/abc123.json
+    python tools/bench_render.py --alloc --only p008  # 할당만: 모든 프레임을 tracemalloc으로 (시간 측정 생략)
+
+tracemalloc은 파이썬 객체만 추적한다. Surface 픽셀 메모리(SDL)는 RSS에만 잡힌다.
+--alloc 모드는 모든 프레임에서 할당 피크(바이트)와, 프레임이 끝난 뒤에도 남아 있는 새 블록 수를 줄 단위로 센다.
+타일마다 만들었다 곧바로 버리는 튜플은 참조 카운트로 바로 풀리므로 피크에만 잡힌다.
+"""
+import os
+import sys
+import json
+import math
+import time
+import platform
+import argparse
+import subprocess
+import importlib.util
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+RESOLUTIONS = [(800, 600), (1280, 720), (1920, 1080)]
+MAP_SIZES = {"small": (20, 15), "medium": (40, 30), "large": (80, 60)}
+BENCH_FRAMES = 300
+WARMUP_FRAMES = 10
+ALLOC_FRAMES = 60
+ALLOC_IGNORE = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+
+
+def load_script(relpath):
+    """게임 폴더의 스크립트를 모듈로 불러옴 (폴더 이름에 공백/괄호가 있어도 됨)"""
+    path = os.path.join(ROOT, relpath)
+    name = "bench_" + relpath.replace("/", "_").replace(".", "_")
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def camera_path(frame, frames, bounds):
+    """월드 좌표 범위 안을 8자로 도는 카메라 (프레임 번호만으로 정해짐)"""
+    x0, y0, x1, y1 = bounds
+    t = frame / frames * 2 * math.pi
+    cx, cy = (x0 + x1) / 2, (y0 + y1) / 2
+    return cx + (x1 - x0) * 0.4 * math.sin(t), cy + (y1 - y0) * 0.4 * math.sin(2 * t)
+
+
+def iso_cam_off(wx, wy, w, h):
+    return (w // 2 - (wx - wy), h // 2 - (wx + wy) / 2)
+
+
+# ---- 렌더러별 준비 함수: (모듈, 화면, 맵 타일 크기) -> (draw(cam_wx, cam_wy), 월드 범위) ----
+
+def setup_gameA002_main(mod, screen, tiles):
+    """gameA002/main.py: 매 프레임 모든 타일을 직접 그리는 draw_room"""
+    tw, th = tiles
+    w, h = screen.get_size()
+    room = mod.Room("bench", 0, 0, tw, th)
+    game = mod.Game.__new__(mod.Game)
+    game.screen = screen
+    game.quality = mod.QualityGovernor(enabled=False)   # 항상 최고 품질로 측정
+
+    def draw(wx, wy):
+        game.cam_off = iso_cam_off(wx, wy, w, h)
+        game.draw_room(room)
+    return draw, (0, 0, tw * mod.TILE_SIZE, th * mod.TILE_SIZE)
+
+
+def setup_gameA002_t003(mod, screen, tiles):
+    """gameA002/t003.py: 청크로 구워 두고 보이는 청크만 blit"""
+    tw, th = tiles
+    w, h = screen.get_size()
+    room = mod.Room("bench", 0, 0, tw, th, theme_colors={
+        "floor": mod.COLOR_FLOOR, "floor_border": (180, 170, 150),
+        "wall": mod.COLOR_WALL, "wall_border": (100, 80, 60)})
+    game = mod.Game.__new__(mod.Game)
+    game.screen = screen
+
+    def draw(wx, wy):
+        game.cam_off = iso_cam_off(wx, wy, w, h)
+        game.draw_room(room)
+    return draw, (0, 0, tw * mod.TILE_SIZE, th * mod.TILE_SIZE)
+
+
+def setup_gameA001_g003(mod, screen, tiles):
+    house = mod.House()
+    house.tw, house.th = tiles
+    w, h = screen.get_size()
+    t = mod.TILE_SIZE
+    bounds = (house.origin_x * t, house.origin_y * t,
+              (house.origin_x + house.tw) * t, (house.origin_y + house.th) * t)
+
+    def draw(wx, wy):
+        mod.render_house(screen, house, iso_cam_off(wx, wy, w, h))
+    return draw, bounds
+
+
+def setup_game2_p014(mod, screen, tiles):
+    # draw_map은 모듈 전역 MAP_LIMIT(정사각형)을 쓴다
+    mod.MAP_TILES = max(tiles)
+    mod.MAP_LIMIT = mod.TILE_SIZE * mod.MAP_TILES
+    w, h = screen.get_size()
+
+    def draw(wx, wy):
+        mod.draw_map(screen, "apartment", iso_cam_off(wx, wy, w, h), w, h)
+    return draw, (0, 0, mod.MAP_LIMIT, mod.MAP_LIMIT)
+
+
+def setup_game3_p006(mod, screen, tiles):
+    room = mod.IndependentRoom("bench", tiles[0], tiles[1], mod.COLOR_FLOOR_LIVING)
+    w, h = screen.get_size()
+    t = mod.TILE_SIZE
+    bounds = (room.origin_x * t, room.origin_y * t,
+              (room.origin_x + room.tw) * t, (room.origin_y + room.th) * t)
+
+    def draw(wx, wy):
+        mod.render_room(screen, room, [], iso_cam_off(wx, wy, w, h))
+    return draw, bounds
+
+
+def setup_game3_p008(mod, screen, tiles):
+    # 설계도 맵을 원하는 크기까지 바둑판처럼 반복
+    base = mod.build_unified_map()[0]
+    tw, th = tiles
+    grid = base.tiled(tw, th)
+    w, h = screen.get_size()
+
+    def draw(wx, wy):
+        mod.render_unified_v2(screen, grid, tw, th, [], iso_cam_off(wx, wy, w, h), wx, wy)
+    return draw, (0, 0, tw * mod.TILE_SIZE, th * mod.TILE_SIZE)
+
+
+RENDERERS = {
+    "gameA002.main": ("gameA002/main.py", setup_gameA002_main),
+    "gameA002.t003": ("gameA002/t003.py", setup_gameA002_t003),
+    "gameA001.g003": ("gameA001/g003.py", setup_gameA001_g003),
+    "game2.p014": ("game2/p014.py", setup_game2_p014),
+    "game3.p006": ("game3/p006.py", setup_game3_p006),
+    "game3.p008": ("game3/p008.py", setup_game3_p008),
+}
+
+
+def measure_alloc(draw, bounds, frames, count):
+    """count 프레임을 tracemalloc으로 재서 (프레임당 피크 바이트, 프레임 뒤에 남은 새 블록 수) 목록을 돌려줌"""
+    tracemalloc.start()
+    peaks, blocks = [], []
+    for i in range(count):
+        cam = camera_path(i * frames // count, frames, bounds)
+        before = tracemalloc.take_snapshot()
+        base = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        draw(*cam)
+        peaks.append(tracemalloc.get_traced_memory()[1] - base)
+        after = tracemalloc.take_snapshot()
+        after = after.filter_traces(ALLOC_IGNORE)
+        blocks.append(sum(max(0, d.count_diff) for d in after.compare_to(before.filter_traces(ALLOC_IGNORE), "lineno")))
+        del before, after
+    tracemalloc.stop()
+    return peaks, blocks
+
+
+def run_case(renderer, res, size, frames=BENCH_FRAMES, alloc_only=False):
+    """한 조합을 현재 프로세스에서 실행하고 결과 dict를 돌려줌.
+    alloc_only면 시간은 재지 않고 모든 프레임의 할당만 잰다"""
+    import pygame
+    import resource
+
+    relpath, setup = RENDERERS[renderer]
+    mod = load_script(relpath)
+    screen = pygame.display.set_mode(res)
+    draw, bounds = setup(mod, screen, MAP_SIZES[size])
+
+    start = time.perf_counter()
+    draw(*camera_path(0, frames, bounds))
+    first_ms = (time.perf_counter() - start) * 1000
+
+    for i in range(WARMUP_FRAMES):
+        draw(*camera_path(i, frames, bounds))
+
+    times = []
+    if not alloc_only:
+        for i in range(frames):
+            cam = camera_path(i, frames, bounds)
+            start = time.perf_counter()
+            draw(*cam)
+            times.append(time.perf_counter() - start)
+
+    # 할당량은 따로 잰다 (tracemalloc이 켜져 있으면 느려지므로)
+    alloc, blocks = measure_alloc(draw, bounds, frames, frames if alloc_only else ALLOC_FRAMES)
+
+    times.sort()
+    total = sum(times)
+    if alloc_only:
+        return {
+            "renderer": renderer,
+            "resolution": list(res),
+            "map": size,
+            "tiles": list(MAP_SIZES[size]),
+            "frames": frames,
+            "alloc_kb_per_frame": sum(alloc) / len(alloc) / 1024,
+            "alloc_kb_max": max(alloc) / 1024,
+            "alloc_blocks_per_frame": sum(blocks) / len(blocks),
+        }
+    return {
+        "renderer": renderer,
+        "resolution": list(res),
+        "map": size,
+        "tiles": list(MAP_SIZES[size]),
+        "frames": frames,
+        "fps": frames / total if total > 0 else 0.0,
+        "ms_p50": times[len(times) // 2] * 1000,
+        "ms_p95": times[int(len(times) * 0.95)] * 1000,
+        "first_frame_ms": first_ms,
+        "alloc_kb_per_frame": sum(alloc) / len(alloc) / 1024,
+        "alloc_blocks_per_frame": sum(blocks) / len(blocks),
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                             capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run_all(renderers, resolutions, sizes, frames, alloc_only=False):
+    results = []
+    for renderer in renderers:
+        for res in resolutions:
+            for size in sizes:
+                cmd = [sys.executable, os.path.abspath(__file__), "--case", renderer,
+                       "--res", f"{res[0]}x{res[1]}", "--size", size, "--frames", str(frames)]
+                if alloc_only:
+                    cmd.append("--alloc")
+                proc = subprocess.run(cmd, capture_output=True, text=True)
+                lines = [l for l in proc.stdout.splitlines() if l.startswith("{")]
+                if proc.returncode != 0 or not lines:
+                    err = (proc.stderr.strip().splitlines() or ["?"])[-1]
+                    result = {"renderer": renderer, "resolution": list(res), "map": size, "error": err}
+                    print(f"{renderer:<14} {res[0]}x{res[1]:<5} {size:<6} 실패: {err}")
+                elif alloc_only:
+                    result = json.loads(lines[-1])
+                    print(f"{renderer:<14} {res[0]}x{res[1]:<5} {size:<6} "
+                          f"피크 {result['alloc_kb_per_frame']:7.1f} KB/프레임 (최대 {result['alloc_kb_max']:.1f})  "
+                          f"남은 새 블록 {result['alloc_blocks_per_frame']:6.1f}/프레임")
+                else:
+                    result = json.loads(lines[-1])
+                    print(f"{renderer:<14} {res[0]}x{res[1]:<5} {size:<6} "
+                          f"{result['fps']:8.1f} fps  p95 {result['ms_p95']:6.2f} ms  "
+                          f"{result['alloc_kb_per_frame']:7.1f} KB/프레임  RSS {result['peak_rss_mb']:.0f} MB")
+                results.append(result)
+    return results
+
+
+def compare(results, old_path):
+    with open(old_path) as f:
+        old = json.load(f)
+    old_by_key = {(r["renderer"], tuple(r["resolution"]), r["map"]): r for r in old["results"] if "fps" in r}
+    print(f"\n[비교] {old.get('commit')} → 현재")
+    for r in results:
+        prev = old_by_key.get((r["renderer"], tuple(r["resolution"]), r["map"]))
+        if prev and "fps" in r:
+            ratio = r["fps"] / prev["fps"] if prev["fps"] else 0.0
+            print(f"{r['renderer']:<14} {r['resolution'][0]}x{r['resolution'][1]:<5} {r['map']:<6} "
+                  f"{prev['fps']:8.1f} → {r['fps']:8.1f} fps ({ratio:.2f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="맵 렌더러 벤치마크")
+    parser.add_argument("--only", nargs="*", help="렌더러 이름 일부 (예: t003 p008)")
+    parser.add_argument("--res", help="해상도 하나만 (예: 800x600)")
+    parser.add_argument("--size", choices=sorted(MAP_SIZES), help="맵 크기 하나만")
+    parser.add_argument("--frames", type=int, default=BENCH_FRAMES)
+    parser.add_argument("--out", help="결과 JSON 경로 (기본: bench_results/<커밋>.json)")
+    parser.add_argument("--compare", help="이전 결과 JSON과 fps 비교")
+    parser.add_argument("--alloc", action="store_true", help="할당만 측정 (모든 프레임 tracemalloc, 시간 측정 생략)")
+    parser.add_argument("--case", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    resolutions = [tuple(int(v) for v in args.res.split("x"))] if args.res else RESOLUTIONS
+    sizes = [args.size] if args.size else list(MAP_SIZES)
+
+    if args.case:
+        print(json.dumps(run_case(args.case, resolutions[0], sizes[0], args.frames, args.alloc)))
+        return
+
+    renderers = [r for r in RENDERERS if not args.only or any(o in r for o in args.only)]
+    results = run_all(renderers, resolutions, sizes, args.frames, args.alloc)
+
+    import pygame
+    commit = git_commit()
+    out = args.out or os.path.join(ROOT, "bench_results", f"{commit}.json")
+    os.makedirs(os.path.dirname(out), exist_ok=True)
+    with open(out, "w") as f:
+        json.dump({
+            "commit": commit,
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "platform": platform.platform(),
+            "frames": args.frames,
+            "results": results,
+        }, f, indent=2)
+    print(f"\n결과 저장: {out}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+좀비 무리(horde) 백엔드 검사
+- common/horde.py Horde.step(NumPy 배치)과 gameA001/g003.py Zombie.update(좀비마다 루프)를
+  같은 시작 상태, 같은 생존자 경로, 같은 타격(경직/피해)으로 나란히 돌려 비교
+- 틱마다 위치 최대 오차, 걷기 값 오차, 경직/공격 애니메이션/쿨다운/생존 여부 불일치를 센다
+- 위치 오차가 --tolerance를 넘거나 정수 상태가 하나라도 다르면 종료 코드 1
+
+    python tools/check_horde_parity.py                           # 좀비 100, 2000틱
+    python tools/check_horde_parity.py --zombies 500 --ticks 5000 --seed 3
+
+부동소수 계산 순서가 달라(정규화 후 곱 vs 나눗셈) 위치는 1e-12 정도까지 어긋날 수 있다.
+"""
+import os
+import sys
+import math
+import random
+import argparse
+import importlib.util
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+ZOMBIES = 100
+TICKS = 2000
+TOLERANCE = 1e-9
+HIT_EVERY = 30          # 이 틱마다 생존자 근처 좀비 하나를 때림 (경직/사망 경로도 같이 검사)
+HIT_DAMAGE = 20
+HIT_STUN = 20
+
+
+def load_script(relpath):
+    """게임 폴더의 스크립트를 모듈로 불러옴 (폴더 이름에 공백/괄호가 있어도 됨)"""
+    path = os.path.join(ROOT, relpath)
+    name = "check_" + relpath.replace("/", "_").replace(".", "_")
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def survivor_path(tick, ticks, floor):
+    """바닥 안을 8자로 도는 생존자 위치 (틱 번호만으로 정해짐)"""
+    t = tick / ticks * 6 * math.pi
+    cx, cy = floor.centerx, floor.centery
+    return cx + floor.width * 0.4 * math.sin(t), cy + floor.height * 0.4 * math.sin(2 * t)
+
+
+def run(mod, zombies, ticks, seed):
+    """(틱별 위치 최대 오차 목록, 걷기 값 최대 오차, 정수 상태 불일치 수)"""
+    import pygame
+    from common.horde import Horde
+
+    rnd = random.Random(seed)
+    house = mod.House()
+    floor = house.get_floor_rect()
+    loop = []
+    for _ in range(zombies):
+        # 일부는 바닥 밖에서 시작 (경계 되돌림 검사)
+        x = rnd.uniform(floor.left - 60, floor.right + 60)
+        y = rnd.uniform(floor.top - 60, floor.bottom + 60)
+        zombie = mod.Zombie(x, y)
+        zombie.speed = rnd.uniform(1.0, 2.5)
+        loop.append(zombie)
+    horde = Horde()
+    for zombie in loop:
+        horde.add(mod.Zombie(zombie.world_pos.x, zombie.world_pos.y))
+        horde.speed[horde.n - 1] = zombie.speed
+
+    pos_errors, walk_error, state_mismatches = [], 0.0, 0
+    for tick in range(ticks):
+        target = pygame.Vector2(survivor_path(tick, ticks, floor))
+
+        if tick % HIT_EVERY == 0:
+            i = horde.first_within(target, 80)
+            if i is not None:
+                horde.hit(i, HIT_DAMAGE, HIT_STUN)
+                zombie = loop[i]
+                zombie.health -= HIT_DAMAGE
+                zombie.stun_time = HIT_STUN
+                if zombie.health <= 0:
+                    zombie.alive = False
+
+        horde.step(target, floor)
+        for zombie in loop:
+            zombie.update(target, house)
+
+        worst = 0.0
+        for i, zombie in enumerate(loop):
+            worst = max(worst, abs(zombie.world_pos.x - horde.pos[i, 0]), abs(zombie.world_pos.y - horde.pos[i, 1]))
+            walk_error = max(walk_error, abs(zombie.walk_count - horde.walk[i]))
+            if (zombie.stun_time, zombie.attack_animation, zombie.attack_cooldown, zombie.alive) != \
+                    (horde.stun[i], horde.anim[i], horde.cooldown[i], horde.alive[i]):
+                state_mismatches += 1
+        pos_errors.append(worst)
+    return pos_errors, walk_error, state_mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="좀비 무리 백엔드 검사 (Horde.step vs Zombie.update)")
+    parser.add_argument("--zombies", type=int, default=ZOMBIES)
+    parser.add_argument("--ticks", type=int, default=TICKS)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE, help="허용 위치 오차 (월드 px)")
+    args = parser.parse_args()
+
+    from common.horde import HAS_NUMPY
+    if not HAS_NUMPY:
+        print("numpy가 없어서 Horde 백엔드를 검사할 수 없음")
+        sys.exit(2)
+
+    mod = load_script("gameA001/g003.py")
+    pos_errors, walk_error, state_mismatches = run(mod, args.zombies, args.ticks, args.seed)
+    worst = max(pos_errors)
+    print(f"좀비 {args.zombies}  {args.ticks}틱  위치 최대 오차 {worst:.3g} (틱 {pos_errors.index(worst)})  "
+          f"걷기 최대 오차 {walk_error:.3g}  정수 상태 불일치 {state_mismatches}")
+
+    failed = worst > args.tolerance or state_mismatches
+    print("OK" if not failed else "FAIL")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
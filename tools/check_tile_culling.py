@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""
+p014 타일 컬링 검사
+- game2/p014.py draw_map이 실제로 그리는 타일 집합과, 예전처럼 맵 전체를 돌며
+  윗꼭짓점이 화면 ±margin 안에 드는지 보던 루프의 타일 집합을 무작위 카메라에서 비교
+- 그리는 타일은 draw_map 안의 to_iso 호출을 가로채서 모은다 (타일마다 한 번씩 부름)
+- 다른 카메라가 하나라도 있으면 종료 코드 1
+
+    python tools/check_tile_culling.py                         # 카메라 300개, 맵 20/37/100 타일
+    python tools/check_tile_culling.py --cameras 2000 --seed 7
+    python tools/check_tile_culling.py --tiles 500 --margin 0
+"""
+import os
+import sys
+import random
+import argparse
+import importlib.util
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+MAP_TILES = [20, 37, 100]
+MARGINS = [150, 37, 0]
+RESOLUTIONS = [(800, 600), (1280, 720), (1920, 1080)]
+CAMERAS = 300
+
+
+def load_script(relpath):
+    """게임 폴더의 스크립트를 모듈로 불러옴 (폴더 이름에 공백/괄호가 있어도 됨)"""
+    path = os.path.join(ROOT, relpath)
+    name = "check_" + relpath.replace("/", "_").replace(".", "_")
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def brute_force_tiles(tile_size, map_limit, cam_off, cur_w, cur_h, margin):
+    """예전 draw_map 루프: 모든 타일의 윗꼭짓점을 화면 ±margin과 비교"""
+    tiles = set()
+    for x in range(0, map_limit, tile_size):
+        for y in range(0, map_limit, tile_size):
+            px, py = x - y + cam_off[0], (x + y) / 2 + cam_off[1]
+            if -margin < px < cur_w + margin and -margin < py < cur_h + margin:
+                tiles.add((x // tile_size, y // tile_size))
+    return tiles
+
+
+def culled_tiles(mod, surface, cam_off, cur_w, cur_h, margin):
+    """draw_map이 그린 타일 (to_iso 호출로 모음)"""
+    drawn = []
+    to_iso = mod.to_iso
+
+    def record(x, y):
+        drawn.append((x // mod.TILE_SIZE, y // mod.TILE_SIZE))
+        return to_iso(x, y)
+
+    mod.to_iso = record
+    try:
+        mod.draw_map(surface, "apartment", cam_off, cur_w, cur_h, True, margin)
+    finally:
+        mod.to_iso = to_iso
+    return drawn
+
+
+def random_camera(rnd, mod, cur_w, cur_h):
+    """맵 근처(반쯤 걸치거나 완전히 벗어난 경우 포함)의 카메라 오프셋"""
+    span = mod.MAP_LIMIT
+    wx, wy = rnd.uniform(-0.5 * span, 1.5 * span), rnd.uniform(-0.5 * span, 1.5 * span)
+    return (cur_w // 2 - (wx - wy), cur_h // 2 - (wx + wy) / 2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="p014 타일 컬링 검사")
+    parser.add_argument("--cameras", type=int, default=CAMERAS, help="맵 크기 × 여유 조합마다 카메라 수")
+    parser.add_argument("--tiles", type=int, nargs="*", help="맵 한 변 타일 수 (기본: 20 37 100)")
+    parser.add_argument("--margin", type=int, nargs="*", help="cull_margin px (기본: 150 37 0)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    import pygame
+    mod = load_script("game2/p014.py")
+    surface = pygame.Surface((1, 1))
+    rnd = random.Random(args.seed)
+
+    failed = 0
+    for tiles in args.tiles or MAP_TILES:
+        mod.MAP_TILES = tiles
+        mod.MAP_LIMIT = mod.TILE_SIZE * tiles
+        for margin in MARGINS if args.margin is None else args.margin:
+            mismatches = duplicates = drawn_total = 0
+            for _ in range(args.cameras):
+                cur_w, cur_h = rnd.choice(RESOLUTIONS)
+                cam_off = random_camera(rnd, mod, cur_w, cur_h)
+                drawn = culled_tiles(mod, surface, cam_off, cur_w, cur_h, margin)
+                expected = brute_force_tiles(mod.TILE_SIZE, mod.MAP_LIMIT, cam_off, cur_w, cur_h, margin)
+                drawn_total += len(drawn)
+                duplicates += len(drawn) - len(set(drawn))
+                if set(drawn) != expected:
+                    mismatches += 1
+                    if mismatches == 1:
+                        print(f"  예: cam_off={cam_off} {cur_w}x{cur_h} "
+                              f"빠짐 {sorted(expected - set(drawn))[:5]} 더 그림 {sorted(set(drawn) - expected)[:5]}")
+            failed += mismatches + duplicates
+            print(f"맵 {tiles:>4}x{tiles:<4} margin {margin:>3}  카메라 {args.cameras}  "
+                  f"불일치 {mismatches}  중복 {duplicates}  평균 {drawn_total / args.cameras:.0f} 타일/프레임")
+
+    print("OK" if not failed else "FAIL")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+기존 맵 정의를 리전 월드 폴더(common/regions.py 포맷)로 변환
+- p008: game3/p008.py build_unified_map()의 fill(...) 배치
+- gameA002.main / gameA002.t003: Game.create_rooms()의 Room 목록 (floor_area를 방 하나씩 채움, 뒤에 오는 방이 덮어씀)
+
+    python tools/convert_regions.py p008 worlds/p008
+    python tools/convert_regions.py gameA002.t003 worlds/grandma --region-size 64
+    python game3/p008.py --world worlds/grandma
+"""
+import os
+import sys
+import argparse
+import importlib.util
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from common.regions import REGION_SIZE, write_world
+
+DEFAULT_FLOOR = (230, 220, 200)
+
+
+def load_script(relpath):
+    path = os.path.join(ROOT, relpath)
+    name = "convert_" + relpath.replace("/", "_").replace(".", "_")
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def convert_p008(out, region_size):
+    mod = load_script("game3/p008.py")
+    tilemap, _, map_tw, map_th = mod.build_unified_map()
+    # p008 main과 같은 시작 위치 (거실 중앙)
+    spawn = ((4 + 7) * mod.TILE_SIZE + mod.TILE_SIZE // 2, (6 + 6) * mod.TILE_SIZE + mod.TILE_SIZE // 2)
+    return write_world(out, map_tw, map_th, tilemap.rooms[1:], tilemap.index_at, mod.TILE_SIZE,
+                       spawn=spawn, region_size=region_size)
+
+
+def rooms_world(mod, out, region_size):
+    """Room.floor_area 사각형들을 방 번호 격자로. create_rooms는 self를 쓰지 않으므로 Game을 만들지 않고 부른다"""
+    rooms = mod.Game.create_rooms(None)
+    palette, rects = [], []
+    for i, room in enumerate(rooms):
+        floor = room.floor_area
+        colors = getattr(room, "theme_colors", None) or {}
+        color = colors.get("floor", getattr(mod, "COLOR_FLOOR", DEFAULT_FLOOR))
+        palette.append({"room_id": f"room{i}", "room_name": room.name, "color": color})
+        rects.append((floor["x"], floor["y"], floor["x"] + floor["w"], floor["y"] + floor["h"], i + 1))
+    map_tw = max(r[2] for r in rects)
+    map_th = max(r[3] for r in rects)
+
+    def index_at(tx, ty):
+        for x0, y0, x1, y1, index in reversed(rects):
+            if x0 <= tx < x1 and y0 <= ty < y1:
+                return index
+        return 0
+
+    first = rooms[0].floor_area
+    spawn = ((first["x"] + first["w"] / 2) * mod.TILE_SIZE, (first["y"] + first["h"] / 2) * mod.TILE_SIZE)
+    return write_world(out, map_tw, map_th, palette, index_at, mod.TILE_SIZE, spawn=spawn, region_size=region_size)
+
+
+SOURCES = {
+    "p008": convert_p008,
+    "gameA002.main": lambda out, size: rooms_world(load_script("gameA002/main.py"), out, size),
+    "gameA002.t003": lambda out, size: rooms_world(load_script("gameA002/t003.py"), out, size),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="맵 정의 → 리전 월드 변환")
+    parser.add_argument("source", choices=sorted(SOURCES))
+    parser.add_argument("out", help="출력 폴더")
+    parser.add_argument("--region-size", type=int, default=REGION_SIZE)
+    args = parser.parse_args()
+
+    header = SOURCES[args.source](args.out, args.region_size)
+    total = ((header["map_tw"] + args.region_size - 1) // args.region_size) * \
+            ((header["map_th"] + args.region_size - 1) // args.region_size)
+    print(f"{args.source} → {args.out}: {header['map_tw']}x{header['map_th']} 타일, "
+          f"리전 {len(header['regions'])}/{total}개, 방 {len(header['rooms'])}개")
+
+
+if __name__ == "__main__":
+    main()